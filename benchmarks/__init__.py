@@ -0,0 +1,35 @@
+"""Benchmarks for django-admin-tabs, run against a throwaway test database.
+
+Run a benchmark module from the repository root, e.g.::
+
+    python -m benchmarks.bulk_form
+    python -m benchmarks.changelist
+    python -m benchmarks.tab_views --sizes 0 1000 --output results.json
+"""
+
+import os
+from contextlib import contextmanager
+
+
+@contextmanager
+def test_database():
+    """Set up Django with the benchmark settings and a fresh test database."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "benchmarks.settings")
+    import django
+
+    django.setup()
+
+    from django.test.utils import (
+        setup_databases,
+        setup_test_environment,
+        teardown_databases,
+        teardown_test_environment,
+    )
+
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity=0)
+        teardown_test_environment()
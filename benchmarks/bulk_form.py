@@ -0,0 +1,60 @@
+"""Compare BulkChangeListForm against saving one object at a time.
+
+python -m benchmarks.bulk_form --rows 10000 100000
+"""
+
+import argparse
+import time
+
+from . import test_database
+
+
+def per_row_save(choice, rows):
+    from django.db import transaction
+
+    from example.polls.models import Answer
+
+    with transaction.atomic():
+        for _ in range(rows):
+            Answer(choice=choice).save()
+
+
+def bulk_form_save(choice, rows, batch_size):
+    from example.polls.admin import AnswerBulkForm
+
+    form = AnswerBulkForm(
+        parent_object=choice.poll, data={"choice": choice.pk, "count": rows}
+    )
+    form.batch_size = batch_size
+    assert form.is_valid(), form.errors
+    form.save()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    with test_database():
+        from example.polls.models import Answer, Choice, Poll
+
+        poll = Poll.objects.create(question="Benchmark")
+        choice = Choice.objects.create(poll=poll, text="Benchmark")
+        print(f"{'rows':>8} {'per-row save':>14} {'bulk form':>12} {'speedup':>8}")
+        for rows in args.rows:
+            timings = []
+            for run in (
+                lambda: per_row_save(choice, rows),
+                lambda: bulk_form_save(choice, rows, args.batch_size),
+            ):
+                start = time.perf_counter()
+                run()
+                timings.append(time.perf_counter() - start)
+                Answer.objects.all().delete()
+            per_row, bulk = timings
+            print(f"{rows:>8} {per_row:>13.2f}s {bulk:>11.2f}s {per_row / bulk:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Measure the construction cost of the nested changelist of a tab.
+
+Compares the shared `TabChangeList` with a ChangeList subclass defined on
+every request, like `get_changelist` used to do. Reports the median time per
+call and the number of objects the garbage collector has to reclaim per call:
+
+    python -m benchmarks.changelist --rows 100 --repeat 2000
+"""
+
+import argparse
+import gc
+import statistics
+import time
+
+from . import test_database
+
+
+def per_request_get_changelist(request, **kwargs):
+    from django_admin_tabs.changelist import TabChangeList
+
+    class AdminChangeList(TabChangeList):
+        def get_filters(self, request, *args, **kwargs):
+            return super().get_filters(request, *args, **kwargs)
+
+        def get_queryset(self, request, *args, **kwargs):
+            return super().get_queryset(request, *args, **kwargs)
+
+        def get_results(self, request):
+            return super().get_results(request)
+
+        def url_for_result(self, result):
+            return super().url_for_result(result)
+
+    return AdminChangeList
+
+
+def build_tab(rows):
+    from django.contrib import admin
+    from django.contrib.auth.models import User
+    from django.test import RequestFactory
+
+    from example.polls.admin import AnswerAdmin
+    from example.polls.models import Answer, Choice, Poll
+
+    poll = Poll.objects.create(question="Benchmark")
+    choice = Choice.objects.create(poll=poll, text="Benchmark")
+    Answer.objects.bulk_create([Answer(choice=choice) for _ in range(rows)])
+    request = RequestFactory().get("/")
+    request.user = User.objects.create_superuser("benchmark", password="benchmark")
+    tab = admin.site._registry[Poll].build_admin_tab(AnswerAdmin, poll)
+    return tab, request
+
+
+def measure(run, repeat):
+    run()  # Warm up caches.
+    gc.collect()
+    gc.disable()
+    try:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            timings.append((time.perf_counter() - start) * 1_000_000)
+    finally:
+        collected = gc.collect()
+        gc.enable()
+    return statistics.median(timings), collected / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    with test_database():
+        tab, request = build_tab(args.rows)
+        shared = tab.get_changelist
+        scenarios = [
+            ("get_changelist", lambda: tab.get_changelist(request)),
+            ("get_changelist_instance", lambda: tab.get_changelist_instance(request)),
+        ]
+        print(f"{'scenario':<24} {'variant':<12} {'median':>10} {'gc objects':>11}")
+        for name, run in scenarios:
+            for variant, get_changelist in (
+                ("per-request", per_request_get_changelist),
+                ("shared", shared),
+            ):
+                tab.get_changelist = get_changelist
+                median, collected = measure(run, args.repeat)
+                print(f"{name:<24} {variant:<12} {median:>8.1f}us {collected:>11.1f}")
+        tab.get_changelist = shared
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+"""Settings of the benchmarks: the example project, optionally on PostgreSQL.
+
+Set BENCHMARK_POSTGRES_NAME (and the usual PGHOST, PGPORT, PGUSER and
+PGPASSWORD) to run against a local PostgreSQL server instead of SQLite.
+"""
+
+import os
+
+from example.settings import *  # noqa: F401,F403
+
+if os.environ.get("BENCHMARK_POSTGRES_NAME"):
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ["BENCHMARK_POSTGRES_NAME"],
+            "HOST": os.environ.get("PGHOST", ""),
+            "PORT": os.environ.get("PGPORT", ""),
+            "USER": os.environ.get("PGUSER", ""),
+            "PASSWORD": os.environ.get("PGPASSWORD", ""),
+        }
+    }
+
+LOGGING = {"version": 1, "disable_existing_loggers": False}
@@ -0,0 +1,234 @@
+"""Benchmark the tabbed admin views of the example polls app.
+
+Creates one poll per size with that many answers, then measures latency,
+query count and peak memory of each tab view. Results are written as JSON and
+can be compared with the results of another commit:
+
+    python -m benchmarks.tab_views --sizes 0 1000 100000 1000000 \\
+        --output results.json --compare previous.json
+"""
+
+import argparse
+import json
+import math
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from . import test_database
+
+INSERT_BATCH_SIZE = 10000
+
+
+def create_poll(size):
+    from example.polls.models import Answer, Choice, Poll
+
+    poll = Poll.objects.create(question=f"Benchmark with {size} answers")
+    choices = Choice.objects.bulk_create(
+        [Choice(poll=poll, text=f"Choice {i}") for i in range(10)]
+    )
+    for start in range(0, size, INSERT_BATCH_SIZE):
+        Answer.objects.bulk_create(
+            [
+                Answer(choice=choices[i % len(choices)])
+                for i in range(start, min(start + INSERT_BATCH_SIZE, size))
+            ]
+        )
+    return poll, choices[0]
+
+
+def check(response, status):
+    assert response.status_code == status, (
+        response.request["PATH_INFO"],
+        response.status_code,
+    )
+    return response
+
+
+def get_scenarios(poll, choice, size):
+    """Return (name, callable) pairs performing one request each.
+
+    The callables fail on an unexpected status, e.g. the redirect of the
+    changelist to `?e=1` for a page out of range.
+    """
+    import django
+    from django.urls import reverse
+
+    from example.polls.admin import AnswerAdmin
+    from example.polls.models import Answer
+
+    def url(name, *args):
+        return reverse(f"admin:polls_poll_{name}", args=(poll.pk, *args))
+
+    def nested_answer():
+        # Create the answer outside of the measured request.
+        return Answer.objects.create(choice=choice)
+
+    last_page = max(math.ceil(size / AnswerAdmin.list_per_page), 1)
+    if django.VERSION < (4, 0):
+        # The changelist page parameter was 0-based.
+        last_page -= 1
+
+    def scenarios(client):
+        def get(path):
+            return check(client.get(path), 200)
+
+        def post(path, data, status=200):
+            return check(client.post(path, data), status)
+
+        answer = nested_answer()
+        yield "tab_change_view", lambda: get(url("step", "poll"))
+        yield "nested_changelist", lambda: get(url("step", "answers"))
+        yield (
+            "nested_changelist_last_page",
+            lambda: get(url("step", "answers") + f"?p={last_page}"),
+        )
+        yield (
+            "nested_change_view",
+            lambda: get(url("tab_change", "answers", answer.pk)),
+        )
+        yield "nested_add_view", lambda: get(url("tab_add", "answers"))
+        yield (
+            "bulk_form_submit",
+            lambda: post(
+                url("step", "answers"),
+                {"_submit_bulk": "1", "choice": choice.pk, "count": 100},
+            ),
+        )
+
+        def delete():
+            return post(
+                url("tab_delete", "answers", nested_answer().pk),
+                {"post": "yes"},
+                status=302,
+            )
+
+        yield "nested_delete_view", delete
+
+    return scenarios
+
+
+class QueryCounter:
+    """An execute wrapper counting queries, unlike `connection.queries` unbounded."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def measure(request, repeat):
+    from django.db import connection
+
+    request()  # Warm up caches.
+    latencies = []
+    for _ in range(repeat):
+        queries = QueryCounter()
+        with connection.execute_wrapper(queries):
+            start = time.perf_counter()
+            request()
+            latencies.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    try:
+        request()
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "latency_ms": {
+            "min": min(latencies),
+            "median": statistics.median(latencies),
+            "max": max(latencies),
+        },
+        "queries": queries.count,
+        "peak_memory_kb": peak / 1024,
+    }
+
+
+def get_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, check=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, previous):
+    baseline = {(r["size"], r["view"]): r for r in previous["results"]}
+    print(f"\nCompared with {previous['meta'].get('commit')}:")
+    for result in results["results"]:
+        before = baseline.get((result["size"], result["view"]))
+        if before is None:
+            continue
+        ratio = (
+            result["latency_ms"]["median"] / before["latency_ms"]["median"]
+            if before["latency_ms"]["median"]
+            else float("nan")
+        )
+        print(
+            f"{result['size']:>8} {result['view']:<28} "
+            f"{ratio:>6.2f}x latency "
+            f"{result['queries'] - before['queries']:+d} queries"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[0, 1000, 100000, 1000000]
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--compare", help="JSON results of a previous run")
+    args = parser.parse_args()
+
+    with test_database():
+        import django
+        from django.contrib.auth.models import User
+        from django.db import connection
+        from django.test import Client
+
+        user = User.objects.create_superuser("benchmark", "", "benchmark")
+        client = Client()
+        client.force_login(user)
+
+        results = {
+            "meta": {
+                "commit": get_commit(),
+                "date": datetime.now(timezone.utc).isoformat(),
+                "django": django.get_version(),
+                "python": platform.python_version(),
+                "database": connection.vendor,
+                "repeat": args.repeat,
+            },
+            "results": [],
+        }
+        print(f"{'size':>8} {'view':<28} {'median':>10} {'queries':>8} {'peak':>10}")
+        for size in args.sizes:
+            poll, choice = create_poll(size)
+            for view, request in get_scenarios(poll, choice, size)(client):
+                result = {"size": size, "view": view, **measure(request, args.repeat)}
+                results["results"].append(result)
+                print(
+                    f"{size:>8} {view:<28} "
+                    f"{result['latency_ms']['median']:>8.1f}ms "
+                    f"{result['queries']:>8} "
+                    f"{result['peak_memory_kb']:>8.0f}kB"
+                )
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
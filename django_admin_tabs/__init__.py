@@ -1,6 +1,15 @@
 __version__ = "1.0.0"
 
 from .admin import AdminChangeListTab, AdminTab, TabbedModelAdmin
+from .bulk import BulkChangeListForm
+from .inlines import PaginatedStackedInline, PaginatedTabularInline
 
 
-__all__ = [AdminChangeListTab, AdminTab, TabbedModelAdmin]
+__all__ = [
+    AdminChangeListTab,
+    AdminTab,
+    BulkChangeListForm,
+    PaginatedStackedInline,
+    PaginatedTabularInline,
+    TabbedModelAdmin,
+]
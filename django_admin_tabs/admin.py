@@ -1,30 +1,168 @@
-from typing import List
+import asyncio
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, NamedTuple, Optional
 
+from asgiref.sync import sync_to_async
 from django.contrib import admin, messages
 from django.contrib.admin.templatetags.admin_urls import add_preserved_filters
-from django.contrib.admin.views.main import ChangeList
-from django.http import HttpResponseRedirect, Http404
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.utils import flatten_fieldsets, unquote
+from django.contrib.admin.views.main import ERROR_FLAG
+from django.core import checks
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist, PermissionDenied
+from django.core.paginator import Paginator
+from django.db import connections, router
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseNotAllowed,
+    HttpResponseRedirect,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404
+from django.template.response import TemplateResponse
 from django.urls import path, reverse
+from django.utils.cache import (
+    add_never_cache_headers,
+    get_conditional_response,
+    patch_cache_control,
+)
 from django.utils.encoding import force_str
+from django.utils.formats import number_format
+from django.utils.http import http_date
 from django.utils.text import slugify
 
+from .async_views import aget_object_or_404, async_admin_view
+from .autocomplete import ScopedAutocompleteSelect, ScopedAutocompleteSelectMultiple
+from .badges import connect_count_invalidation, count_querysets, get_count_cache_key
+from .bulk import BulkChangeListForm
+from .caching import (
+    connect_render_invalidation,
+    get_render_digest,
+    get_render_generation,
+    get_render_generation_key,
+)
+from .changelist import TabChangeList
+from .counting import CountStrategyPaginator, ExactCount
+from .deletion import BatchedDeleteAdminMixin
+from .export import EXPORT_FORMATS, iter_export_rows
+from .filters import scope_list_filter
+from .fragments import render_tab_fragment
+from .imports import (
+    CSVImportForm,
+    iter_import_chunks,
+    read_csv_rows,
+    stream_import_report,
+)
+from .related import (
+    attach_generic_parent_object,
+    attach_parent_object,
+    get_forward_relation_path,
+    get_parent_lookup,
+    infer_list_select_related,
+)
+from .permissions import TabPermissionMixin, get_tab_visibility
+from .reversing import ObjectURLTemplate, TabURLNames, URLTemplate
+from .routing import (
+    SAFE_METHODS,
+    is_stuck_to_primary,
+    iter_from,
+    read_from,
+    stick_to_primary,
+)
+from .scoping import (
+    SCOPING_STRATEGIES,
+    connect_scope_invalidation,
+    get_intermediate_queryset,
+    get_scope_cache_key,
+    split_fk_field,
+)
+from .search import (
+    SEARCH_BACKENDS,
+    SearchIndex,
+    connect_search_index,
+    get_search_field_names,
+)
+from .signals import tab_view_timed
+from .timing import TabTimer, timed
 
-class AdminTab(admin.ModelAdmin):
+timing_logger = logging.getLogger("django_admin_tabs.timing")
+
+
+class AdminTab(TabPermissionMixin, admin.ModelAdmin):
     # Optionally override the model for this admin tab
     model = None
 
     # Optionally specify the name for this admin tab
     admin_tab_name = None
 
+    parent_model = None
+    parent_object = None
+    timer = None
+
+    # Cache the rendered tab per parent and user for `cache_rendered_timeout`
+    # seconds. The cache is invalidated when the parent or one of its inline
+    # objects is saved or deleted.
+    cache_rendered = False
+    cache_rendered_timeout = 300
+
+    # Switch to this tab with a full page load when `tab_fragments` is on,
+    # e.g. for widgets initialised on page load like the admin calendar.
+    fragment_navigation = True
+
     change_form_template = "admin/django_admin_tabs/tab_change_form.html"
     change_list_template = "admin/django_admin_tabs/tab_change_list.html"
 
+    @classmethod
+    def get_class_tab_name(cls):
+        """The tab name of the menu, computed without instantiating the tab."""
+        return cls.admin_tab_name or cls.__name__
+
+    @classmethod
+    def get_class_tab_slug(cls):
+        """The slug of the tab URLs, computed without instantiating the tab."""
+        return force_str(slugify(cls.get_class_tab_name()))
+
     def get_tab_name(self):
-        return self.admin_tab_name or self.__class__.__name__
+        """The tab name of the menu, resolved once per tab class."""
+        return self.get_class_tab_name()
 
     def get_tab_slug(self):
-        return force_str(slugify(self.get_tab_name()))
+        """The slug of the tab URLs, resolved once per tab class."""
+        return self.get_class_tab_slug()
+
+    def get_object(self, request, object_id, from_field=None):
+        """Reuse the parent object already loaded for this request."""
+        parent_object = self.parent_object
+        if (
+            parent_object is not None
+            and from_field is None
+            and isinstance(parent_object, self.model)
+            and str(parent_object.pk) == str(object_id)
+        ):
+            return parent_object
+        return super().get_object(request, object_id, from_field=from_field)
+
+    def get_tab_version(self, request):
+        """Hook to return a cheap key changing whenever the tab content changes.
+
+        E.g. the `updated_at` of the parent. Tabs with a version answer GET
+        requests with ETag headers and 304 Not Modified responses, and with a
+        Last-Modified header when the version is a datetime.
+        """
+        return None
+
+    async def ahas_tab_permission(self, request):
+        """Async hook to deny access to the tab before it is loaded.
+
+        Checked by the async tab views, which then run the admin permission
+        checks of the tab view as usual.
+        """
+        return await sync_to_async(self.has_module_permission)(request)
 
     def process_view(self, request, object_id, extra_context=None):
         return self.change_view(
@@ -33,15 +171,27 @@ class AdminTab(admin.ModelAdmin):
             extra_context=extra_context,
         )
 
+    def response_change(self, request, obj):
+        response = super().response_change(request, obj)
+        if (
+            "_continue" in request.POST
+            and isinstance(response, HttpResponseRedirect)
+            and response.url.split("?")[0] == request.path
+        ):
+            # Stay on the pages of paginated inlines.
+            response["Location"] = request.get_full_path()
+        return response
+
     def get_model_perms(self, request):
         """Removes the object from the admin index."""
         return {}
 
 
-class AdminChangeListTab:
+class AdminChangeListTab(TabPermissionMixin, BatchedDeleteAdminMixin):
     admin_tab_name = None
     parent_model = None
     parent_object = None
+    timer = None
     change_list_bulk_form = None
 
     # The field path to filter the queryset for the
@@ -50,25 +200,115 @@ class AdminChangeListTab:
     # For more advanced queryset filtering, override `get_queryset`
     fk_field = None
 
+    # How a multi-hop `fk_field` like "choice__poll" scopes the rows:
+    # "join" filters through the intermediate table, "subquery" filters the
+    # first relation `__in` a subquery of the intermediates of the parent, and
+    # "pk_list" with their keys, cached per parent for `fk_scoping_timeout`
+    # seconds. Parents with more than `fk_scoping_pk_limit` intermediates fall
+    # back to the subquery.
+    fk_scoping = "join"
+    fk_scoping_timeout = 300
+    fk_scoping_pk_limit = 1000
+    # Set by the index check explaining the queries of a placeholder parent:
+    # keys aren't cached, and no keys, which runs no query, use the subquery.
+    _explaining = False
+
     ct_field = "content_type"
     ct_fk_field = "object_id"
 
+    # The `TabURLNames` of the parent model, set by `TabbedModelAdmin`.
+    url_names = None
+
+    # Show the number of rows of this changelist in the tab menu.
+    # Counts are cached per parent for `count_badge_timeout` seconds and
+    # invalidated when rows of `model` are saved or deleted.
+    count_badge = False
+    count_badge_timeout = 300
+
+    # Set to "keyset" to page the changelist on its ordering columns with
+    # next/previous cursors instead of OFFSET/LIMIT page numbers.
+    pagination = None
+
+    # How the changelist rows are counted, one of the strategies of
+    # `django_admin_tabs.counting`, e.g. `CappedCount(10000)`.
+    count_strategy = ExactCount()
+
+    # Limit related-field list filters to the related objects of the parent,
+    # showing at most `list_filter_choices_limit` options.
+    scope_list_filters = True
+    list_filter_choices_limit = 100
+
+    # Infer `list_select_related` from `list_display` and the `fk_field` path.
+    auto_select_related = False
+
+    # Formats of the filtered changelist offered for export, any of
+    # "csv" and "jsonl". Rows are streamed in chunks of `export_chunk_size`.
+    export_formats = ()
+    export_chunk_size = 2000
+    exporting = False
+
+    # Offer an import of CSV files adding rows to the parent. The rows are
+    # validated with `get_import_form` and inserted `import_chunk_size` at a
+    # time with `bulk_create`, while a progress report is streamed back.
+    csv_import = False
+    import_chunk_size = 1000
+    import_template = "admin/django_admin_tabs/tab_import.html"
+
+    # Render the foreign keys and many-to-many fields of the nested add and
+    # change forms as autocomplete widgets. The related objects are searched
+    # `autocomplete_per_page` at a time, fields on the `fk_field` path only
+    # offer the related objects of the parent.
+    scoped_autocomplete = False
+    autocomplete_per_page = 20
+
+    # Answer `search_fields` searches from a full-text index of the fields, in
+    # the first of `search_backends` supporting the database: an FTS5 table on
+    # SQLite, `tsvector` documents (and trigrams with pg_trgm) on PostgreSQL.
+    # The index is built by the `tab_search_index` command and updated when
+    # rows are saved or deleted. Matches are combined with the parent scoping,
+    # so results and counts come from the index. Until the index is built,
+    # and on other databases, the admin's `icontains` search is used.
+    full_text_search = False
+    search_backends = SEARCH_BACKENDS
+
+    # Cache the rendered changelist per parent, user and query string for
+    # `cache_rendered_timeout` seconds. The cache is invalidated when rows of
+    # `model` are saved or deleted.
+    cache_rendered = False
+    cache_rendered_timeout = 300
+
+    # Switch to this tab with a full page load when `tab_fragments` is on,
+    # e.g. for widgets initialised on page load like the admin calendar.
+    fragment_navigation = True
+
     add_form_template = "admin/django_admin_tabs/tab_change_form.html"
     change_form_template = "admin/django_admin_tabs/tab_change_list_change.html"
     change_list_template = "admin/django_admin_tabs/tab_change_list.html"
 
+    @classmethod
+    def get_class_tab_name(cls):
+        """The tab name of the menu, computed without instantiating the tab."""
+        return cls.admin_tab_name or cls.__name__
+
+    @classmethod
+    def get_class_tab_slug(cls):
+        """The slug of the tab URLs, computed without instantiating the tab."""
+        return force_str(slugify(cls.get_class_tab_name()))
+
     def get_tab_name(self):
-        return self.admin_tab_name or self.__class__.__name__
+        """The tab name of the menu, resolved once per tab class."""
+        return self.get_class_tab_name()
 
     def get_tab_slug(self):
-        return force_str(slugify(self.get_tab_name()))
+        """The slug of the tab URLs, resolved once per tab class."""
+        return self.get_class_tab_slug()
 
     def get_queryset(self, request):
         from django.contrib.contenttypes.models import ContentType
 
         """Hook to override queryset for the nested changelist."""
         if self.fk_field:
-            filters = {self.fk_field: self.parent_object}
+            filters = self.get_fk_scope_filters()
         else:
             filters = {
                 self.ct_field: ContentType.objects.get_for_model(self.parent_model),
@@ -76,11 +316,207 @@ class AdminChangeListTab:
             }
         return super().get_queryset(request).filter(**filters)
 
-    def save_model(self, request, obj, form, change):
+    def get_fk_scope_filters(self):
+        """Return the filters scoping the rows to the parent with `fk_scoping`."""
+        split = split_fk_field(self.model, self.fk_field)
+        if self.fk_scoping == "join" or split is None:
+            return {self.fk_field: self.parent_object}
+        field, rest = split
+        intermediates = get_intermediate_queryset(field, rest, self.parent_object)
+        if self.fk_scoping == "pk_list":
+            keys = self.get_intermediate_keys(intermediates)
+            if keys is not None:
+                return {f"{field.name}__in": keys}
+        return {f"{field.name}__in": intermediates}
+
+    def get_intermediate_keys(self, intermediates):
+        """Return the cached keys of `intermediates`, None when too many."""
+        if "_intermediate_keys" not in self.__dict__:
+            key = get_scope_cache_key(
+                self.parent_model, self.parent_object.pk, self.get_tab_slug()
+            )
+            keys = None if self._explaining else cache.get(key)
+            if keys is None:
+                keys = list(intermediates[: self.fk_scoping_pk_limit + 1])
+                if len(keys) > self.fk_scoping_pk_limit or (
+                    self._explaining and not keys
+                ):
+                    # Cached as False, None means a cache miss.
+                    keys = False
+                if not self._explaining:
+                    cache.set(key, keys, self.fk_scoping_timeout)
+            self._intermediate_keys = keys if keys is not False else None
+        return self._intermediate_keys
+
+    def clear_tab_caches(self):
+        """Drop the cached count badge and rendered pages of the parent's tab."""
+        args = (self.parent_model, self.parent_object.pk, self.get_tab_slug())
+        cache.delete_many(
+            [get_count_cache_key(*args), get_render_generation_key(*args)]
+        )
+
+    def deleted_in_batches(self, request, deleted):
+        self.clear_tab_caches()
+
+    def written_in_bulk(self, objs):
+        """Called with the rows of a committed import chunk.
+
+        Bulk inserts don't send model signals, so the caches of the tab are
+        dropped and the rows indexed here.
+        """
+        self.clear_tab_caches()
+        self.update_search_index(objs)
+
+    def get_search_index(self):
+        """Return the `SearchIndex` of the tab, None without full-text search."""
+        if not self.full_text_search:
+            return None
+        fields = get_search_field_names(self.model, self.search_fields)
+        if fields is None:
+            return None
+        return SearchIndex(self.model, fields, self.search_backends)
+
+    def update_search_index(self, objs):
+        """Index rows written without model signals, e.g. with `bulk_create`."""
+        index = self.get_search_index()
+        if index is not None:
+            index.update(objs, router.db_for_write(self.model))
+
+    def get_search_results(self, request, queryset, search_term):
+        index = self.get_search_index()
+        if index is not None:
+            results = index.search(queryset, search_term)
+            if results is not None:
+                return results, False
+        return super().get_search_results(request, queryset, search_term)
+
+    def get_count_queryset(self, request):
+        """Hook to override the queryset counted for the tab menu badge."""
+        return self.get_queryset(request)
+
+    def get_list_select_related(self, request):
+        if not self.auto_select_related:
+            return super().get_list_select_related(request)
+        return infer_list_select_related(
+            self.model, self.get_list_display(request), self.fk_field
+        )
+
+    def attach_parent_object(self, objs):
+        """Cache the loaded `parent_object` on the rows referencing it."""
+        if self.parent_object is None:
+            return
+        if self.fk_field:
+            attach_parent_object(objs, self.fk_field, self.parent_object)
+        else:
+            attach_generic_parent_object(
+                objs, self.ct_field, self.ct_fk_field, self.parent_object
+            )
+
+    def get_object(self, request, object_id, from_field=None):
+        obj = super().get_object(request, object_id, from_field=from_field)
+        if obj is not None:
+            self.attach_parent_object([obj])
+        return obj
+
+    def get_list_filter(self, request):
+        list_filter = super().get_list_filter(request)
+        if not self.scope_list_filters:
+            return list_filter
+        return [scope_list_filter(self.model, spec) for spec in list_filter]
+
+    def get_autocomplete_queryset(self, db_field):
+        """Return the objects offered for `db_field`, scoped to the parent."""
+        queryset = db_field.remote_field.model._default_manager.complex_filter(
+            db_field.get_limit_choices_to()
+        )
+        lookup = get_parent_lookup(self.fk_field, db_field.name)
+        if lookup == "":
+            queryset = queryset.filter(pk=self.parent_object.pk)
+        elif lookup is not None:
+            queryset = queryset.filter(**{lookup: self.parent_object})
+            # Labels referencing the parent, e.g. through `__str__`, don't
+            # query it once per object.
+            select_related = get_forward_relation_path(queryset.model, lookup)
+            if select_related:
+                queryset = queryset.select_related(select_related)
+        return queryset
+
+    def get_autocomplete_url(self):
+        return reverse(
+            self.url_names.tab_autocomplete,
+            args=(self.parent_object.pk, self.get_tab_slug()),
+        )
+
+    def get_object_url(self, pk):
+        """Return the nested change URL of `pk`, reversed once per request."""
+        template = self.__dict__.get("_object_url_template")
+        if template is None:
+            template = self._object_url_template = ObjectURLTemplate(
+                self.url_names.tab_change,
+                (self.parent_object.pk, self.get_tab_slug()),
+                current_app=self.admin_site.name,
+            )
+        return template(pk)
+
+    def get_delete_limit_url(self, object_id):
+        return self.get_object_url(unquote(object_id))
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if (
+            self.scoped_autocomplete
+            and "widget" not in kwargs
+            and db_field.name not in self.raw_id_fields
+            and db_field.name not in self.radio_fields
+        ):
+            kwargs["queryset"] = self.get_autocomplete_queryset(db_field)
+            kwargs["widget"] = ScopedAutocompleteSelect(
+                db_field,
+                self.admin_site,
+                self.get_autocomplete_url(),
+                using=kwargs.get("using"),
+            )
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+    def formfield_for_manytomany(self, db_field, request, **kwargs):
+        if (
+            self.scoped_autocomplete
+            and "widget" not in kwargs
+            and db_field.name not in self.raw_id_fields
+            and db_field.remote_field.through._meta.auto_created
+        ):
+            kwargs["queryset"] = self.get_autocomplete_queryset(db_field)
+            kwargs["widget"] = ScopedAutocompleteSelectMultiple(
+                db_field,
+                self.admin_site,
+                self.get_autocomplete_url(),
+                using=kwargs.get("using"),
+            )
+        return super().formfield_for_manytomany(db_field, request, **kwargs)
+
+    def get_count_strategy(self, request):
+        """Hook to choose the count strategy per request."""
+        return self.count_strategy
+
+    def get_paginator(
+        self, request, queryset, per_page, orphans=0, allow_empty_first_page=True
+    ):
+        return CountStrategyPaginator(
+            queryset,
+            per_page,
+            orphans,
+            allow_empty_first_page,
+            count_strategy=self.get_count_strategy(request),
+        )
+
+    def set_parent_object(self, obj):
+        """Point `obj` at the parent object before it is saved."""
         if self.fk_field:
             setattr(obj, self.fk_field, self.parent_object)
         else:
             setattr(obj, self.ct_fk_field.replace("_id", ""), self.parent_object)
+
+    def save_model(self, request, obj, form, change):
+        self.set_parent_object(obj)
         obj.save()
 
     def get_model_perms(self, request):
@@ -88,24 +524,29 @@ class AdminChangeListTab:
         return {}
 
     def get_changelist(self, request, **kwargs):
-        step = self.get_tab_slug()
-        parent_object = self.parent_object
-        admin_site = self.admin_site
-
-        class AdminChangeList(ChangeList):
-            def url_for_result(self, result):
-                opts = parent_object._meta
-                pk = getattr(result, self.pk_attname)
-                return reverse(
-                    f"{admin_site.name}:{opts.app_label}_{opts.model_name}_tab_change",
-                    args=(parent_object.id, step, pk),
-                )
-
-        return AdminChangeList
+        return TabChangeList
 
     def get_changelist_form(self, request, **kwargs):
         return super().get_changelist_form(request, **kwargs)
 
+    def get_tab_version(self, request):
+        """Hook to return a cheap key changing whenever the rows change.
+
+        E.g. the latest `updated_at` and the count of the rows. Tabs with a
+        version answer GET requests with ETag headers and 304 Not Modified
+        responses, and with a Last-Modified header when the version is a
+        datetime.
+        """
+        return None
+
+    async def ahas_tab_permission(self, request):
+        """Async hook to deny access to the tab before it is loaded.
+
+        Checked by the async tab views, which then run the admin permission
+        checks of the tab view as usual.
+        """
+        return await sync_to_async(self.has_module_permission)(request)
+
     def process_view(self, request, object_id, extra_context=None):
         return self.changelist_view(
             request=request,
@@ -113,9 +554,157 @@ class AdminChangeListTab:
             extra_context=extra_context,
         )
 
-    def changelist_view(self, request, object_id, extra_context=None):
-        object = get_object_or_404(self.parent_model, id=object_id)
+    def get_export_fields(self, request):
+        """Hook to override the exported columns, `list_display` by default."""
+        return [
+            field_name
+            for field_name in self.get_list_display(request)
+            if field_name != "action_checkbox"
+        ]
+
+    def autocomplete_view(self, request):
+        """Return a page of the objects of a related field as autocomplete JSON.
+
+        Searches the `search_fields` of the related model's admin among the
+        objects of `get_autocomplete_queryset`. The user needs the view
+        permission of the related model's admin.
+        """
+        if not self.scoped_autocomplete:
+            raise Http404(f"Autocomplete not enabled for {self}")
+        if not (
+            self.has_add_permission(request) or self.has_change_permission(request)
+        ):
+            raise PermissionDenied
+        try:
+            db_field = self.model._meta.get_field(request.GET.get("field_name", ""))
+        except FieldDoesNotExist:
+            raise PermissionDenied
+        if not (db_field.many_to_one or db_field.many_to_many) or not db_field.concrete:
+            raise PermissionDenied
+        # Like `AutocompleteJsonView`, the user must be able to view the
+        # related objects in the admin.
+        related_admin = self.admin_site._registry.get(db_field.remote_field.model)
+        if related_admin is None or not related_admin.has_view_permission(request):
+            raise PermissionDenied
+        queryset = self.get_autocomplete_queryset(db_field)
+        term = request.GET.get("term", "")
+        if term and related_admin.search_fields:
+            queryset, may_have_duplicates = related_admin.get_search_results(
+                request, queryset, term
+            )
+            if may_have_duplicates:
+                queryset = queryset.distinct()
+        if not queryset.ordered:
+            queryset = queryset.order_by("pk")
+        page = Paginator(queryset, self.autocomplete_per_page).get_page(
+            request.GET.get("page")
+        )
+        to_field_name = getattr(db_field.remote_field, "field_name", None) or "pk"
+        return JsonResponse(
+            {
+                "results": [
+                    {"id": str(getattr(obj, to_field_name)), "text": str(obj)}
+                    for obj in page
+                ],
+                "pagination": {"more": page.has_next()},
+            }
+        )
+
+    def export_view(self, request, export_format):
+        """Stream the scoped and filtered changelist rows as CSV or JSON Lines."""
+        if export_format not in self.export_formats:
+            raise Http404(f"Export format '{export_format}' not enabled for {self}")
+        if not self.has_view_or_change_permission(request):
+            raise PermissionDenied
+        self.exporting = True
+        try:
+            queryset = self.get_changelist_instance(request).queryset
+        except IncorrectLookupParameters:
+            # Like `changelist_view`, the changelist drops the bad parameters.
+            changelist_url = reverse(
+                self.url_names.step,
+                args=(self.parent_object.pk, self.get_tab_slug()),
+                current_app=self.admin_site.name,
+            )
+            return HttpResponseRedirect(f"{changelist_url}?{ERROR_FLAG}=1")
+        fields = self.get_export_fields(request)
+        content_type, stream = EXPORT_FORMATS[export_format]
+        rows = iter_export_rows(self, queryset, fields, self.export_chunk_size)
+        response = StreamingHttpResponse(
+            stream(self, fields, rows), content_type=content_type
+        )
         opts = self.parent_model._meta
+        filename = (
+            f"{opts.model_name}-{self.parent_object.pk}-{self.get_tab_slug()}"
+            f".{export_format}"
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    def get_import_form(self, request):
+        """Hook to override the ModelForm validating the imported rows.
+
+        Defaults to the add form without the fields pointing at the parent and
+        without many-to-many fields, which `bulk_create` doesn't save. With a
+        multi-hop `fk_field` like "choice__poll", the first relation stays in
+        the form and only accepts the intermediates of the parent.
+        """
+        exclude = [
+            *(self.get_exclude(request) or ()),
+            *self.get_readonly_fields(request),
+            *(field.name for field in self.model._meta.many_to_many),
+        ]
+        if self.fk_field:
+            exclude.append(self.fk_field)
+        else:
+            exclude.extend([self.ct_field, self.ct_fk_field])
+        form_class = self.get_form(request, exclude=exclude)
+        split = split_fk_field(self.model, self.fk_field or "")
+        if split is None or split[0].name not in form_class.base_fields:
+            return form_class
+        db_field = split[0]
+        form_field = form_class.base_fields[db_field.name]
+        form_field.queryset = self.get_autocomplete_queryset(db_field)
+        # Declared, so subclasses of the form don't rebuild it from the model.
+        return type(form_class.__name__, (form_class,), {db_field.name: form_field})
+
+    def import_view(self, request):
+        """Render the CSV upload form, then stream the report of the import."""
+        if not self.csv_import:
+            raise Http404(f"Import not enabled for {self}")
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+        form_class = self.get_import_form(request)
+        form = CSVImportForm(request.POST or None, request.FILES or None)
+        if request.method == "POST" and form.is_valid():
+            chunks = iter_import_chunks(
+                form_class,
+                read_csv_rows(form.cleaned_data["file"]),
+                self.import_chunk_size,
+                self.set_parent_object,
+                self.written_in_bulk,
+            )
+            return StreamingHttpResponse(
+                stream_import_report(chunks), content_type="text/plain; charset=utf-8"
+            )
+        opts = self.parent_model._meta
+        context = {
+            **self.admin_site.each_context(request),
+            "title": f"Import {self.model._meta.verbose_name_plural}",
+            "form": form,
+            "columns": list(form_class.base_fields),
+            "opts": self.model._meta,
+            "parent_opts": opts,
+            "anchor": self.parent_object,
+            "tab_url": reverse(
+                self.url_names.step,
+                args=(self.parent_object.pk, self.get_tab_slug()),
+            ),
+        }
+        return TemplateResponse(request, self.import_template, context)
+
+    def changelist_view(self, request, object_id, extra_context=None):
+        object = self.parent_object
         model_name = self.parent_model._meta.model_name
         base_url_name = "%s_%s" % (self.parent_model._meta.app_label, model_name)
         model_actions_url_name = f"{base_url_name}_actions"
@@ -125,15 +714,35 @@ class AdminChangeListTab:
             {
                 "has_change_permission": self.has_change_permission(request, None),
                 "add_url": reverse(
-                    f"{self.admin_site.name}:{opts.app_label}_{opts.model_name}_tab_add",
+                    self.url_names.tab_add,
                     args=(object.id, self.get_tab_slug()),
                 ),
+                "export_links": [
+                    (
+                        export_format,
+                        reverse(
+                            self.url_names.tab_export,
+                            args=(object.id, self.get_tab_slug(), export_format),
+                        ),
+                    )
+                    for export_format in self.export_formats
+                ],
+                "import_url": reverse(
+                    self.url_names.tab_import,
+                    args=(object.id, self.get_tab_slug()),
+                )
+                if self.csv_import and self.has_add_permission(request)
+                else None,
             }
         )
         if self.change_list_bulk_form:
+            form_kwargs = {}
+            if issubclass(self.change_list_bulk_form, BulkChangeListForm):
+                form_kwargs["written"] = self.update_search_index
             changelist_action_form = self.change_list_bulk_form(
                 parent_object=self.parent_object,
                 data=request.POST if request.POST else None,
+                **form_kwargs,
             )
             if (
                 request.POST
@@ -141,11 +750,19 @@ class AdminChangeListTab:
                 and changelist_action_form.is_valid()
             ):
                 created, updated = changelist_action_form.save()
-                messages.add_message(
-                    request,
-                    messages.SUCCESS,
-                    f"Bulk action performed. {created} created. {updated} updated.",
+                message = (
+                    f"Bulk action performed. {created} created. {updated} updated."
                 )
+                duration = getattr(changelist_action_form, "duration", None)
+                if duration is not None:
+                    message += f" Took {duration:.2f}s."
+                messages.add_message(request, messages.SUCCESS, message)
+                # Bulk writes don't send model signals. BulkChangeListForm
+                # indexed the written rows batch by batch, the rows written by
+                # other forms are unknown.
+                self.clear_tab_caches()
+                if "written" not in form_kwargs:
+                    self.update_search_index(self.get_queryset(request).iterator())
             extra_context["changelist_action_form"] = changelist_action_form
 
         return super().changelist_view(request, extra_context=extra_context)
@@ -155,25 +772,14 @@ class AdminChangeListTab:
         opts = self.parent_model._meta
         if "_addanother" in request.POST:
             post_url = reverse(
-                f"{self.admin_site.name}:%s_%s_tab_add"
-                % (opts.app_label, opts.model_name),
+                self.url_names.tab_add,
                 args=(self.parent_object.id, self.get_tab_slug()),
                 current_app=self.admin_site.name,
             )
         elif "_saveasnew" in request.POST:
-            post_url = reverse(
-                f"{self.admin_site.name}:%s_%s_tab_change"
-                % (opts.app_label, opts.model_name),
-                args=(self.parent_object.id, self.get_tab_slug(), obj.id),
-                current_app=self.admin_site.name,
-            )
+            post_url = self.get_object_url(obj.pk)
         else:
-            post_url = reverse(
-                f"{self.admin_site.name}:%s_%s_tab_change"
-                % (opts.app_label, opts.model_name),
-                args=(self.parent_object.id, self.get_tab_slug(), obj.id),
-                current_app=self.admin_site.name,
-            )
+            post_url = self.get_object_url(obj.pk)
         preserved_filters = self.get_preserved_filters(request)
         post_url = add_preserved_filters(
             {"preserved_filters": preserved_filters, "opts": opts}, post_url
@@ -187,8 +793,7 @@ class AdminChangeListTab:
         preserved_filters = self.get_preserved_filters(request)
         if "_addanother" in request.POST:
             post_url = reverse(
-                f"{self.admin_site.name}:%s_%s_tab_add"
-                % (opts.app_label, opts.model_name),
+                self.url_names.tab_add,
                 args=(self.parent_object.id, self.get_tab_slug()),
                 current_app=self.admin_site.name,
             )
@@ -197,12 +802,7 @@ class AdminChangeListTab:
             )
             return HttpResponseRedirect(post_url)
         elif "_continue" in request.POST:
-            post_url = reverse(
-                f"{self.admin_site.name}:%s_%s_tab_change"
-                % (opts.app_label, opts.model_name),
-                args=(self.parent_object.id, self.get_tab_slug(), obj.id),
-                current_app=self.admin_site.name,
-            )
+            post_url = self.get_object_url(obj.pk)
             post_url = add_preserved_filters(
                 {"preserved_filters": preserved_filters, "opts": opts}, post_url
             )
@@ -213,8 +813,7 @@ class AdminChangeListTab:
         opts = self.parent_model._meta
         if self.has_change_permission(request, None):
             post_url = reverse(
-                f"{self.admin_site.name}:%s_%s_step"
-                % (opts.app_label, opts.model_name),
+                self.url_names.step,
                 args=(self.parent_object.id, self.get_tab_slug()),
                 current_app=self.admin_site.name,
             )
@@ -230,8 +829,7 @@ class AdminChangeListTab:
         opts = self.parent_model._meta
         if self.has_change_permission(request, None):
             post_url = reverse(
-                f"{self.admin_site.name}:%s_%s_step"
-                % (opts.app_label, opts.model_name),
+                self.url_names.step,
                 args=(self.parent_object.id, self.get_tab_slug()),
                 current_app=self.admin_site.name,
             )
@@ -247,8 +845,7 @@ class AdminChangeListTab:
         opts = self.parent_model._meta
         if self.has_change_permission(request, None):
             post_url = reverse(
-                f"{self.admin_site.name}:%s_%s_step"
-                % (opts.app_label, opts.model_name),
+                self.url_names.step,
                 args=(self.parent_object.id, self.get_tab_slug()),
                 current_app=self.admin_site.name,
             )
@@ -261,10 +858,329 @@ class AdminChangeListTab:
         return HttpResponseRedirect(post_url)
 
 
-class TabbedModelAdmin:
+class TabMenuItem(NamedTuple):
+    """Precomputed name and slug of a tab class, as rendered in the tab menu."""
+
+    name: str
+    slug: str
+    admin_class: type
+    count: Optional[int] = None
+    fragment_url: Optional[str] = None
+
+    @property
+    def count_display(self):
+        return number_format(self.count, force_grouping=True)
+
+
+def overrides_tab_hooks(admin_class):
+    """Whether the tab class overrides `get_tab_name` or `get_tab_slug`."""
+    return any(
+        getattr(admin_class, hook)
+        not in (getattr(AdminTab, hook), getattr(AdminChangeListTab, hook))
+        for hook in ("get_tab_name", "get_tab_slug")
+    )
+
+
+class TabbedModelAdmin(BatchedDeleteAdminMixin):
     tabs_path = "tabs"
     admin_tabs = []
 
+    # Time the phases of every tab view and report them in a `Server-Timing`
+    # header, the `tab_view_timed` signal and the "django_admin_tabs.timing"
+    # logger.
+    server_timing = False
+
+    # Switch tabs with a script loading the tab fragment, the page content
+    # without the admin header and sidebar, instead of the whole page.
+    tab_fragments = False
+
+    # Serve the tab views as async views under ASGI. The parent, the tab, its
+    # `ahas_tab_permission` and the menu counts are loaded without holding a
+    # thread, then the tab renders in a thread like any sync view.
+    async_views = False
+
+    # Database alias the reads of GET and HEAD tab requests go to, e.g. a read
+    # replica, with `django_admin_tabs.routing.TabReadRouter` installed in
+    # `DATABASE_ROUTERS`. The parent, the tab rows, counts and filter options
+    # are read from it. Other requests read from the primary, and so do the
+    # requests of a session for `read_database_sticky_seconds` after a write,
+    # so users see their own changes despite the replication lag.
+    read_database = None
+    read_database_sticky_seconds = 10
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # On registration, so writes of processes not serving the admin, e.g.
+        # management commands, invalidate the caches of the tabs too.
+        self.connect_tab_signals()
+
+    def get_tab_registry(self):
+        """Map tab slugs to tab classes, built once per admin instance.
+
+        When two tabs share a slug the first one wins, the collision is
+        reported by the system check framework.
+        """
+        registry = self.__dict__.get("_tab_registry")
+        if registry is None:
+            registry = {}
+            for admin_class in self.admin_tabs:
+                registry.setdefault(
+                    self.get_tab_menu_item(admin_class).slug, admin_class
+                )
+            self._tab_registry = registry
+            # `admin_tabs` changed after the admin was registered.
+            self.connect_tab_signals()
+        return registry
+
+    def connect_tab_signals(self):
+        """Connect the receivers invalidating the caches of the tabs.
+
+        Called when the admin is instantiated, on registration, and when its
+        tab registry is built. Connecting again is a no-op.
+        """
+        for admin_class in self.admin_tabs:
+            slug = self.get_tab_menu_item(admin_class).slug
+            if getattr(admin_class, "count_badge", False) and admin_class.model:
+                connect_count_invalidation(admin_class, self.model, slug)
+            if getattr(admin_class, "fk_scoping", None) == "pk_list":
+                connect_scope_invalidation(admin_class, self.model, slug)
+            if getattr(admin_class, "full_text_search", False):
+                connect_search_index(admin_class)
+            if getattr(admin_class, "cache_rendered", False):
+                connect_render_invalidation(
+                    admin_class,
+                    self.model,
+                    slug,
+                    nested=issubclass(admin_class, AdminChangeListTab),
+                )
+
+    def get_tab_menu_item(self, admin_class) -> TabMenuItem:
+        """Return the menu entry of a tab class, built once per admin instance.
+
+        Tabs overriding `get_tab_name` or `get_tab_slug` are instantiated once
+        without `parent_object` to call them, the others are named by their
+        classmethods. Either way the name and slug are used by the menu, the
+        URLs and the cache keys of the tab.
+        """
+        menu_items = self.__dict__.setdefault("_tab_menu_items", {})
+        item = menu_items.get(admin_class)
+        if item is None:
+            if overrides_tab_hooks(admin_class):
+                tab_admin = self.build_admin_tab(admin_class, None)
+                name, slug = tab_admin.get_tab_name(), tab_admin.get_tab_slug()
+            else:
+                name = admin_class.get_class_tab_name()
+                slug = admin_class.get_class_tab_slug()
+            item = menu_items[admin_class] = TabMenuItem(
+                name=name, slug=slug, admin_class=admin_class
+            )
+        return item
+
+    def get_tab_menu(self, request, object_id) -> List[TabMenuItem]:
+        """Return the menu entries of the enabled tabs without instantiating them."""
+        return [
+            self.get_tab_menu_item(admin_class)
+            for admin_class in self.get_admin_tabs(request, object_id)
+        ]
+
+    def get_visible_tabs(self, request, object, admin_classes):
+        """Drop the tabs whose `is_tab_visible` denies the user, uninstantiated."""
+        visibility = get_tab_visibility(
+            request,
+            object,
+            {
+                admin_class: self.get_tab_menu_item(admin_class).slug
+                for admin_class in admin_classes
+            },
+        )
+        return [
+            admin_class
+            for admin_class in admin_classes
+            if visibility.get(admin_class, True)
+        ]
+
+    def get_tab_counts(self, request, object, menu):
+        """Return the cached row counts of the tabs with `count_badge` enabled.
+
+        Missing counts are computed together and cached per (parent, tab).
+        """
+        counts, missing = self.get_cached_tab_counts(object, menu)
+        if missing:
+            querysets = [
+                self.build_admin_tab(item.admin_class, object).get_count_queryset(
+                    request
+                )
+                for item in missing
+            ]
+            counts.update(self.count_tabs(object, missing, querysets))
+        return counts
+
+    async def aget_tab_counts(self, request, object, menu):
+        """Async `get_tab_counts`, building the count querysets concurrently.
+
+        Custom `get_count_queryset`/`get_queryset` overrides of the tabs run in
+        parallel threads, the counts are then computed together as usual.
+        """
+        counts, missing = await sync_to_async(self.get_cached_tab_counts)(object, menu)
+        if missing:
+
+            def get_count_queryset(item):
+                try:
+                    return self.build_admin_tab(
+                        item.admin_class, object
+                    ).get_count_queryset(request)
+                finally:
+                    # Connections opened by the worker thread aren't reused.
+                    connections.close_all()
+
+            querysets = await asyncio.gather(
+                *(
+                    sync_to_async(get_count_queryset, thread_sensitive=False)(item)
+                    for item in missing
+                )
+            )
+            counts.update(
+                await sync_to_async(self.count_tabs)(object, missing, querysets)
+            )
+        return counts
+
+    def get_cached_tab_counts(self, object, menu):
+        """Return the cached badge counts and the badge menu items without one."""
+        badge_items = [
+            item for item in menu if getattr(item.admin_class, "count_badge", False)
+        ]
+        if not badge_items:
+            return {}, []
+        keys = [
+            get_count_cache_key(self.model, object.pk, item.slug)
+            for item in badge_items
+        ]
+        cached = cache.get_many(keys)
+        counts = {
+            item.slug: cached[key]
+            for item, key in zip(badge_items, keys)
+            if key in cached
+        }
+        return counts, [item for item in badge_items if item.slug not in counts]
+
+    def count_tabs(self, object, items, querysets):
+        """Count the `querysets` of the badge menu `items` and cache the counts."""
+        counts = count_querysets(
+            object, {item.slug: queryset for item, queryset in zip(items, querysets)}
+        )
+        for item in items:
+            cache.set(
+                get_count_cache_key(self.model, object.pk, item.slug),
+                counts[item.slug],
+                item.admin_class.count_badge_timeout,
+            )
+        return counts
+
+    def check(self, **kwargs):
+        return [*super().check(**kwargs), *self._check_admin_tabs()]
+
+    def _check_admin_tabs(self):
+        errors = []
+        seen = {}
+        for admin_class in self.admin_tabs:
+            slug = self.get_tab_menu_item(admin_class).slug
+            if slug in seen:
+                errors.append(
+                    checks.Error(
+                        f"Tab '{admin_class.__name__}' has the same slug '{slug}' "
+                        f"as tab '{seen[slug].__name__}'.",
+                        hint="Set a unique 'admin_tab_name' on one of the tabs.",
+                        obj=self.__class__,
+                        id="django_admin_tabs.E001",
+                    )
+                )
+            else:
+                seen[slug] = admin_class
+            fk_scoping = getattr(admin_class, "fk_scoping", "join")
+            if fk_scoping not in SCOPING_STRATEGIES:
+                errors.append(
+                    checks.Error(
+                        f"Tab '{admin_class.__name__}' has an unknown fk_scoping "
+                        f"'{fk_scoping}'.",
+                        hint=f"Use one of {', '.join(SCOPING_STRATEGIES)}.",
+                        obj=self.__class__,
+                        id="django_admin_tabs.E002",
+                    )
+                )
+            if getattr(admin_class, "full_text_search", False) and (
+                get_search_field_names(admin_class.model, admin_class.search_fields)
+                is None
+            ):
+                errors.append(
+                    checks.Error(
+                        f"Tab '{admin_class.__name__}' uses full_text_search "
+                        "without indexable search_fields.",
+                        hint="Use fields of the tab model, without lookups "
+                        "through relations.",
+                        obj=self.__class__,
+                        id="django_admin_tabs.E003",
+                    )
+                )
+            if getattr(admin_class, "scoped_autocomplete", False):
+                errors.extend(self._check_scoped_autocomplete(admin_class))
+        return errors
+
+    def _check_scoped_autocomplete(self, admin_class):
+        """Like admin.E039/E040, the related models of the autocomplete
+        widgets need a registered admin with `search_fields`.
+        """
+        if admin_class.fieldsets:
+            declared = flatten_fieldsets(admin_class.fieldsets)
+        else:
+            declared = admin_class.fields
+        errors = []
+        for field in admin_class.model._meta.get_fields():
+            if (
+                not field.concrete
+                or not field.editable
+                or not (field.many_to_one or field.many_to_many)
+                or (
+                    field.many_to_many
+                    and not field.remote_field.through._meta.auto_created
+                )
+                or field.name in admin_class.raw_id_fields
+                or (field.many_to_one and field.name in admin_class.radio_fields)
+                or field.name in (admin_class.exclude or ())
+                or (declared and field.name not in declared)
+                # Only offers the parent.
+                or get_parent_lookup(admin_class.fk_field, field.name) == ""
+            ):
+                continue
+            related_model = field.remote_field.model
+            related_admin = self.admin_site._registry.get(related_model)
+            if related_admin is None:
+                errors.append(
+                    checks.Error(
+                        f"Tab '{admin_class.__name__}' uses scoped_autocomplete "
+                        f"for '{field.name}', but no admin for "
+                        f"'{related_model._meta.label}' is registered.",
+                        hint=f"Register an admin with search_fields for "
+                        f"'{related_model._meta.label}', or add '{field.name}' "
+                        "to raw_id_fields.",
+                        obj=self.__class__,
+                        id="django_admin_tabs.E004",
+                    )
+                )
+            elif not related_admin.search_fields:
+                errors.append(
+                    checks.Error(
+                        f"Tab '{admin_class.__name__}' uses scoped_autocomplete "
+                        f"for '{field.name}', but "
+                        f"{type(related_admin).__name__} doesn't define "
+                        "search_fields.",
+                        hint="Define search_fields on the admin of "
+                        f"'{related_model._meta.label}'.",
+                        obj=self.__class__,
+                        id="django_admin_tabs.E005",
+                    )
+                )
+        return errors
+
     def get_admin_tabs(self, request, object_id) -> List[AdminTab]:
         """Hook to dynamically return the enabled tabs."""
         return self.admin_tabs
@@ -274,38 +1190,140 @@ class TabbedModelAdmin:
         initial_step = self.admin_tabs[0]
         return initial_step(initial_step.model or self.model, self.admin_site)
 
-    def get_admin_tab(self, request, object_id, step: str):
-        object = get_object_or_404(self.model, id=object_id)
-        instances = []
-        for admin_class in self.get_admin_tabs(request, object):
-            instance = admin_class(admin_class.model or self.model, self.admin_site)
-            instance.parent_object = object
-            instance.parent_model = self.model
-            instances.append(instance)
-        step_map = {step_admin.get_tab_slug(): step_admin for step_admin in instances}
-        step_admin = step_map.get(step)
-        if not step_admin:
+    def get_parent_queryset(self, request):
+        """Hook to customise the query loading the parent object of the tabs.
+
+        Override to add `select_related`, `only` or `defer` to the anchor query.
+        """
+        return self.model._default_manager.get_queryset()
+
+    def get_read_database(self, request):
+        """Return the alias the reads of a tab request go to, None for the primary.
+
+        Requests which may write start the sticky window of the session.
+        """
+        if self.read_database is None:
+            return None
+        if request.method not in SAFE_METHODS:
+            stick_to_primary(request, self.read_database_sticky_seconds)
+            return None
+        if is_stuck_to_primary(request):
+            return None
+        return self.read_database
+
+    @contextmanager
+    def route_reads(self, request):
+        """Route the reads of the block to `get_read_database`, yield the alias."""
+        with read_from(self.get_read_database(request)) as database:
+            yield database
+
+    def save_model(self, request, obj, form, change):
+        if self.read_database is not None:
+            # The add view redirects to the first tab, read the new parent
+            # from the primary.
+            stick_to_primary(request, self.read_database_sticky_seconds)
+        super().save_model(request, obj, form, change)
+
+    def get_parent_object(self, request, object_id):
+        """Load the parent object once per request, or raise Http404."""
+        return get_object_or_404(self.get_parent_queryset(request), pk=object_id)
+
+    async def aget_parent_object(self, request, object_id):
+        """Async `get_parent_object`."""
+        return await aget_object_or_404(self.get_parent_queryset(request), pk=object_id)
+
+    def get_admin_tab(self, request, object, step: str):
+        """Instantiate the selected tab only."""
+        admin_tabs = self.get_admin_tabs(request, object.pk)
+        admin_class = self.get_tab_registry().get(step)
+        if admin_class not in admin_tabs:
+            # Tabs returned dynamically by `get_admin_tabs` are not registered.
+            admin_class = next(
+                (
+                    admin_class
+                    for admin_class in admin_tabs
+                    if self.get_tab_menu_item(admin_class).slug == step
+                ),
+                None,
+            )
+        if admin_class is None:
             raise Http404(f"Tab '{step}' not found for {self}")
+        if not self.get_visible_tabs(request, object, [admin_class]):
+            raise PermissionDenied
+        return self.build_admin_tab(admin_class, object)
+
+    async def aget_admin_tab(self, request, object, step: str):
+        """Async `get_admin_tab`, checking `ahas_tab_permission` of the tab."""
+        step_admin = await sync_to_async(self.get_admin_tab)(request, object, step)
+        if not await step_admin.ahas_tab_permission(request):
+            raise PermissionDenied
         return step_admin
 
+    def get_tab_url_names(self):
+        """Return the `TabURLNames` of the model, built once per admin instance."""
+        url_names = self.__dict__.get("_tab_url_names")
+        if url_names is None:
+            url_names = self._tab_url_names = TabURLNames.for_model(
+                self.admin_site, self.model
+            )
+        return url_names
+
+    def build_admin_tab(self, admin_class, object):
+        """Instantiate a tab bound to the parent object."""
+        tab_admin = admin_class(admin_class.model or self.model, self.admin_site)
+        tab_admin.parent_object = object
+        tab_admin.parent_model = self.model
+        tab_admin.url_names = self.get_tab_url_names()
+        return tab_admin
+
     def change_view(self, request, object_id, form_url="", extra_context=None):
         step = self.get_initial_tab(request, object_id)
         return HttpResponseRedirect(
             reverse(
-                f"{self.admin_site.name}:{self.model._meta.app_label}_{self.model._meta.model_name}_step",
+                self.get_tab_url_names().step,
                 args=[object_id, step.get_tab_slug()],
             )
         )
 
+    def get_visible_tab_menu(self, request, instance):
+        """Return the menu entries of the enabled tabs visible to the user."""
+        menu = self.get_tab_menu(request, instance.pk)
+        visible = self.get_visible_tabs(
+            request, instance, [item.admin_class for item in menu]
+        )
+        return [item for item in menu if item.admin_class in visible]
+
     def get_context(self, request, instance, step):
+        menu = self.get_visible_tab_menu(request, instance)
+        counts = self.get_tab_counts(request, instance, menu)
+        return self.get_menu_context(instance, step, menu, counts)
+
+    async def aget_context(self, request, instance, step):
+        """Async `get_context`, counting the tabs with `aget_tab_counts`."""
+        menu = await sync_to_async(self.get_visible_tab_menu)(request, instance)
+        counts = await self.aget_tab_counts(request, instance, menu)
+        return self.get_menu_context(instance, step, menu, counts)
+
+    def get_menu_context(self, instance, step, menu, counts):
+        if counts:
+            menu = [item._replace(count=counts.get(item.slug)) for item in menu]
+        if self.tab_fragments:
+            # Slugs aren't admin quoted, unlike primary keys.
+            fragment_url = URLTemplate(
+                self.get_tab_url_names().tab_fragment, (instance.pk,)
+            )
+            menu = [
+                item._replace(fragment_url=fragment_url(item.slug))
+                if getattr(item.admin_class, "fragment_navigation", True)
+                else item
+                for item in menu
+            ]
         return dict(
             instance_meta_opts=instance._meta,
-            admin_tabs=[
-                step(step.model or self.model, self.admin_site)
-                for step in self.get_admin_tabs(request, instance.id)
-            ],
+            admin_tabs=menu,
             current_tab=step,
             anchor=instance,
+            tab_fragments=self.tab_fragments,
         )
 
     def response_add(self, request, obj, *args, **kwargs):
@@ -315,61 +1333,346 @@ class TabbedModelAdmin:
         return HttpResponseRedirect(request.path)
 
     def get_urls(self):
+        self.get_tab_registry()
         base_urls = super().get_urls()
         prefix = f"{self.model._meta.app_label}_{self.model._meta.model_name}"
+
+        def tab_view(view, async_view, cacheable=False):
+            if self.async_views:
+                return async_admin_view(self.admin_site, async_view, cacheable)
+            return self.admin_site.admin_view(view, cacheable)
+
         wizard_urls = [
             path(
                 f"<str:object_id>/{self.tabs_path}/<str:step>/<str:nested_object_id>/change/",
-                self.admin_site.admin_view(self.nested_change_view),
+                tab_view(self.nested_change_view, self.anested_change_view),
                 name=f"{prefix}_tab_change",
             ),
             path(
                 f"<str:object_id>/{self.tabs_path}/<str:step>/add/",
-                self.admin_site.admin_view(self.nested_add_view),
+                tab_view(self.nested_add_view, self.anested_add_view),
                 name=f"{prefix}_tab_add",
             ),
             path(
-                "<path:object_id>/{self.tabs_path}/<str:step>/<str:nested_object_id>/delete/",
-                self.admin_site.admin_view(self.nested_delete_view),
+                f"<str:object_id>/{self.tabs_path}/<str:step>/<str:nested_object_id>/delete/",
+                tab_view(self.nested_delete_view, self.anested_delete_view),
                 name=f"{prefix}_tab_delete",
             ),
+            path(
+                f"<str:object_id>/{self.tabs_path}/<str:step>/export/<str:export_format>/",
+                self.admin_site.admin_view(self.nested_export_view),
+                name=f"{prefix}_tab_export",
+            ),
+            path(
+                f"<str:object_id>/{self.tabs_path}/<str:step>/import/",
+                self.admin_site.admin_view(self.nested_import_view),
+                name=f"{prefix}_tab_import",
+            ),
+            path(
+                f"<str:object_id>/{self.tabs_path}/<str:step>/autocomplete/",
+                self.admin_site.admin_view(self.nested_autocomplete_view),
+                name=f"{prefix}_tab_autocomplete",
+            ),
+            path(
+                f"<str:object_id>/{self.tabs_path}/<str:step>/fragment/",
+                self.admin_site.admin_view(self.tab_fragment_view),
+                name=f"{prefix}_tab_fragment",
+            ),
             path(
                 f"<str:object_id>/{self.tabs_path}/<str:step>/",
-                self.admin_site.admin_view(self.tab_change_view),
+                # Conditional tab responses set their own cache headers.
+                tab_view(self.tab_change_view, self.atab_change_view, cacheable=True),
                 name=f"{prefix}_step",
             ),
         ]
         return wizard_urls + base_urls
 
-    def tab_change_view(self, request, object_id, step):
-        object = get_object_or_404(self.model, id=object_id)
-        return self.get_admin_tab(request, object_id, step).process_view(
+    def dispatch_tab_view(self, request, object_id, step, view, **extra_context):
+        """Load the parent and the tab, then render `view(tab, context)`.
+
+        With `server_timing` enabled each phase is timed and reported.
+        """
+        timer = TabTimer() if self.server_timing else None
+        with self.route_reads(request) as database:
+            with timed(timer, "parent"):
+                object = self.get_parent_object(request, object_id)
+            with timed(timer, "tab"):
+                step_admin = self.get_admin_tab(request, object, step)
+                step_admin.timer = timer
+            with timed(timer, "menu"):
+                context = self.get_context(request, object, step)
+                context.update(extra_context)
+            with timed(timer, "view"):
+                response = view(step_admin, context)
+            if timer is not None or database is not None:
+                # Render within the block, the template reads from the same
+                # database as the view.
+                if not getattr(response, "is_rendered", True):
+                    with timed(timer, "render"):
+                        response.render()
+        if timer is not None:
+            self.report_timing(request, object, step, timer, response)
+        return response
+
+    async def adispatch_tab_view(self, request, object_id, step, view, **extra_context):
+        """Async `dispatch_tab_view`, rendering `view` in a thread.
+
+        The phases aren't timed, `server_timing` applies to sync views only.
+        """
+        with self.route_reads(request) as database:
+            object = await self.aget_parent_object(request, object_id)
+            step_admin = await self.aget_admin_tab(request, object, step)
+            context = await self.aget_context(request, object, step)
+            context.update(extra_context)
+            response = await sync_to_async(view)(step_admin, context)
+            if database is not None and not getattr(response, "is_rendered", True):
+                await sync_to_async(response.render)()
+        return response
+
+    def report_timing(self, request, object, step, timer, response):
+        """Hook to report the phases of an instrumented tab view."""
+        response["Server-Timing"] = timer.get_server_timing()
+        tab_view_timed.send(
+            sender=self.__class__,
             request=request,
-            object_id=object_id,
-            extra_context=self.get_context(request, object, step),
+            parent_model=self.model,
+            parent_object=object,
+            tab_slug=step,
+            phases=timer.phases,
+        )
+        opts = self.model._meta
+        timing_logger.debug(
+            "Tab %s of %s %s: %s",
+            step,
+            opts.label,
+            object.pk,
+            timer.get_server_timing(),
+            extra={
+                "parent_model": opts.label,
+                "tab_slug": step,
+                "phases": timer.phases,
+            },
+        )
+
+    def conditional_tab_response(self, request, step_admin, context, view):
+        """Answer a GET of a tab with 304 Not Modified or its cached HTML.
+
+        Applies to tabs returning a version from `get_tab_version` or setting
+        `cache_rendered`. The ETag covers the version, the menu counts, the
+        user and their permissions. Other responses are never cached.
+        """
+        version = step_admin.get_tab_version(request)
+        if (
+            (version is None and not step_admin.cache_rendered)
+            or request.method not in ("GET", "HEAD")
+            # A page rendered before the CSRF cookie was set can't be reused.
+            or not request.META.get("CSRF_COOKIE")
+            or len(messages.get_messages(request))
+            or not step_admin.has_view_or_change_permission(request)
+        ):
+            response = view()
+            add_never_cache_headers(response)
+            return response
+
+        parts = [version, [(item.slug, item.count) for item in context["admin_tabs"]]]
+        if step_admin.cache_rendered:
+            parts.append(
+                get_render_generation(
+                    self.model, step_admin.parent_object.pk, step_admin.get_tab_slug()
+                )
+            )
+        digest = get_render_digest(request, parts)
+        etag = f'"{digest}"'
+        last_modified = (
+            int(version.timestamp()) if isinstance(version, datetime) else None
+        )
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            cache_key = f"django_admin_tabs:html:{digest}"
+            cached = cache.get(cache_key) if step_admin.cache_rendered else None
+            if cached is not None:
+                content, content_type = cached
+                response = HttpResponse(content, content_type=content_type)
+            else:
+                response = view()
+                if step_admin.cache_rendered and response.status_code == 200:
+                    if hasattr(response, "render"):
+                        response.render()
+                    cache.set(
+                        cache_key,
+                        (response.content, response["Content-Type"]),
+                        step_admin.cache_rendered_timeout,
+                    )
+        if response.status_code not in (200, 304):
+            add_never_cache_headers(response)
+            return response
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
+        # Let the browser keep the page, but revalidate it on every visit.
+        patch_cache_control(response, private=True, no_cache=True, max_age=0)
+        return response
+
+    def tab_change_view(self, request, object_id, step):
+        return self.dispatch_tab_view(
+            request,
+            object_id,
+            step,
+            lambda step_admin, context: self.conditional_tab_response(
+                request,
+                step_admin,
+                context,
+                lambda: step_admin.process_view(
+                    request=request,
+                    object_id=object_id,
+                    extra_context=context,
+                ),
+            ),
+        )
+
+    def tab_fragment_view(self, request, object_id, step):
+        """Render the content of a tab without the admin header and sidebar."""
+        if request.method != "GET":
+            return HttpResponseNotAllowed(["GET"])
+        return self.dispatch_tab_view(
+            request,
+            object_id,
+            step,
+            lambda step_admin, context: render_tab_fragment(
+                request,
+                step_admin.process_view(
+                    request=request,
+                    object_id=object_id,
+                    extra_context=context,
+                ),
+            ),
         )
 
     def nested_change_view(self, request, object_id, step, nested_object_id=None):
-        object = get_object_or_404(self.model, id=object_id)
-        context = self.get_context(request, object, step)
-        context["show_delete"] = False
-        return self.get_admin_tab(request, object_id, step).change_view(
-            request=request,
-            object_id=nested_object_id,
-            extra_context=context,
+        return self.dispatch_tab_view(
+            request,
+            object_id,
+            step,
+            lambda step_admin, context: step_admin.change_view(
+                request=request,
+                object_id=nested_object_id,
+                extra_context=context,
+            ),
+            show_delete=False,
         )
 
     def nested_add_view(self, request, object_id, step):
-        object = get_object_or_404(self.model, id=object_id)
-        return self.get_admin_tab(request, object_id, step).add_view(
-            request=request,
-            extra_context=self.get_context(request, object, step),
+        return self.dispatch_tab_view(
+            request,
+            object_id,
+            step,
+            lambda step_admin, context: step_admin.add_view(
+                request=request,
+                extra_context=context,
+            ),
         )
 
     def nested_delete_view(self, request, object_id, step, nested_object_id=None):
-        object = get_object_or_404(self.model, id=object_id)
-        return self.get_admin_tab(request, object_id, step).delete_view(
-            request=request,
-            nested_object_id=nested_object_id,
-            extra_context=self.get_context(request, object, step),
+        return self.dispatch_tab_view(
+            request,
+            object_id,
+            step,
+            lambda step_admin, context: step_admin.delete_view(
+                request=request,
+                object_id=nested_object_id,
+                extra_context=context,
+            ),
+        )
+
+    async def atab_change_view(self, request, object_id, step):
+        return await self.adispatch_tab_view(
+            request,
+            object_id,
+            step,
+            lambda step_admin, context: self.conditional_tab_response(
+                request,
+                step_admin,
+                context,
+                lambda: step_admin.process_view(
+                    request=request,
+                    object_id=object_id,
+                    extra_context=context,
+                ),
+            ),
         )
+
+    async def anested_change_view(
+        self, request, object_id, step, nested_object_id=None
+    ):
+        return await self.adispatch_tab_view(
+            request,
+            object_id,
+            step,
+            lambda step_admin, context: step_admin.change_view(
+                request=request,
+                object_id=nested_object_id,
+                extra_context=context,
+            ),
+            show_delete=False,
+        )
+
+    async def anested_add_view(self, request, object_id, step):
+        return await self.adispatch_tab_view(
+            request,
+            object_id,
+            step,
+            lambda step_admin, context: step_admin.add_view(
+                request=request,
+                extra_context=context,
+            ),
+        )
+
+    async def anested_delete_view(
+        self, request, object_id, step, nested_object_id=None
+    ):
+        return await self.adispatch_tab_view(
+            request,
+            object_id,
+            step,
+            lambda step_admin, context: step_admin.delete_view(
+                request=request,
+                object_id=nested_object_id,
+                extra_context=context,
+            ),
+        )
+
+    def nested_autocomplete_view(self, request, object_id, step):
+        with self.route_reads(request):
+            object = self.get_parent_object(request, object_id)
+            step_admin = self.get_admin_tab(request, object, step)
+            if not isinstance(step_admin, AdminChangeListTab):
+                raise Http404(f"Tab '{step}' of {self} has no autocomplete")
+            return step_admin.autocomplete_view(request)
+
+    def nested_import_view(self, request, object_id, step):
+        # Uploads stick the session to the primary, like the other writes.
+        with self.route_reads(request) as database:
+            object = self.get_parent_object(request, object_id)
+            step_admin = self.get_admin_tab(request, object, step)
+            if not isinstance(step_admin, AdminChangeListTab):
+                raise Http404(
+                    f"Tab '{step}' of {self} has no changelist to import into"
+                )
+            response = step_admin.import_view(request)
+            if database is not None and not getattr(response, "is_rendered", True):
+                response.render()
+        return response
+
+    def nested_export_view(self, request, object_id, step, export_format):
+        with self.route_reads(request) as database:
+            object = self.get_parent_object(request, object_id)
+            step_admin = self.get_admin_tab(request, object, step)
+            if not isinstance(step_admin, AdminChangeListTab):
+                raise Http404(f"Tab '{step}' of {self} has no changelist to export")
+            response = step_admin.export_view(request, export_format)
+        if database is not None and response.streaming:
+            # The rows are read while the response streams.
+            response.streaming_content = iter_from(database, response.streaming_content)
+        return response
@@ -1,5 +1,13 @@
 from django.apps import AppConfig
+from django.core import checks
 
 
 class AdminWizardConfig(AppConfig):
     name = "django_admin_tabs"
+
+    def ready(self):
+        from .indexes import check_tab_indexes
+
+        # Database checks run with `manage.py check --database <alias>` and
+        # before `migrate`, this one only with DJANGO_ADMIN_TABS_INDEX_CHECK.
+        checks.register(check_tab_indexes, checks.Tags.database)
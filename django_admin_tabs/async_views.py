@@ -0,0 +1,54 @@
+from functools import update_wrapper
+
+from asgiref.sync import sync_to_async
+from django.http import Http404
+from django.middleware.csrf import CsrfViewMiddleware
+from django.urls import reverse
+from django.utils.cache import add_never_cache_headers
+
+
+async def aget_object_or_404(queryset, **kwargs):
+    """Async `get_object_or_404`, using `QuerySet.aget` where available."""
+    try:
+        if hasattr(queryset, "aget"):
+            return await queryset.aget(**kwargs)
+        return await sync_to_async(queryset.get)(**kwargs)
+    except queryset.model.DoesNotExist:
+        raise Http404(f"No {queryset.model._meta.object_name} matches the given query.")
+
+
+def async_admin_view(admin_site, view, cacheable=False):
+    """Async `AdminSite.admin_view`, checking the admin login and CSRF token.
+
+    `AdminSite.admin_view` wraps views with sync decorators, which would return
+    the coroutine of an async view instead of awaiting it.
+    """
+    csrf_middleware = CsrfViewMiddleware(lambda request: None)
+
+    def check_csrf(request, args, kwargs):
+        if hasattr(csrf_middleware, "process_request"):
+            csrf_middleware.process_request(request)
+        return csrf_middleware.process_view(request, view, args, kwargs)
+
+    async def inner(request, *args, **kwargs):
+        if not await sync_to_async(admin_site.has_permission)(request):
+            from django.contrib.auth.views import redirect_to_login
+
+            return redirect_to_login(
+                request.get_full_path(),
+                reverse("admin:login", current_app=admin_site.name),
+            )
+        response = await sync_to_async(check_csrf)(request, args, kwargs)
+        if response is None:
+            response = await view(request, *args, **kwargs)
+        if hasattr(response, "add_post_render_callback"):
+            response.add_post_render_callback(
+                lambda response: csrf_middleware.process_response(request, response)
+            )
+        else:
+            csrf_middleware.process_response(request, response)
+        if not cacheable:
+            add_never_cache_headers(response)
+        return response
+
+    return update_wrapper(inner, view)
@@ -0,0 +1,22 @@
+from django.contrib.admin.widgets import AutocompleteSelect, AutocompleteSelectMultiple
+
+
+class ScopedAutocompleteMixin:
+    """An admin autocomplete widget searching through the tab's endpoint."""
+
+    def __init__(self, field, admin_site, url, **kwargs):
+        super().__init__(field, admin_site, **kwargs)
+        self.url = url
+
+    def get_url(self):
+        return self.url
+
+
+class ScopedAutocompleteSelect(ScopedAutocompleteMixin, AutocompleteSelect):
+    pass
+
+
+class ScopedAutocompleteSelectMultiple(
+    ScopedAutocompleteMixin, AutocompleteSelectMultiple
+):
+    pass
@@ -0,0 +1,112 @@
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist, ObjectDoesNotExist
+from django.db.models import F, Func, IntegerField, Subquery
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.signals import post_delete, post_save
+
+
+def get_count_cache_key(parent_model, parent_pk, tab_slug):
+    opts = parent_model._meta
+    return f"django_admin_tabs:count:{opts.label_lower}:{parent_pk}:{tab_slug}"
+
+
+def count_querysets(parent_object, querysets):
+    """Count several querysets, batched into one query where possible.
+
+    The counts are selected as scalar subqueries of a query on the parent row,
+    so every tab stored on the parent's database is counted in a single round
+    trip. Sliced or distinct querysets, and those on other databases, are
+    counted one by one.
+    """
+    counts = {}
+    batched = {}
+    for key, queryset in querysets.items():
+        if (
+            queryset.db != parent_object._state.db
+            or not queryset.query.can_filter()
+            or queryset.query.distinct
+        ):
+            counts[key] = queryset.count()
+        else:
+            batched[key] = queryset
+    if len(batched) == 1:
+        ((key, queryset),) = batched.items()
+        counts[key] = queryset.count()
+    elif batched:
+        aliases = {f"tab_count_{i}": key for i, key in enumerate(batched)}
+        subqueries = {
+            alias: Subquery(
+                batched[key]
+                .order_by()
+                .annotate(_tab_count=Func(F("pk"), function="COUNT"))
+                .values("_tab_count"),
+                output_field=IntegerField(),
+            )
+            for alias, key in aliases.items()
+        }
+        row = (
+            parent_object._meta.default_manager.using(parent_object._state.db)
+            .filter(pk=parent_object.pk)
+            .annotate(**subqueries)
+            .values(*subqueries)
+            .get()
+        )
+        counts.update({key: row[alias] for alias, key in aliases.items()})
+    return counts
+
+
+def get_path_pk(instance, path):
+    """Return the pk `instance` points to at the end of a relation `path`.
+
+    Returns None when the path isn't made of forward relations or one of them
+    is empty.
+    """
+    *path, last = path.split(LOOKUP_SEP)
+    obj = instance
+    try:
+        for name in path:
+            obj = getattr(obj, name)
+            if obj is None:
+                return None
+        field = obj._meta.get_field(last)
+    except (ObjectDoesNotExist, FieldDoesNotExist):
+        return None
+    if not (field.many_to_one or field.one_to_one) or not field.concrete:
+        return None
+    return getattr(obj, field.attname)
+
+
+def get_parent_pk(tab_class, parent_model, instance):
+    """Return the pk of the parent `instance` is listed under by `tab_class`.
+
+    Returns None when the parent can't be derived from the instance, the
+    cached count then expires with its timeout.
+    """
+    if tab_class.fk_field:
+        return get_path_pk(instance, tab_class.fk_field)
+
+    from django.contrib.contenttypes.models import ContentType
+
+    ct_field = instance._meta.get_field(tab_class.ct_field)
+    parent_ct = ContentType.objects.get_for_model(parent_model)
+    if getattr(instance, ct_field.attname) != parent_ct.pk:
+        return None
+    return getattr(instance, tab_class.ct_fk_field)
+
+
+def connect_count_invalidation(tab_class, parent_model, tab_slug):
+    """Drop the cached tab count when a row of the tab's model changes."""
+
+    def invalidate(sender, instance, **kwargs):
+        parent_pk = get_parent_pk(tab_class, parent_model, instance)
+        if parent_pk is not None:
+            cache.delete(get_count_cache_key(parent_model, parent_pk, tab_slug))
+
+    dispatch_uid = (
+        f"django_admin_tabs:count:{parent_model._meta.label_lower}:"
+        f"{tab_class.__module__}.{tab_class.__qualname__}"
+    )
+    for signal in (post_save, post_delete):
+        signal.connect(
+            invalidate, sender=tab_class.model, weak=False, dispatch_uid=dispatch_uid
+        )
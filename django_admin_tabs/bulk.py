@@ -0,0 +1,79 @@
+import time
+
+from django import forms
+from django.core.exceptions import ImproperlyConfigured
+from django.db import router, transaction
+
+
+class BulkChangeListForm(forms.Form):
+    """Base class for `AdminChangeListTab.change_list_bulk_form`.
+
+    Subclasses implement `get_objects`, yielding the model instances to write
+    for `parent_object`. New instances are inserted with `bulk_create` and
+    existing ones updated on `update_fields` with `bulk_update`, in batches of
+    `batch_size`, all inside one transaction. Each written batch is passed to
+    `written(objs)`. `save` returns the `(created, updated)` counts and stores
+    the elapsed seconds in `duration`.
+    """
+
+    model = None
+    update_fields = ()
+    batch_size = 1000
+
+    def __init__(self, *args, parent_object=None, written=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.parent_object = parent_object
+        self.written = written
+        self.duration = None
+
+    def get_objects(self):
+        """Yield the instances to create or update, using `cleaned_data`."""
+        raise NotImplementedError(
+            "Subclasses of BulkChangeListForm must provide a get_objects() method."
+        )
+
+    def batch_written(self, objs):
+        if self.written is not None:
+            self.written(objs)
+
+    def save(self):
+        start = time.perf_counter()
+        manager = self.model._default_manager
+        created = updated = 0
+        to_create, to_update = [], []
+        with transaction.atomic(using=router.db_for_write(self.model)):
+            for obj in self.get_objects():
+                if obj._state.adding:
+                    to_create.append(obj)
+                elif not self.update_fields:
+                    raise ImproperlyConfigured(
+                        f"{type(self).__name__}.get_objects() yielded a saved "
+                        f"{self.model._meta.object_name}, set update_fields to "
+                        "the fields to update."
+                    )
+                else:
+                    to_update.append(obj)
+                if len(to_create) >= self.batch_size:
+                    manager.bulk_create(to_create, batch_size=self.batch_size)
+                    self.batch_written(to_create)
+                    created += len(to_create)
+                    to_create = []
+                if len(to_update) >= self.batch_size:
+                    manager.bulk_update(
+                        to_update, self.update_fields, batch_size=self.batch_size
+                    )
+                    self.batch_written(to_update)
+                    updated += len(to_update)
+                    to_update = []
+            if to_create:
+                manager.bulk_create(to_create, batch_size=self.batch_size)
+                self.batch_written(to_create)
+                created += len(to_create)
+            if to_update:
+                manager.bulk_update(
+                    to_update, self.update_fields, batch_size=self.batch_size
+                )
+                self.batch_written(to_update)
+                updated += len(to_update)
+        self.duration = time.perf_counter() - start
+        return created, updated
@@ -0,0 +1,96 @@
+import hashlib
+import uuid
+from functools import partial
+from operator import attrgetter
+
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.forms.models import _get_foreign_key
+from django.utils.translation import get_language
+
+from .badges import get_parent_pk
+
+
+def get_render_generation_key(parent_model, parent_pk, tab_slug):
+    opts = parent_model._meta
+    return f"django_admin_tabs:render:{opts.label_lower}:{parent_pk}:{tab_slug}"
+
+
+def get_render_generation(parent_model, parent_pk, tab_slug):
+    """Return a token that changes whenever a row shown by the tab changes.
+
+    Invalidating deletes the token, a missing token is replaced by a new random
+    one, so a cache that lost the token never serves stale HTML.
+    """
+    key = get_render_generation_key(parent_model, parent_pk, tab_slug)
+    generation = cache.get(key)
+    if generation is None:
+        generation = uuid.uuid4().hex
+        if not cache.add(key, generation, None):
+            generation = cache.get(key) or generation
+    return generation
+
+
+def get_user_cache_key(request):
+    """Identify the user and their permissions, which the rendered tab depends on."""
+    user = request.user
+    if user.is_superuser:
+        permissions = "*"
+    else:
+        permissions = ",".join(sorted(user.get_all_permissions()))
+    return f"{user.pk}:{permissions}"
+
+
+def get_render_digest(request, parts):
+    """Hash `parts` with everything else a rendered tab page depends on.
+
+    Besides the user, the pages embed the CSRF token and are translated, so
+    the CSRF cookie and the active language are part of the digest too.
+    """
+    values = [
+        request.get_full_path(),
+        get_user_cache_key(request),
+        request.META.get("CSRF_COOKIE", ""),
+        get_language(),
+        *parts,
+    ]
+    return hashlib.sha256(
+        "\n".join(str(value) for value in values).encode()
+    ).hexdigest()
+
+
+def connect_render_invalidation(tab_class, parent_model, tab_slug, nested):
+    """Drop the cached HTML of a tab when a row it shows is saved or deleted.
+
+    Nested changelist tabs watch their model. Tabs editing the parent watch
+    the parent model and the models of their inlines.
+    """
+
+    def connect(model, get_pk):
+        def invalidate(sender, instance, **kwargs):
+            parent_pk = get_pk(instance)
+            if parent_pk is not None:
+                cache.delete(
+                    get_render_generation_key(parent_model, parent_pk, tab_slug)
+                )
+
+        dispatch_uid = (
+            f"django_admin_tabs:render:{parent_model._meta.label_lower}:"
+            f"{tab_class.__module__}.{tab_class.__qualname__}"
+        )
+        for signal in (post_save, post_delete):
+            signal.connect(
+                invalidate, sender=model, weak=False, dispatch_uid=dispatch_uid
+            )
+
+    if nested:
+        connect(tab_class.model, partial(get_parent_pk, tab_class, parent_model))
+        return
+    connect(parent_model, attrgetter("pk"))
+    for inline in tab_class.inlines:
+        try:
+            fk = _get_foreign_key(parent_model, inline.model, fk_name=inline.fk_name)
+        except ValueError:
+            # Generic inlines expire with `cache_rendered_timeout`.
+            continue
+        connect(inline.model, attrgetter(fk.attname))
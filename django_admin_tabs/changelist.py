@@ -0,0 +1,41 @@
+from django.contrib.admin.views.main import ChangeList
+
+from .counting import CountStrategyChangeListMixin
+from .pagination import KeysetChangeListMixin
+from .timing import timed
+
+
+class TabChangeList(KeysetChangeListMixin, CountStrategyChangeListMixin, ChangeList):
+    """The ChangeList of an `AdminChangeListTab`, nested under a parent object.
+
+    The parent object and the tab are read from the model admin of each
+    instance, so the class is shared by every tab and request.
+    """
+
+    @property
+    def parent_object(self):
+        return self.model_admin.parent_object
+
+    @property
+    def tab_slug(self):
+        return self.model_admin.get_tab_slug()
+
+    def get_filters(self, request, *args, **kwargs):
+        with timed(self.model_admin.timer, "filters"):
+            return super().get_filters(request, *args, **kwargs)
+
+    def get_queryset(self, request, *args, **kwargs):
+        with timed(self.model_admin.timer, "queryset"):
+            return super().get_queryset(request, *args, **kwargs)
+
+    def get_results(self, request):
+        if self.model_admin.exporting:
+            # Exports stream `self.queryset`, skip counting and paging.
+            return
+        with timed(self.model_admin.timer, "results"):
+            super().get_results(request)
+            # Evaluates the page, later iterations reuse the result cache.
+            self.model_admin.attach_parent_object(self.result_list)
+
+    def url_for_result(self, result):
+        return self.model_admin.get_object_url(getattr(result, self.pk_attname))
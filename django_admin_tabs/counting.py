@@ -0,0 +1,224 @@
+import hashlib
+import json
+
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ALL_VAR
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, InvalidPage, PageNotAnInteger, Paginator
+from django.db import connections
+from django.utils.formats import number_format
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+
+from .timing import timed
+
+
+class CountStrategy:
+    """Counts the rows of a changelist queryset.
+
+    `count` returns a `(count, exact)` pair, `exact` is False when the count is
+    a lower bound or an estimate.
+    """
+
+    def count(self, queryset):
+        raise NotImplementedError
+
+
+class ExactCount(CountStrategy):
+    """A plain `COUNT(*)`, Django's default."""
+
+    def count(self, queryset):
+        return queryset.count(), True
+
+
+class CappedCount(CountStrategy):
+    """Count at most `cap` rows, displayed as "10,000+" beyond that."""
+
+    def __init__(self, cap=10000):
+        self.cap = cap
+
+    def count(self, queryset):
+        count = queryset.order_by()[: self.cap + 1].count()
+        if count > self.cap:
+            return self.cap, False
+        return count, True
+
+
+class EstimatedCount(CountStrategy):
+    """Use the planner row estimate of the backend for large querysets.
+
+    Estimates below `threshold` rows are replaced by the `fallback` count, as is
+    the whole count on backends without row estimates (only PostgreSQL
+    provides one).
+    """
+
+    def __init__(self, threshold=10000, fallback=None):
+        self.threshold = threshold
+        self.fallback = fallback or ExactCount()
+
+    def estimate(self, queryset):
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return None
+        sql, params = queryset.order_by().query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def count(self, queryset):
+        estimate = self.estimate(queryset)
+        if estimate is None or estimate < self.threshold:
+            return self.fallback.count(queryset)
+        return estimate, False
+
+
+class CachedCount(CountStrategy):
+    """Cache the result of another strategy for `timeout` seconds.
+
+    The cache key is derived from the SQL of the queryset, so every filter
+    combination is cached separately.
+    """
+
+    def __init__(self, timeout=300, strategy=None):
+        self.timeout = timeout
+        self.strategy = strategy or ExactCount()
+
+    def get_cache_key(self, queryset):
+        sql, params = queryset.order_by().query.sql_with_params()
+        digest = hashlib.sha256(repr((queryset.db, sql, params)).encode()).hexdigest()
+        return f"django_admin_tabs:changelist-count:{digest}"
+
+    def count(self, queryset):
+        key = self.get_cache_key(queryset)
+        result = cache.get(key)
+        if result is None:
+            result = self.strategy.count(queryset)
+            cache.set(key, result, self.timeout)
+        return tuple(result)
+
+
+class CountStrategyPaginator(Paginator):
+    """A Paginator counting its object list with a `CountStrategy`."""
+
+    def __init__(self, *args, count_strategy=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_strategy = count_strategy or ExactCount()
+
+    @cached_property
+    def count_result(self):
+        return self.count_strategy.count(self.object_list)
+
+    @cached_property
+    def count(self):
+        return self.count_result[0]
+
+    @property
+    def count_exact(self):
+        return self.count_result[1]
+
+    def validate_number(self, number):
+        if self.count_exact:
+            return super().validate_number(number)
+        # The count is a lower bound, `page` finds out whether later pages
+        # have rows.
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(_("That page number is not an integer"))
+        if number < 1:
+            raise EmptyPage(_("That page number is less than 1"))
+        return number
+
+    def page(self, number):
+        """Return a page, past an inexact count too.
+
+        Pages of an inexact count fetch one more row, telling whether a next
+        page exists. `num_pages` grows to include it.
+        """
+        if self.count_exact:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        object_list = list(self.object_list[bottom : bottom + self.per_page + 1])
+        if not object_list and number > 1:
+            raise EmptyPage(_("That page contains no results"))
+        has_next = len(object_list) > self.per_page
+        self.num_pages = max(self.num_pages, number + has_next)
+        return self._get_page(object_list[: self.per_page], number, self)
+
+
+class CountStrategyChangeListMixin:
+    """Count changelist results with the count strategy of the model admin."""
+
+    result_count_exact = True
+
+    @property
+    def result_count_display(self):
+        display = number_format(self.result_count, force_grouping=True)
+        return display if self.result_count_exact else f"{display}+"
+
+    @property
+    def page_range(self):
+        return self.paginator.get_elided_page_range(self.page_num)
+
+    @property
+    def show_all_url(self):
+        if self.can_show_all and not self.show_all and self.multi_page:
+            return self.get_query_string({ALL_VAR: ""})
+        return None
+
+    def count_results(self, request, queryset):
+        """Return the (count, exact) pair of `queryset`."""
+        get_count_strategy = getattr(self.model_admin, "get_count_strategy", None)
+        strategy = get_count_strategy(request) if get_count_strategy else None
+        with timed(getattr(self.model_admin, "timer", None), "count"):
+            return (strategy or ExactCount()).count(queryset)
+
+    def get_full_result_count(self, request):
+        if self.model_admin.show_full_result_count:
+            return self.count_results(request, self.root_queryset)[0]
+        return None
+
+    def get_results(self, request):
+        paginator = self.model_admin.get_paginator(
+            request, self.queryset, self.list_per_page
+        )
+        # Get the number of objects, with admin filters applied.
+        with timed(getattr(self.model_admin, "timer", None), "count"):
+            result_count = paginator.count
+        self.result_count_exact = getattr(paginator, "count_exact", True)
+
+        # Get the total number of objects, with no admin filters applied.
+        full_result_count = self.get_full_result_count(request)
+        can_show_all = self.result_count_exact and (
+            result_count <= self.list_max_show_all
+        )
+        # Past an inexact count, more rows than a page may exist.
+        multi_page = result_count > self.list_per_page or not self.result_count_exact
+
+        # Get the list of objects to display on this page.
+        if (self.show_all and can_show_all) or not multi_page:
+            result_list = self.queryset._clone()
+        else:
+            try:
+                result_list = paginator.page(self.page_num).object_list
+            except InvalidPage:
+                raise IncorrectLookupParameters
+
+        self.result_count = result_count
+        self.show_full_result_count = self.model_admin.show_full_result_count
+        # Admin actions are shown if there is at least one entry
+        # or if entries are not counted because show_full_result_count is disabled
+        self.show_admin_actions = not self.show_full_result_count or bool(
+            full_result_count
+        )
+        self.full_result_count = full_result_count
+        self.result_list = result_list
+        self.can_show_all = can_show_all
+        self.multi_page = multi_page
+        self.paginator = paginator
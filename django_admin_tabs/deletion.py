@@ -0,0 +1,241 @@
+from django.contrib import messages
+from django.contrib.admin.utils import quote
+from django.db import router, transaction
+from django.db.models import (
+    CASCADE,
+    DO_NOTHING,
+    PROTECT,
+    SET_DEFAULT,
+    SET_NULL,
+    ProtectedError,
+    QuerySet,
+)
+from django.db.models.deletion import get_candidate_relations_to_delete
+from django.http import HttpResponseRedirect
+from django.urls import reverse
+from django.utils.formats import number_format
+from django.utils.text import capfirst
+
+from .signals import pre_batch_delete
+
+
+class BatchedDeleteNotSupported(Exception):
+    """The cascade of a delete has to be handled by Django's collector."""
+
+
+class BatchedDeleteLimitExceeded(Exception):
+    """The delete is too large for the admin, see `delete_inline_limit`."""
+
+
+class BatchedDelete:
+    """Delete the rows of `queryset` and their cascade in bounded batches.
+
+    Cascaded rows are deleted leaves first, `batch_size` primary keys per query
+    and transaction, without loading them as model instances. Like
+    `QuerySet._raw_delete`, `delete()` methods aren't called and no delete
+    signals are sent, `pre_batch_delete` is sent with the primary keys of each
+    batch instead. Every batch leaves the database consistent, so an
+    interrupted job is resumed by running it again.
+
+    Raises `BatchedDeleteNotSupported` for cascades only the collector handles:
+    `RESTRICT`, `SET(...)` and custom `on_delete` handlers, generic relations,
+    multi-table inheritance and cycles.
+    """
+
+    def __init__(self, queryset, batch_size=1000):
+        self.model = queryset.model
+        self.using = router.db_for_write(self.model)
+        self.batch_size = batch_size
+        # (model, queryset, field, value) steps, field is None for deletes.
+        self.steps = []
+        self.protected = []
+        self.collect(self.model, queryset, ())
+
+    def collect(self, model, queryset, path):
+        opts = model._meta
+        if model in path:
+            raise BatchedDeleteNotSupported(f"{opts.label} cascades to itself.")
+        if opts.parents:
+            raise BatchedDeleteNotSupported(
+                f"{opts.label} uses multi-table inheritance."
+            )
+        if any(hasattr(field, "bulk_related_objects") for field in opts.private_fields):
+            raise BatchedDeleteNotSupported(f"{opts.label} has generic relations.")
+        for relation in get_candidate_relations_to_delete(opts):
+            field = relation.field
+            on_delete = field.remote_field.on_delete
+            related = relation.related_model._base_manager.using(self.using).filter(
+                **{f"{field.name}__in": queryset}
+            )
+            if on_delete is DO_NOTHING:
+                continue
+            if on_delete is CASCADE:
+                self.collect(relation.related_model, related, (*path, model))
+            elif on_delete is PROTECT:
+                self.protected.append((relation.related_model, related))
+            elif on_delete is SET_NULL:
+                self.steps.append((relation.related_model, related, field, None))
+            elif on_delete is SET_DEFAULT:
+                self.steps.append(
+                    (relation.related_model, related, field, field.get_default())
+                )
+            else:
+                raise BatchedDeleteNotSupported(
+                    f"{field.model._meta.label}.{field.name} has an unsupported "
+                    f"on_delete handler."
+                )
+        self.steps.append((model, queryset.using(self.using), None, None))
+
+    def get_counts(self):
+        """Return the number of rows to delete per model, leaves first.
+
+        Rows reachable through several relations are counted once per relation.
+        """
+        counts = {}
+        for model, queryset, field, _value in self.steps:
+            if field is None:
+                counts[model] = counts.get(model, 0) + queryset.count()
+        return counts
+
+    def get_protected(self):
+        """Return (model, count) pairs of the rows protecting the delete."""
+        protected = []
+        for model, queryset in self.protected:
+            count = queryset.count()
+            if count:
+                protected.append((model, count))
+        return protected
+
+    def run(self, progress=None):
+        """Run the delete, calling `progress(model, count)` after each batch.
+
+        Returns the number of deleted rows per model.
+        """
+        protected = self.get_protected()
+        if protected:
+            raise ProtectedError(
+                "Cannot delete, the rows are referenced through protected "
+                "foreign keys: "
+                + ", ".join(model._meta.label for model, _count in protected),
+                set(),
+            )
+        deleted = {}
+        for model, queryset, field, value in self.steps:
+            manager = model._base_manager.using(self.using)
+            last_pk = None
+            while True:
+                batch_queryset = queryset.order_by("pk")
+                if last_pk is not None:
+                    batch_queryset = batch_queryset.filter(pk__gt=last_pk)
+                pks = list(
+                    batch_queryset.values_list("pk", flat=True)[: self.batch_size]
+                )
+                if not pks:
+                    break
+                last_pk = pks[-1]
+                with transaction.atomic(using=self.using):
+                    batch = manager.filter(pk__in=pks)
+                    if field is None:
+                        pre_batch_delete.send(model, pks=pks, using=self.using)
+                        count = batch._raw_delete(self.using)
+                        deleted[model] = deleted.get(model, 0) + count
+                    else:
+                        count = batch.update(**{field.attname: value})
+                if progress is not None:
+                    progress(model, count)
+        return deleted
+
+
+class BatchedDeleteAdminMixin:
+    # Show the number of objects per model on the delete confirmation page
+    # instead of the tree of objects, and delete them in batches of
+    # `delete_batch_size` with `BatchedDelete`. Deletes of more than
+    # `delete_inline_limit` objects are refused with a message pointing to the
+    # `batched_delete` management command.
+    batched_delete = False
+    delete_batch_size = 1000
+    delete_inline_limit = None
+
+    def get_batched_delete(self, queryset):
+        """Return the delete job of `queryset`, or None to use the collector."""
+        if not self.batched_delete:
+            return None
+        try:
+            return BatchedDelete(queryset, self.delete_batch_size)
+        except BatchedDeleteNotSupported:
+            return None
+
+    def get_deleted_objects(self, objs, request):
+        if isinstance(objs, QuerySet):
+            queryset = objs
+        else:
+            queryset = self.model._base_manager.filter(pk__in=[obj.pk for obj in objs])
+        job = self.get_batched_delete(queryset)
+        if job is None:
+            return super().get_deleted_objects(objs, request)
+        counts = job.get_counts()
+        registry = self.admin_site._registry
+        perms_needed = {
+            model._meta.verbose_name
+            for model, count in counts.items()
+            if count
+            and model in registry
+            and not registry[model].has_delete_permission(request)
+        }
+        protected = [
+            f"{capfirst(model._meta.verbose_name_plural)}: {number_format(count)}"
+            for model, count in job.get_protected()
+        ]
+        total = sum(counts.values())
+        if self.delete_inline_limit is not None and total > self.delete_inline_limit:
+            pks = " ".join(str(pk) for pk in queryset.values_list("pk", flat=True))
+            raise BatchedDeleteLimitExceeded(
+                f"{number_format(total)} objects, more than can be deleted here. "
+                f"Run: manage.py batched_delete {self.model._meta.label} {pks}"
+            )
+        deleted_objects = [f"{capfirst(obj._meta.verbose_name)}: {obj}" for obj in objs]
+        model_count = {
+            model._meta.verbose_name_plural: count
+            for model, count in counts.items()
+            if count
+        }
+        return deleted_objects, model_count, perms_needed, protected
+
+    def delete_view(self, request, object_id, extra_context=None):
+        try:
+            return super().delete_view(request, object_id, extra_context)
+        except BatchedDeleteLimitExceeded as e:
+            self.message_user(request, str(e), messages.ERROR)
+            return HttpResponseRedirect(self.get_delete_limit_url(object_id))
+
+    def get_delete_limit_url(self, object_id):
+        """Return the URL to go back to when a delete is over the limit."""
+        opts = self.model._meta
+        return reverse(
+            f"admin:{opts.app_label}_{opts.model_name}_change",
+            args=(quote(object_id),),
+            current_app=self.admin_site.name,
+        )
+
+    def response_action(self, request, queryset):
+        try:
+            return super().response_action(request, queryset)
+        except BatchedDeleteLimitExceeded as e:
+            # The changelist redirects back to itself.
+            self.message_user(request, str(e), messages.ERROR)
+            return None
+
+    def delete_model(self, request, obj):
+        job = self.get_batched_delete(self.model._base_manager.filter(pk=obj.pk))
+        if job is None:
+            return super().delete_model(request, obj)
+        self.deleted_in_batches(request, job.run())
+
+    def delete_queryset(self, request, queryset):
+        job = self.get_batched_delete(queryset)
+        if job is None:
+            return super().delete_queryset(request, queryset)
+        self.deleted_in_batches(request, job.run())
+
+    def deleted_in_batches(self, request, deleted):
+        """Hook called after a batched delete, which sends no model signals."""
@@ -0,0 +1,87 @@
+import csv
+import datetime
+import json
+from itertools import islice
+
+from django.contrib.admin.utils import label_for_field, lookup_field
+from django.db import models
+from django.utils import timezone
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+from django.utils.text import capfirst
+
+
+class Echo:
+    """A file-like object returning what is written, for streaming csv rows."""
+
+    def write(self, value):
+        return value
+
+
+def export_value(value):
+    """Convert a `list_display` value to a plain CSV/JSON value."""
+    if value is None:
+        return None
+    if isinstance(value, datetime.datetime):
+        if timezone.is_aware(value):
+            value = timezone.localtime(value)
+        return value.isoformat()
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (models.Model, Promise)):
+        return force_str(value)
+    return str(value)
+
+
+def iter_export_rows(model_admin, queryset, list_display, chunk_size):
+    """Yield one list of exported values per object of `queryset`.
+
+    Reads the queryset with `.iterator(chunk_size=...)` so memory stays flat,
+    each chunk gets the parent object attached by the model admin.
+    """
+    iterator = queryset.iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        model_admin.attach_parent_object(chunk)
+        for obj in chunk:
+            row = []
+            for field_name in list_display:
+                try:
+                    _field, _attr, value = lookup_field(field_name, obj, model_admin)
+                except models.ObjectDoesNotExist:
+                    value = None
+                row.append(export_value(value))
+            yield row
+
+
+def stream_csv(model_admin, list_display, rows):
+    """Stream a header of column labels followed by the rows as CSV."""
+    writer = csv.writer(Echo())
+    yield writer.writerow(
+        [
+            capfirst(label_for_field(field_name, model_admin.model, model_admin))
+            for field_name in list_display
+        ]
+    )
+    for row in rows:
+        yield writer.writerow(["" if value is None else value for value in row])
+
+
+def stream_jsonl(model_admin, list_display, rows):
+    """Stream one JSON object per row, keyed by the `list_display` names."""
+    keys = [
+        field_name if isinstance(field_name, str) else field_name.__name__
+        for field_name in list_display
+    ]
+    for row in rows:
+        yield json.dumps(dict(zip(keys, row)), ensure_ascii=False) + "\n"
+
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", stream_csv),
+    "jsonl": ("application/x-ndjson", stream_jsonl),
+}
@@ -0,0 +1,108 @@
+import operator
+
+from django.contrib.admin import RelatedFieldListFilter, RelatedOnlyFieldListFilter
+from django.contrib.admin.utils import NotRelationField, get_fields_from_path
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models.constants import LOOKUP_SEP
+
+from .related import attach_parent_object
+
+
+class ScopedRelatedFieldListFilter(RelatedFieldListFilter):
+    """A related field filter offering only the objects used by the tab rows.
+
+    The options are looked up through the scoped queryset of the tab, so only
+    the related objects of the parent are loaded. At most
+    `list_filter_choices_limit` options of the model admin are shown, with a
+    search box over the related model admin's `search_fields` beyond that.
+    """
+
+    template = "admin/django_admin_tabs/scoped_filter.html"
+    choices_truncated = False
+    search_params = ()
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        self.lookup_kwarg_search = f"{field_path}__q"
+        self.search_value = params.get(self.lookup_kwarg_search)
+        if isinstance(self.search_value, list):
+            self.search_value = self.search_value[-1]
+        self.related_admin = model_admin.admin_site._registry.get(
+            field.remote_field.model
+        )
+        super().__init__(field, request, params, model, model_admin, field_path)
+        self.used_parameters.pop(self.lookup_kwarg_search, None)
+
+    @property
+    def search_enabled(self):
+        return bool(self.related_admin and self.related_admin.search_fields)
+
+    def has_output(self):
+        return self.choices_truncated or bool(self.search_value) or super().has_output()
+
+    def expected_parameters(self):
+        return [*super().expected_parameters(), self.lookup_kwarg_search]
+
+    def field_choices(self, field, request, model_admin):
+        pk_qs = (
+            model_admin.get_queryset(request)
+            .order_by()
+            .distinct()
+            .values_list(f"{self.field_path}__pk", flat=True)
+        )
+        queryset = field.remote_field.model._default_manager.filter(pk__in=pk_qs)
+        if self.search_value and self.search_enabled:
+            queryset, _may_have_duplicates = self.related_admin.get_search_results(
+                request, queryset, self.search_value
+            )
+        ordering = self.field_admin_ordering(field, request, model_admin)
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        limit = getattr(model_admin, "list_filter_choices_limit", None)
+        if limit is not None:
+            objs = list(queryset[: limit + 1])
+            self.choices_truncated = len(objs) > limit
+            objs = objs[:limit]
+        else:
+            objs = list(queryset)
+        fk_field = getattr(model_admin, "fk_field", None) or ""
+        if fk_field.startswith(f"{self.field_path}{LOOKUP_SEP}"):
+            # Options referencing the parent render without querying it again.
+            attach_parent_object(
+                objs,
+                fk_field[len(self.field_path) + len(LOOKUP_SEP) :],
+                model_admin.parent_object,
+            )
+        if hasattr(field.remote_field, "get_related_field"):
+            choice_func = operator.attrgetter(
+                field.remote_field.get_related_field().attname
+            )
+        else:
+            choice_func = operator.attrgetter("pk")
+        return [(choice_func(obj), str(obj)) for obj in objs]
+
+    def choices(self, changelist):
+        self.search_params = [
+            (key, value)
+            for key, value in changelist.params.items()
+            if key not in self.expected_parameters()
+        ]
+        yield from super().choices(changelist)
+
+
+def scope_list_filter(model, list_filter):
+    """Swap plain related-field filters for `ScopedRelatedFieldListFilter`."""
+    if isinstance(list_filter, str):
+        field_path, filter_class = list_filter, None
+    elif isinstance(list_filter, (tuple, list)):
+        field_path, filter_class = list_filter
+        if filter_class not in (RelatedFieldListFilter, RelatedOnlyFieldListFilter):
+            return list_filter
+    else:
+        return list_filter
+    try:
+        field = get_fields_from_path(model, field_path)[-1]
+    except (FieldDoesNotExist, NotRelationField):
+        return list_filter
+    if not field.is_relation or not field.concrete:
+        return list_filter
+    return (field_path, ScopedRelatedFieldListFilter)
@@ -0,0 +1,69 @@
+from django.template.context import make_context
+from django.template.loader_tags import (
+    BLOCK_CONTEXT_KEY,
+    BlockContext,
+    BlockNode,
+    ExtendsNode,
+)
+from django.template.response import TemplateResponse
+
+# The blocks of "admin/base.html" making up the title and the `#content` element.
+FRAGMENT_BLOCKS = (
+    "title",
+    "coltype",
+    "pretitle",
+    "content_title",
+    "content_subtitle",
+    "content",
+    "sidebar",
+)
+
+
+def render_blocks(template, context, request, names):
+    """Render the named blocks of `template` on their own.
+
+    The blocks are resolved through the `{% extends %}` chain like a full
+    render would, `{{ block.super }}` included, but nothing outside of them is
+    rendered. Blocks missing from the chain render as empty strings.
+    """
+    template = template.template
+    context = make_context(context, request, autoescape=template.engine.autoescape)
+    with context.render_context.push_state(template), context.bind_template(template):
+        block_context = BlockContext()
+        context.render_context[BLOCK_CONTEXT_KEY] = block_context
+        compiled = template
+        while compiled is not None:
+            block_context.add_blocks(
+                {
+                    node.name: node
+                    for node in compiled.nodelist.get_nodes_by_type(BlockNode)
+                }
+            )
+            extends = compiled.nodelist.get_nodes_by_type(ExtendsNode)
+            compiled = extends[0].get_parent(context) if extends else None
+        rendered = {}
+        for name in names:
+            block = block_context.get_block(name)
+            rendered[name] = block.render(context) if block is not None else ""
+        return rendered
+
+
+def render_tab_fragment(request, response):
+    """Turn the page response of a tab into the fragment of its content.
+
+    Redirects, errors and other non-template responses are returned as is.
+    """
+    if not isinstance(response, TemplateResponse) or response.status_code != 200:
+        return response
+    template = response.resolve_template(response.template_name)
+    context = response.resolve_context(response.context_data)
+    fragment = TemplateResponse(
+        request,
+        "admin/django_admin_tabs/tab_fragment.html",
+        {
+            "blocks": render_blocks(template, context, request, FRAGMENT_BLOCKS),
+            "media": context.get("media"),
+        },
+    )
+    fragment["X-Django-Admin-Tabs-Fragment"] = "1"
+    return fragment
@@ -0,0 +1,168 @@
+import csv
+import io
+from functools import partial
+from itertools import islice
+from typing import List, NamedTuple, Tuple
+
+from django import forms
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, router, transaction
+from django.forms import ModelChoiceField, ModelMultipleChoiceField
+
+
+class ImportChunk(NamedTuple):
+    first_line: int
+    last_line: int
+    rows: int
+    created: int
+    errors: List[Tuple[int, str]]
+
+
+class CSVImportForm(forms.Form):
+    file = forms.FileField(
+        help_text="UTF-8 encoded, with a header row naming the columns."
+    )
+
+
+def read_csv_rows(upload, encoding="utf-8-sig"):
+    """Yield (line number, row) pairs of an uploaded CSV file.
+
+    The file is decoded while it is read, from memory or from the temporary
+    file of a large upload, so it is never loaded as a whole.
+    """
+    reader = csv.DictReader(
+        io.TextIOWrapper(upload.file, encoding=encoding, newline="")
+    )
+    for row in reader:
+        yield reader.line_num, row
+
+
+def lookup_choice(field, key_field, objects, value):
+    """`ModelChoiceField.to_python` resolving `value` from preloaded objects."""
+    if value in field.empty_values:
+        return None
+    try:
+        return objects[key_field.to_python(value)]
+    except (KeyError, ValidationError):
+        raise ValidationError(
+            field.error_messages["invalid_choice"],
+            code="invalid_choice",
+            params={"value": value},
+        )
+
+
+def get_chunk_lookups(fields, rows):
+    """Load the objects chosen by the rows, in one query per choice field.
+
+    `fields` are the fields of a form instance, with `limit_choices_to`
+    applied. Returns the choice field names mapped to their key field and the
+    objects by key. Multiple choice fields aren't resolved.
+    """
+    lookups = {}
+    for name, field in fields.items():
+        if not isinstance(field, ModelChoiceField) or isinstance(
+            field, ModelMultipleChoiceField
+        ):
+            continue
+        opts = field.queryset.model._meta
+        key_field = (
+            opts.get_field(field.to_field_name) if field.to_field_name else opts.pk
+        )
+        keys = set()
+        for _line, row in rows:
+            try:
+                keys.add(key_field.to_python(row.get(name)))
+            except ValidationError:
+                pass
+        keys.discard(None)
+        objects = field.queryset.filter(**{f"{key_field.name}__in": keys})
+        lookups[name] = (
+            key_field,
+            {getattr(obj, key_field.attname): obj for obj in objects},
+        )
+    return lookups
+
+
+class ChunkLookupFormMixin:
+    """A ModelForm taking its chosen objects from `get_chunk_lookups`.
+
+    The looked up fields skip the per-row queries of `ModelChoiceField` and of
+    the model's foreign key validation, the chunk's query already applied the
+    field's queryset.
+    """
+
+    def __init__(self, *args, lookups=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lookups = lookups or {}
+        for name, (key_field, objects) in self.lookups.items():
+            field = self.fields[name]
+            field.to_python = partial(lookup_choice, field, key_field, objects)
+
+    def _get_validation_exclusions(self):
+        exclude = super()._get_validation_exclusions()
+        names = [name for name in self.lookups if name not in exclude]
+        if isinstance(exclude, set):
+            return exclude.union(names)
+        return [*exclude, *names]
+
+
+def iter_import_chunks(form_class, rows, chunk_size, prepare, created=None):
+    """Validate and insert `rows` `chunk_size` at a time, yielding `ImportChunk`s.
+
+    Valid rows are inserted with `bulk_create` in one transaction per chunk
+    after `prepare(obj)`, then passed to `created(objs)`. Invalid rows are
+    skipped and reported. A chunk violating a database constraint isn't
+    inserted at all.
+    """
+    form_class = type(form_class.__name__, (ChunkLookupFormMixin, form_class), {})
+    model = form_class._meta.model
+    manager = model._default_manager
+    fields = form_class().fields
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        lookups = get_chunk_lookups(fields, chunk)
+        objs, errors = [], []
+        for line, row in chunk:
+            form = form_class(data=row, lookups=lookups)
+            if form.is_valid():
+                obj = form.save(commit=False)
+                prepare(obj)
+                objs.append(obj)
+            else:
+                errors.extend(
+                    (
+                        line,
+                        f"{name}: {' '.join(messages)}"
+                        if name != "__all__"
+                        else " ".join(messages),
+                    )
+                    for name, messages in form.errors.items()
+                )
+        if objs:
+            try:
+                with transaction.atomic(using=router.db_for_write(model)):
+                    manager.bulk_create(objs, batch_size=chunk_size)
+            except IntegrityError as e:
+                errors.append((chunk[0][0], f"Chunk not imported: {e}"))
+                objs = []
+        if objs and created is not None:
+            created(objs)
+        yield ImportChunk(chunk[0][0], chunk[-1][0], len(chunk), len(objs), errors)
+
+
+def stream_import_report(chunks):
+    """Stream a plain text line per chunk and per error, then the totals."""
+    rows = created = 0
+    for chunk in chunks:
+        rows += chunk.rows
+        created += chunk.created
+        yield (
+            f"Lines {chunk.first_line}-{chunk.last_line}: "
+            f"{chunk.created} of {chunk.rows} rows imported\n"
+        )
+        for line, message in chunk.errors:
+            yield f"  Line {line}: {message}\n"
+    yield f"Done: {created} of {rows} rows imported.\n"
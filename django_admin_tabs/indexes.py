@@ -0,0 +1,239 @@
+import re
+from typing import List, NamedTuple
+
+from django.conf import settings
+from django.contrib.admin.sites import all_sites
+from django.contrib.auth import get_user_model
+from django.core import checks
+from django.core.exceptions import FieldDoesNotExist
+from django.http import HttpRequest
+from django.db import DatabaseError, connections, router, transaction
+from django.db.models.constants import LOOKUP_SEP
+from django.utils import timezone
+
+SCAN_PATTERNS = {
+    # "SCAN polls_answer", "SCAN TABLE polls_answer" before SQLite 3.36.
+    "sqlite": re.compile(r"\bSCAN (?:TABLE )?(?!CONSTANT ROW|SUBQUERY)(\w+)"),
+    "postgresql": re.compile(r"\bSeq Scan on (\w+)"),
+}
+
+
+class TabQueryPlan(NamedTuple):
+    parent_model: type
+    tab_class: type
+    query: str
+    plan: str
+    scans: List[str]
+    suggestions: List[str]
+
+
+def iter_changelist_tabs(sites=None):
+    """Yield (parent admin, tab class) pairs of the changelist tabs of the sites."""
+    from .admin import AdminChangeListTab, TabbedModelAdmin
+
+    seen = set()
+    for site in all_sites if sites is None else sites:
+        for model_admin in site._registry.values():
+            if not isinstance(model_admin, TabbedModelAdmin):
+                continue
+            for tab_class in model_admin.admin_tabs:
+                key = (model_admin.model, tab_class)
+                if issubclass(tab_class, AdminChangeListTab) and key not in seen:
+                    seen.add(key)
+                    yield model_admin, tab_class
+
+
+def get_placeholder_parent(parent_model, using):
+    """Return a parent row, or an unsaved stand-in when the table is empty."""
+    parent = parent_model._base_manager.using(using).first()
+    if parent is None:
+        parent = parent_model(pk=parent_model._meta.pk.to_python(0))
+        parent._state.adding = False
+        parent._state.db = using
+    return parent
+
+
+def get_offline_request():
+    """Return a GET request of an unsaved superuser, for views outside requests."""
+    request = HttpRequest()
+    request.method = "GET"
+    request.user = get_user_model()(is_active=True, is_staff=True, is_superuser=True)
+    return request
+
+
+def get_tab_queryset(parent_admin, tab_class, parent_object, request, explaining=False):
+    """Return the tab bound to the parent and its rows in changelist ordering.
+
+    When `explaining`, the keys of "pk_list" scoping aren't cached.
+    """
+    tab = parent_admin.build_admin_tab(tab_class, parent_object)
+    tab._explaining = explaining
+    queryset = tab.get_queryset(request).using(parent_object._state.db)
+    ordering = list(tab.get_ordering(request) or queryset.model._meta.ordering)
+    if not any(
+        field.lstrip("-") in ("pk", queryset.model._meta.pk.name) for field in ordering
+    ):
+        ordering.append("-pk")
+    return tab, queryset.order_by(*ordering)
+
+
+def get_tab_querysets(parent_admin, tab_class, using):
+    """Return (name, queryset) pairs of the row queries of a tab view.
+
+    The rows of the first page in the default ordering, and with a
+    `date_hierarchy`, the rows of the current year. Nothing is cached for the
+    placeholder parent.
+    """
+    tab, queryset = get_tab_queryset(
+        parent_admin,
+        tab_class,
+        get_placeholder_parent(parent_admin.model, using),
+        get_offline_request(),
+        explaining=True,
+    )
+    querysets = [("page", queryset[: tab.list_per_page])]
+    if tab.date_hierarchy:
+        year = {f"{tab.date_hierarchy}__year": timezone.now().year}
+        querysets.append(
+            ("date_hierarchy", queryset.filter(**year)[: tab.list_per_page])
+        )
+    return tab, querysets
+
+
+def explain(queryset):
+    """Return the plan of `queryset` and the tables it scans.
+
+    PostgreSQL plans with sequential scans disabled, so a remaining one means
+    no index can be used whatever the table size.
+    """
+    connection = connections[queryset.db]
+    with transaction.atomic(using=queryset.db):
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = queryset.explain()
+    return plan, SCAN_PATTERNS[connection.vendor].findall(plan)
+
+
+def has_index_prefix(model, columns):
+    """Whether an index of `model` starts with `columns`."""
+    opts = model._meta
+    prefixes = [
+        [opts.get_field(name.lstrip("-")).column for name in index.fields]
+        for index in opts.indexes
+    ]
+    prefixes += [
+        [opts.get_field(name).column for name in fields]
+        for fields in [*opts.unique_together, *getattr(opts, "index_together", ())]
+    ]
+    prefixes += [
+        [opts.get_field(name).column for name in constraint.fields]
+        for constraint in opts.constraints
+        if getattr(constraint, "fields", None) and constraint.condition is None
+    ]
+    prefixes += [
+        [field.column]
+        for field in opts.local_concrete_fields
+        if field.db_index or field.unique or field.primary_key
+    ]
+    return any(prefix[: len(columns)] == columns for prefix in prefixes)
+
+
+def suggest_index(model, fields):
+    """Return an `Index` definition of `fields`, or None when one exists."""
+    columns = [model._meta.get_field(name.lstrip("-")).column for name in fields]
+    if has_index_prefix(model, columns):
+        return None
+    return f"{model._meta.label}: models.Index(fields={fields!r})"
+
+
+def is_local_column(model, name):
+    """Whether the ordering `name` is a non-pk column of `model`."""
+    if not isinstance(name, str) or LOOKUP_SEP in name:
+        return False
+    try:
+        field = model._meta.get_field(name.lstrip("-"))
+    except FieldDoesNotExist:
+        return False
+    return field.concrete and not field.primary_key
+
+
+def suggest_indexes(tab, ordering):
+    """Suggest indexes for the `fk_field` path or generic relation of a tab.
+
+    The first index, on the tab model, also covers the first ordering column.
+    """
+    model = tab.model
+    order = [name for name in ordering[:1] if is_local_column(model, name)]
+    if not tab.fk_field:
+        indexes = [[tab.ct_field, tab.ct_fk_field, *order]]
+        hops = [(model, indexes[0])]
+    else:
+        hops = []
+        for name in tab.fk_field.split(LOOKUP_SEP):
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                break
+            if not (field.many_to_one or field.one_to_one) or not field.concrete:
+                break
+            hops.append((model, [name, *order] if not hops else [name]))
+            model = field.related_model
+    return [
+        suggestion
+        for suggestion in (suggest_index(model, fields) for model, fields in hops)
+        if suggestion
+    ]
+
+
+def iter_tab_query_plans(sites=None, using=None):
+    """Yield a `TabQueryPlan` per row query of every changelist tab."""
+    for parent_admin, tab_class in iter_changelist_tabs(sites):
+        alias = using or router.db_for_read(tab_class.model or parent_admin.model)
+        if connections[alias].vendor not in SCAN_PATTERNS:
+            continue
+        try:
+            tab, querysets = get_tab_querysets(parent_admin, tab_class, alias)
+            plans = [
+                (name, queryset, *explain(queryset)) for name, queryset in querysets
+            ]
+        except DatabaseError:
+            # The tables aren't migrated yet, e.g. during the checks of migrate.
+            continue
+        for name, queryset, plan, scans in plans:
+            suggestions = (
+                suggest_indexes(tab, list(queryset.query.order_by)) if scans else []
+            )
+            yield TabQueryPlan(
+                parent_admin.model, tab_class, name, plan, scans, suggestions
+            )
+
+
+def check_tab_indexes(app_configs=None, databases=None, **kwargs):
+    """Warn about tab queries scanning tables.
+
+    Runs with `check --database` and before `migrate` when the
+    `DJANGO_ADMIN_TABS_INDEX_CHECK` setting is enabled.
+    """
+    if not getattr(settings, "DJANGO_ADMIN_TABS_INDEX_CHECK", False):
+        return []
+    errors = []
+    for alias in databases or ():
+        for plan in iter_tab_query_plans(using=alias):
+            if not plan.scans:
+                continue
+            errors.append(
+                checks.Warning(
+                    f"The {plan.query} query of tab '{plan.tab_class.__name__}' "
+                    f"of {plan.parent_model._meta.label} scans "
+                    f"{', '.join(sorted(set(plan.scans)))} on database '{alias}'.",
+                    hint="Add "
+                    + "; ".join(plan.suggestions)
+                    + ", or see the plan with 'manage.py tab_indexes -v 2'."
+                    if plan.suggestions
+                    else "See the plan with 'manage.py tab_indexes -v 2'.",
+                    obj=plan.tab_class,
+                    id="django_admin_tabs.W001",
+                )
+            )
+    return errors
@@ -0,0 +1,86 @@
+from django.contrib import admin
+from django.core.paginator import Paginator
+from django.forms.models import BaseInlineFormSet
+from django.http import QueryDict
+
+from .related import attach_parent_object
+
+
+class PaginatedInlineFormSet(BaseInlineFormSet):
+    """An inline formset rendering and saving one page of the related objects.
+
+    The page number is read from the `<prefix>-page` parameter of
+    `query_params`, the query string of the change form.
+    """
+
+    per_page = 50
+    query_params = QueryDict()
+
+    @property
+    def page_param(self):
+        return f"{self.prefix}-page"
+
+    def get_queryset(self):
+        if not hasattr(self, "page"):
+            paginator = Paginator(super().get_queryset(), self.per_page)
+            self.page = paginator.get_page(self.query_params.get(self.page_param))
+            self._queryset = list(self.page.object_list)
+            # Rendering the objects, e.g. their `__str__`, doesn't query the parent.
+            attach_parent_object(self._queryset, self.fk.name, self.instance)
+        return self._queryset
+
+    def _existing_object(self, pk):
+        obj = super()._existing_object(pk)
+        if obj is None:
+            # The object moved to another page since the form was rendered.
+            obj = self.queryset.filter(pk=pk).first()
+        return obj
+
+    def get_page_url(self, number):
+        query = self.query_params.copy()
+        query[self.page_param] = number
+        return f"?{query.urlencode()}"
+
+    @property
+    def page_links(self):
+        """Return (number, url) pairs, without url for the page and ellipses."""
+        paginator = self.page.paginator
+        return [
+            (
+                number,
+                None
+                if number in (self.page.number, paginator.ELLIPSIS)
+                else self.get_page_url(number),
+            )
+            for number in paginator.get_elided_page_range(self.page.number)
+        ]
+
+
+class PaginatedInlineMixin:
+    """Render and save the inline objects `per_page` at a time.
+
+    Page links only change the page parameter of their inline, so preserved
+    filters and the pages of other inlines are kept.
+    """
+
+    formset = PaginatedInlineFormSet
+    per_page = 50
+
+    def __init__(self, parent_model, admin_site):
+        super().__init__(parent_model, admin_site)
+        self.inline_template = self.template
+        self.template = "admin/django_admin_tabs/edit_inline/paginated.html"
+
+    def get_formset(self, request, obj=None, **kwargs):
+        formset = super().get_formset(request, obj, **kwargs)
+        formset.per_page = self.per_page
+        formset.query_params = request.GET
+        return formset
+
+
+class PaginatedStackedInline(PaginatedInlineMixin, admin.StackedInline):
+    pass
+
+
+class PaginatedTabularInline(PaginatedInlineMixin, admin.TabularInline):
+    pass
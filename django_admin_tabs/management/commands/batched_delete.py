@@ -0,0 +1,50 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from django_admin_tabs.deletion import BatchedDelete, BatchedDeleteNotSupported
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete objects and their cascade in batches. Running it again resumes "
+        "an interrupted delete."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("model", help="The model, as app_label.ModelName.")
+        parser.add_argument("pks", nargs="+", help="Primary keys of the objects.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Print the number of objects to delete per model and stop.",
+        )
+
+    def handle(self, *args, model, pks, batch_size, dry_run, **options):
+        try:
+            model = apps.get_model(model)
+        except (LookupError, ValueError) as e:
+            raise CommandError(str(e))
+        try:
+            job = BatchedDelete(model._base_manager.filter(pk__in=pks), batch_size)
+        except BatchedDeleteNotSupported as e:
+            raise CommandError(f"{e} Delete the objects with QuerySet.delete().")
+        protected = job.get_protected()
+        if protected:
+            raise CommandError(
+                "Protected foreign keys reference the objects: "
+                + ", ".join(f"{m._meta.label}: {count}" for m, count in protected)
+            )
+        for related_model, count in job.get_counts().items():
+            self.stdout.write(f"{related_model._meta.label}: {count}")
+        if dry_run:
+            return
+
+        def progress(related_model, count):
+            if options["verbosity"] > 1:
+                self.stdout.write(f"  {related_model._meta.label}: {count}")
+
+        deleted = job.run(progress)
+        self.stdout.write(
+            self.style.SUCCESS(f"Deleted {sum(deleted.values())} objects.")
+        )
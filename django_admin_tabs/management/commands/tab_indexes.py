@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from django_admin_tabs.indexes import iter_tab_query_plans
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN the row queries of every changelist tab and suggest indexes for "
+        "the ones scanning tables. Supports SQLite and PostgreSQL."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            help=(
+                "The database to explain on, the tab model's read database by default."
+            ),
+        )
+
+    def handle(self, *args, database=None, verbosity=1, **options):
+        scanning = 0
+        for plan in iter_tab_query_plans(using=database):
+            parent_label = plan.parent_model._meta.label
+            tab_name = plan.tab_class.get_class_tab_name()
+            label = f"{parent_label} > {tab_name} ({plan.query})"
+            if plan.scans:
+                scanning += 1
+                scans = ", ".join(sorted(set(plan.scans)))
+                self.stdout.write(self.style.WARNING(f"{label}: scans {scans}"))
+                for suggestion in plan.suggestions:
+                    self.stdout.write(f"  {suggestion}")
+            else:
+                self.stdout.write(f"{label}: ok")
+            if verbosity > 1:
+                for line in plan.plan.splitlines():
+                    self.stdout.write(f"    {line}")
+        if scanning:
+            self.stdout.write(
+                self.style.WARNING(f"{scanning} tab queries scan tables.")
+            )
@@ -0,0 +1,60 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from django_admin_tabs.indexes import get_offline_request, iter_changelist_tabs
+from django_admin_tabs.scoping import (
+    measure_scoping,
+    recommend_scoping,
+    split_fk_field,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the fk_scoping strategies of the changelist tabs of a parent object "
+        "and recommend one per tab."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("model", help="The parent model, as app_label.ModelName.")
+        parser.add_argument("pk", help="Primary key of the parent object.")
+        parser.add_argument("--tab", help="Only measure the tab with this slug.")
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, model, pk, tab=None, repeat=5, **options):
+        try:
+            model = apps.get_model(model)
+        except (LookupError, ValueError) as e:
+            raise CommandError(str(e))
+        try:
+            parent_object = model._base_manager.get(pk=pk)
+        except (model.DoesNotExist, ValueError):
+            raise CommandError(f"No {model._meta.label} with pk {pk!r}.")
+        request = get_offline_request()
+        measured = False
+        for parent_admin, tab_class in iter_changelist_tabs():
+            if parent_admin.model is not model:
+                continue
+            menu_item = parent_admin.get_tab_menu_item(tab_class)
+            if tab is not None and menu_item.slug != tab:
+                continue
+            if split_fk_field(tab_class.model, tab_class.fk_field or "") is None:
+                continue
+            measured = True
+            timings = measure_scoping(
+                parent_admin, tab_class, parent_object, request, repeat
+            )
+            self.stdout.write(
+                f"{model._meta.label} {parent_object.pk} > "
+                f"{menu_item.name} ({tab_class.fk_field})"
+            )
+            for strategy, median in timings.items():
+                self.stdout.write(f"  {strategy:<10} {median:>8.2f} ms")
+            recommended = recommend_scoping(timings)
+            self.stdout.write(
+                self.style.SUCCESS(f'  Recommended: fk_scoping = "{recommended}"')
+            )
+        if not measured:
+            raise CommandError(
+                f"No changelist tab of {model._meta.label} has a multi-hop fk_field."
+            )
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from django_admin_tabs.indexes import iter_changelist_tabs
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the full-text search indexes of the changelist tabs with "
+        "full_text_search, replacing existing ones."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, database, batch_size, **options):
+        connection = connections[database]
+        built = set()
+        for parent_admin, tab_class in iter_changelist_tabs():
+            if not tab_class.full_text_search:
+                continue
+            index = parent_admin.build_admin_tab(tab_class, None).get_search_index()
+            if index is None:
+                self.stderr.write(
+                    f"{tab_class.__name__}: search_fields can't be indexed, "
+                    "see manage.py check."
+                )
+                continue
+            table = index.get_table(connection)
+            if table in built:
+                continue
+            built.add(table)
+            indexed = index.rebuild(database, batch_size)
+            label = f"{index.model._meta.label} ({', '.join(index.fields)})"
+            if indexed is None:
+                self.stderr.write(
+                    f"{label}: no search backend for the {connection.vendor} "
+                    f"database '{database}'."
+                )
+            else:
+                self.stdout.write(
+                    self.style.SUCCESS(f"{label}: {indexed} rows indexed in {table}.")
+                )
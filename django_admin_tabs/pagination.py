@@ -0,0 +1,183 @@
+import base64
+import json
+
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import PAGE_VAR
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from django.db.models.constants import LOOKUP_SEP
+
+CURSOR_VAR = "cursor"
+
+NEXT = "next"
+PREVIOUS = "previous"
+
+
+def encode_cursor(direction, values):
+    values = [
+        value.isoformat()
+        if hasattr(value, "isoformat")
+        else value
+        if value is None or isinstance(value, (bool, int, float, str))
+        else str(value)
+        for value in values
+    ]
+    data = json.dumps([direction, values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Return the (direction, values) pair of a cursor, or raise ValueError."""
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        direction, values = json.loads(data)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor {cursor!r}") from e
+    if direction not in (NEXT, PREVIOUS) or not isinstance(values, list):
+        raise ValueError(f"Invalid cursor {cursor!r}")
+    return direction, values
+
+
+def get_keyset_filter(keyset, values, reverse=False):
+    """Build the seek condition selecting the rows after `values`.
+
+    For an ordering `(a, -b)` this is `a > va OR (a = va AND b < vb)`.
+    """
+    condition = Q()
+    equal = {}
+    for (path, descending, _field), value in zip(keyset, values):
+        lookup = "lt" if descending != reverse else "gt"
+        condition |= Q(**equal, **{f"{path}{LOOKUP_SEP}{lookup}": value})
+        equal[path] = value
+    return condition
+
+
+class KeysetChangeListMixin:
+    """Page a ChangeList on its ordering columns instead of OFFSET/LIMIT.
+
+    Enabled when the model admin sets `pagination = "keyset"`. The position is
+    carried in the `cursor` querystring parameter. Orderings that can't be
+    seeked, such as expressions or nullable columns, fall back to the default
+    paginator. Counts are delegated to `CountStrategyChangeListMixin`.
+    """
+
+    keyset_pagination = False
+    next_page_url = None
+    previous_page_url = None
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        lookup_params.pop(CURSOR_VAR, None)
+        return lookup_params
+
+    def get_query_string(self, new_params=None, remove=None):
+        # Any change of filters, ordering or search starts from the first page.
+        return super().get_query_string(new_params, [*(remove or []), CURSOR_VAR])
+
+    def get_keyset(self):
+        """Return (path, descending, field) for each ordering column, or None."""
+        if getattr(self.model_admin, "pagination", None) != "keyset":
+            return None
+        keyset = []
+        for ordering in self.queryset.query.order_by:
+            if not isinstance(ordering, str) or ordering == "?":
+                return None
+            descending = ordering.startswith("-")
+            path = ordering.lstrip("-")
+            field = self._resolve_keyset_field(path)
+            if field is None:
+                return None
+            keyset.append((path, descending, field))
+        return keyset or None
+
+    def _resolve_keyset_field(self, path):
+        opts = self.model._meta
+        *relations, name = path.split(LOOKUP_SEP)
+        try:
+            for relation in relations:
+                field = opts.get_field(relation)
+                if not (field.many_to_one or field.one_to_one) or field.null:
+                    return None
+                opts = field.related_model._meta
+            field = opts.pk if name == "pk" else opts.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        if field.is_relation or not field.concrete or field.null:
+            return None
+        return field
+
+    def get_keyset_values(self, obj, keyset):
+        values = []
+        for path, _descending, _field in keyset:
+            value = obj
+            for name in path.split(LOOKUP_SEP):
+                value = getattr(value, name)
+            values.append(value)
+        return values
+
+    def get_results(self, request):
+        # Keep the cursor out of the search form and filter links.
+        self.params.pop(CURSOR_VAR, None)
+        keyset = self.get_keyset()
+        if keyset is None:
+            return super().get_results(request)
+
+        direction, values = NEXT, None
+        if CURSOR_VAR in request.GET:
+            try:
+                direction, values = decode_cursor(request.GET[CURSOR_VAR])
+                if len(values) != len(keyset):
+                    raise ValueError("Cursor does not match the ordering")
+                values = [
+                    field.to_python(value)
+                    for (_path, _descending, field), value in zip(keyset, values)
+                ]
+            except (ValueError, ValidationError) as e:
+                raise IncorrectLookupParameters(e) from e
+
+        queryset = self.queryset
+        reverse = direction == PREVIOUS
+        if values is not None:
+            queryset = queryset.filter(get_keyset_filter(keyset, values, reverse))
+        if reverse:
+            queryset = queryset.reverse()
+        result_list = list(queryset[: self.list_per_page + 1])
+        has_more = len(result_list) > self.list_per_page
+        result_list = result_list[: self.list_per_page]
+        if reverse:
+            result_list.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, values is not None
+
+        if has_next and result_list:
+            cursor = encode_cursor(
+                NEXT, self.get_keyset_values(result_list[-1], keyset)
+            )
+            self.next_page_url = self.get_query_string({CURSOR_VAR: cursor}, [PAGE_VAR])
+        if has_previous and result_list:
+            cursor = encode_cursor(
+                PREVIOUS, self.get_keyset_values(result_list[0], keyset)
+            )
+            self.previous_page_url = self.get_query_string(
+                {CURSOR_VAR: cursor}, [PAGE_VAR]
+            )
+
+        if self.list_editable:
+            # Model formsets need a queryset rather than a list.
+            result_list = self.queryset.filter(pk__in=[obj.pk for obj in result_list])
+
+        full_result_count = self.get_full_result_count(request)
+        self.keyset_pagination = True
+        self.result_count, self.result_count_exact = self.count_results(
+            request, self.queryset
+        )
+        self.show_full_result_count = self.model_admin.show_full_result_count
+        self.show_admin_actions = not self.show_full_result_count or bool(
+            full_result_count
+        )
+        self.full_result_count = full_result_count
+        self.result_list = result_list
+        self.can_show_all = False
+        self.multi_page = has_next or has_previous
+        self.paginator = None
@@ -0,0 +1,119 @@
+from django.core.cache import cache
+
+_REQUEST_ATTR = "_django_admin_tabs_permissions"
+
+
+def get_request_permissions(request):
+    """Return the dict memoizing the permission checks of `request`."""
+    permissions = getattr(request, _REQUEST_ATTR, None)
+    if permissions is None:
+        permissions = {}
+        setattr(request, _REQUEST_ATTR, permissions)
+    return permissions
+
+
+def get_visibility_cache_key(parent_model, parent_pk, user_pk, tab_slug):
+    opts = parent_model._meta
+    return (
+        f"django_admin_tabs:visible:{opts.label_lower}:{parent_pk}:{user_pk}:{tab_slug}"
+    )
+
+
+def has_visibility_predicate(admin_class):
+    """Whether the tab class overrides `is_tab_visible`."""
+    is_tab_visible = getattr(admin_class, "is_tab_visible", None)
+    return (
+        is_tab_visible is not None
+        and is_tab_visible.__func__ is not TabPermissionMixin.is_tab_visible.__func__
+    )
+
+
+def get_tab_visibility(request, parent_object, tab_slugs):
+    """Map the tab classes with a visibility predicate to its result.
+
+    `tab_slugs` maps the tab classes to check to their slugs.
+
+    Predicates are evaluated once per request, and once per (user, parent)
+    within the `tab_visibility_timeout` of the tab.
+    """
+    memo = get_request_permissions(request)
+    memo_keys = {
+        admin_class: (admin_class, "visible", parent_object.pk)
+        for admin_class in tab_slugs
+        if has_visibility_predicate(admin_class)
+    }
+    pending = [admin_class for admin_class, key in memo_keys.items() if key not in memo]
+    if pending:
+        cache_keys = {
+            admin_class: get_visibility_cache_key(
+                type(parent_object),
+                parent_object.pk,
+                request.user.pk,
+                tab_slugs[admin_class],
+            )
+            for admin_class in pending
+        }
+        cached = cache.get_many(cache_keys.values())
+        for admin_class in pending:
+            visible = cached.get(cache_keys[admin_class])
+            if visible is None:
+                visible = bool(admin_class.is_tab_visible(request, parent_object))
+                cache.set(
+                    cache_keys[admin_class],
+                    visible,
+                    admin_class.tab_visibility_timeout,
+                )
+            memo[memo_keys[admin_class]] = visible
+    return {admin_class: memo[key] for admin_class, key in memo_keys.items()}
+
+
+class TabPermissionMixin:
+    # Seconds the result of `is_tab_visible` is cached per user and parent.
+    tab_visibility_timeout = 60
+
+    @classmethod
+    def is_tab_visible(cls, request, parent_object):
+        """Hook to hide the tab from the menu and deny its views.
+
+        Called on the tab class, before the tab is instantiated.
+        """
+        return True
+
+    def memoize_permission(self, request, name, obj, check, *args):
+        """Run `check(*args)` once per tab class, parent and object in `request`.
+
+        Checks on unsaved objects aren't memoized.
+        """
+        if obj is not None and obj.pk is None:
+            return check(*args)
+        parent_pk = getattr(self.parent_object, "pk", None)
+        key = (type(self), name, parent_pk, None if obj is None else obj.pk)
+        permissions = get_request_permissions(request)
+        if key not in permissions:
+            permissions[key] = check(*args)
+        return permissions[key]
+
+    def has_module_permission(self, request):
+        return self.memoize_permission(
+            request, "module", None, super().has_module_permission, request
+        )
+
+    def has_add_permission(self, request):
+        return self.memoize_permission(
+            request, "add", None, super().has_add_permission, request
+        )
+
+    def has_view_permission(self, request, obj=None):
+        return self.memoize_permission(
+            request, "view", obj, super().has_view_permission, request, obj
+        )
+
+    def has_change_permission(self, request, obj=None):
+        return self.memoize_permission(
+            request, "change", obj, super().has_change_permission, request, obj
+        )
+
+    def has_delete_permission(self, request, obj=None):
+        return self.memoize_permission(
+            request, "delete", obj, super().has_delete_permission, request, obj
+        )
@@ -0,0 +1,116 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models.constants import LOOKUP_SEP
+
+
+def get_forward_relation_path(model, path):
+    """Return the longest prefix of `path` following forward FK/O2O fields."""
+    relations = []
+    opts = model._meta
+    for name in path.split(LOOKUP_SEP):
+        try:
+            field = opts.get_field(name)
+        except FieldDoesNotExist:
+            break
+        if not (field.many_to_one or field.one_to_one) or not field.concrete:
+            break
+        relations.append(name)
+        opts = field.related_model._meta
+    return LOOKUP_SEP.join(relations)
+
+
+def infer_list_select_related(model, list_display, fk_field=None):
+    """Infer the `select_related` paths needed to render a changelist page.
+
+    Follows the forward relations named in `list_display`, and the
+    intermediate relations of the `fk_field` path. The last hop of `fk_field`
+    is the parent object, which is attached to the rows instead of joined.
+    """
+    paths = [name for name in list_display if isinstance(name, str)]
+    if fk_field and LOOKUP_SEP in fk_field:
+        paths.append(fk_field.rsplit(LOOKUP_SEP, 1)[0])
+    select_related = []
+    for path in paths:
+        path = get_forward_relation_path(model, path)
+        if path and path not in select_related:
+            select_related.append(path)
+    # Drop paths already covered by a longer one.
+    return tuple(
+        path
+        for path in select_related
+        if not any(other.startswith(path + LOOKUP_SEP) for other in select_related)
+    )
+
+
+def attach_parent_object(objs, fk_field, parent_object):
+    """Cache `parent_object` on the last hop of the `fk_field` path of `objs`.
+
+    Rendering a row that references its parent, e.g. through `__str__`, then
+    doesn't query the parent again. Relations on the way that aren't loaded
+    yet, objects pointing to another parent and paths that aren't made of
+    forward relations are left untouched.
+    """
+    names = fk_field.split(LOOKUP_SEP)
+    for obj in objs:
+        target = obj
+        for i, name in enumerate(names):
+            try:
+                field = target._meta.get_field(name)
+            except FieldDoesNotExist:
+                return
+            if not (field.many_to_one or field.one_to_one) or not field.concrete:
+                return
+            if i == len(names) - 1:
+                if getattr(target, field.attname) == parent_object.pk:
+                    field.set_cached_value(target, parent_object)
+            elif field.is_cached(target):
+                # Only follow relations that are already loaded.
+                target = field.get_cached_value(target)
+                if target is None:
+                    break
+            else:
+                break
+
+
+def attach_generic_parent_object(objs, ct_field, ct_fk_field, parent_object):
+    """Cache `parent_object` on the generic foreign key of `objs`."""
+    objs = list(objs)
+    if not objs:
+        return
+    from django.contrib.contenttypes.fields import GenericForeignKey
+    from django.contrib.contenttypes.models import ContentType
+
+    generic_fk = next(
+        (
+            field
+            for field in objs[0]._meta.private_fields
+            if isinstance(field, GenericForeignKey)
+            and field.ct_field == ct_field
+            and field.fk_field == ct_fk_field
+        ),
+        None,
+    )
+    if generic_fk is None:
+        return
+    ct_attname = objs[0]._meta.get_field(ct_field).attname
+    parent_ct_id = ContentType.objects.get_for_model(parent_object).pk
+    for obj in objs:
+        if getattr(obj, ct_attname) == parent_ct_id and str(
+            getattr(obj, ct_fk_field)
+        ) == str(parent_object.pk):
+            generic_fk.set_cached_value(obj, parent_object)
+
+
+def get_parent_lookup(fk_field, field_name):
+    """Return the lookup from the objects of `field_name` to the parent.
+
+    `fk_field` is the path from the tab rows to the parent. When it starts with
+    `field_name`, the remainder scopes the related objects to the parent, and
+    an empty string means the field points to the parent itself. Returns None
+    when the field isn't on the path.
+    """
+    if not fk_field:
+        return None
+    name, _sep, remainder = fk_field.partition(LOOKUP_SEP)
+    if name != field_name:
+        return None
+    return remainder
@@ -0,0 +1,55 @@
+from typing import NamedTuple
+from urllib.parse import quote
+
+from django.contrib.admin.utils import quote as admin_quote
+from django.urls import reverse
+from django.utils.http import RFC3986_SUBDELIMS
+
+PK_PLACEHOLDER = "__pk__"
+
+
+class TabURLNames(NamedTuple):
+    """The namespaced URL names of the tab views of a parent model."""
+
+    step: str
+    tab_change: str
+    tab_add: str
+    tab_delete: str
+    tab_export: str
+    tab_import: str
+    tab_autocomplete: str
+    tab_fragment: str
+
+    @classmethod
+    def for_model(cls, admin_site, model):
+        opts = model._meta
+        prefix = f"{admin_site.name}:{opts.app_label}_{opts.model_name}"
+        return cls(*(f"{prefix}_{view}" for view in cls._fields))
+
+
+class URLTemplate:
+    """Build the URLs differing in their last argument from a single `reverse()`.
+
+    The URL is reversed once with a placeholder as the last argument, which is
+    then replaced by each value, quoted like `reverse()` would quote it.
+    """
+
+    def __init__(self, viewname, args, current_app=None):
+        url = reverse(viewname, args=(*args, PK_PLACEHOLDER), current_app=current_app)
+        self.prefix, _placeholder, self.suffix = url.rpartition(PK_PLACEHOLDER)
+
+    def quote(self, value):
+        return quote(str(value), safe=RFC3986_SUBDELIMS + "/~:@")
+
+    def __call__(self, value):
+        return f"{self.prefix}{self.quote(value)}{self.suffix}"
+
+
+class ObjectURLTemplate(URLTemplate):
+    """Build the URLs of many objects from a single `reverse()` call.
+
+    Primary keys are quoted like the admin quotes them in its URLs.
+    """
+
+    def quote(self, pk):
+        return super().quote(admin_quote(str(pk)))
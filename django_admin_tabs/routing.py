@@ -0,0 +1,67 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# The database the reads of the current tab request go to, None outside of
+# tab requests and for requests reading from the primary.
+_read_database = ContextVar("django_admin_tabs_read_database", default=None)
+
+# Timestamp until which the reads of a session go to the primary.
+PRIMARY_UNTIL_SESSION_KEY = "_django_admin_tabs_primary_until"
+
+SAFE_METHODS = ("GET", "HEAD")
+
+
+class TabReadRouter:
+    """Send the reads of read-only tab requests to `TabbedModelAdmin.read_database`.
+
+    Has no opinion outside of those requests, so it goes first::
+
+        DATABASE_ROUTERS = ["django_admin_tabs.routing.TabReadRouter", ...]
+    """
+
+    def db_for_read(self, model, **hints):
+        return _read_database.get()
+
+    def allow_relation(self, obj1, obj2, **hints):
+        database = _read_database.get()
+        if database is not None and database in (obj1._state.db, obj2._state.db):
+            return True
+        return None
+
+
+@contextmanager
+def read_from(database):
+    """Route the reads of the block to `database`, None leaves them alone."""
+    token = _read_database.set(database)
+    try:
+        yield database
+    finally:
+        _read_database.reset(token)
+
+
+def iter_from(database, iterator):
+    """Read from `database` while producing each item of a streamed response."""
+    iterator = iter(iterator)
+    while True:
+        with read_from(database):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
+
+def stick_to_primary(request, seconds):
+    """Send the reads of the session of `request` to the primary for `seconds`."""
+    session = getattr(request, "session", None)
+    if session is not None and seconds:
+        session[PRIMARY_UNTIL_SESSION_KEY] = time.time() + seconds
+
+
+def is_stuck_to_primary(request):
+    """Whether the session of `request` wrote in the last sticky window."""
+    session = getattr(request, "session", None)
+    return (
+        session is not None and session.get(PRIMARY_UNTIL_SESSION_KEY, 0) > time.time()
+    )
@@ -0,0 +1,191 @@
+import statistics
+import time
+
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Max, Min
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from .badges import get_path_pk
+from .signals import pre_batch_delete
+
+# How `AdminChangeListTab.fk_scoping` scopes the rows of a multi-hop `fk_field`.
+SCOPING_STRATEGIES = ("join", "subquery", "pk_list")
+
+# Instance attribute keeping the parent an intermediate row pointed to before
+# it was saved, per receiver.
+_PREVIOUS_PARENTS_ATTR = "_django_admin_tabs_scope_parents"
+
+
+def split_fk_field(model, fk_field):
+    """Split a multi-hop `fk_field` into its first relation and the rest.
+
+    Returns None for single field paths and paths not starting with a forward
+    relation, which are always scoped with a plain filter.
+    """
+    name, _sep, rest = fk_field.partition(LOOKUP_SEP)
+    if not rest:
+        return None
+    try:
+        field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+    if not (field.many_to_one or field.one_to_one) or not field.concrete:
+        return None
+    return field, rest
+
+
+def get_intermediate_queryset(field, rest, parent_object):
+    """Return the keys `field` points to among the intermediates of the parent.
+
+    E.g. the ids of the choices of a poll for `fk_field = "choice__poll"`.
+    """
+    return (
+        field.related_model._base_manager.using(parent_object._state.db)
+        .filter(**{rest: parent_object})
+        .values_list(field.remote_field.field_name, flat=True)
+    )
+
+
+def get_scope_cache_key(parent_model, parent_pk, tab_slug):
+    opts = parent_model._meta
+    return f"django_admin_tabs:scope:{opts.label_lower}:{parent_pk}:{tab_slug}"
+
+
+def connect_scope_invalidation(tab_class, parent_model, tab_slug):
+    """Drop the cached intermediate keys when a row along the path changes.
+
+    Every model between the tab model and the parent is watched, e.g. choices
+    and polls for `fk_field = "choice__poll__survey"`. A row moved to another
+    parent drops the keys of both, the previous parent is only looked up when
+    the relation to it is saved and was loaded.
+
+    `QuerySet.update()`, `bulk_create()` and `bulk_update()` send no model
+    signals, the keys they make stale expire after `fk_scoping_timeout`.
+    """
+    split = split_fk_field(tab_class.model, tab_class.fk_field or "")
+    if split is None:
+        return
+    field, rest = split
+    dispatch_uid = (
+        f"django_admin_tabs:scope:{parent_model._meta.label_lower}:"
+        f"{tab_class.__module__}.{tab_class.__qualname__}"
+    )
+
+    def delete_keys(parent_pks):
+        parent_pks.discard(None)
+        cache.delete_many(
+            [
+                get_scope_cache_key(parent_model, parent_pk, tab_slug)
+                for parent_pk in parent_pks
+            ]
+        )
+
+    def connect(model, rest, fk):
+        def remember(sender, instance, using, update_fields=None, **kwargs):
+            if (
+                instance._state.adding
+                or instance.pk is None
+                # Not saved, or deferred and not changed.
+                or (
+                    update_fields is not None
+                    and fk.name not in update_fields
+                    and fk.attname not in update_fields
+                )
+                or fk.attname not in instance.__dict__
+            ):
+                return
+            previous = (
+                sender._base_manager.using(using)
+                .filter(pk=instance.pk)
+                .values_list(rest, flat=True)
+                .first()
+            )
+            instance.__dict__.setdefault(_PREVIOUS_PARENTS_ATTR, {})[dispatch_uid] = (
+                previous
+            )
+
+        def invalidate(sender, instance, **kwargs):
+            previous = instance.__dict__.get(_PREVIOUS_PARENTS_ATTR, {})
+            delete_keys({get_path_pk(instance, rest), previous.pop(dispatch_uid, None)})
+
+        def invalidate_batch(sender, pks, using, **kwargs):
+            delete_keys(
+                set(
+                    sender._base_manager.using(using)
+                    .filter(pk__in=pks)
+                    .values_list(rest, flat=True)
+                )
+            )
+
+        pre_save.connect(remember, sender=model, weak=False, dispatch_uid=dispatch_uid)
+        for signal in (post_save, post_delete):
+            signal.connect(
+                invalidate, sender=model, weak=False, dispatch_uid=dispatch_uid
+            )
+        pre_batch_delete.connect(
+            invalidate_batch, sender=model, weak=False, dispatch_uid=dispatch_uid
+        )
+
+    model = field.related_model
+    while True:
+        name, _sep, tail = rest.partition(LOOKUP_SEP)
+        try:
+            fk = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return
+        if not (fk.many_to_one or fk.one_to_one) or not fk.concrete:
+            return
+        connect(model, rest, fk)
+        if not tail:
+            return
+        model, rest = fk.related_model, tail
+
+
+def measure_scoping(parent_admin, tab_class, parent_object, request, repeat=5):
+    """Time the row queries of a tab view with each scoping strategy.
+
+    Runs the count, the first page in the changelist ordering and, with a
+    `date_hierarchy`, its date range, like a changelist view does. Returns the
+    median milliseconds per strategy. The cached keys of "pk_list" are warm
+    after the first run, like between requests.
+    """
+    from .indexes import get_tab_queryset
+
+    timings = {}
+    for strategy in SCOPING_STRATEGIES:
+        strategy_class = type(
+            tab_class.__name__, (tab_class,), {"fk_scoping": strategy}
+        )
+        cache.delete(
+            get_scope_cache_key(
+                parent_admin.model,
+                parent_object.pk,
+                parent_admin.get_tab_menu_item(tab_class).slug,
+            )
+        )
+        samples = []
+        for run in range(repeat + 1):
+            start = time.perf_counter()
+            tab, queryset = get_tab_queryset(
+                parent_admin, strategy_class, parent_object, request
+            )
+            queryset.count()
+            list(queryset[: tab.list_per_page])
+            if tab.date_hierarchy:
+                queryset.aggregate(
+                    first=Min(tab.date_hierarchy), last=Max(tab.date_hierarchy)
+                )
+            if run:
+                samples.append((time.perf_counter() - start) * 1000)
+        timings[strategy] = statistics.median(samples)
+    return timings
+
+
+def recommend_scoping(timings, margin=0.1):
+    """Return the fastest strategy, or "join" unless one beats it by `margin`."""
+    fastest = min(timings, key=timings.get)
+    if timings[fastest] < timings["join"] * (1 - margin):
+        return fastest
+    return "join"
@@ -0,0 +1,367 @@
+from itertools import islice
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections, router, transaction
+from django.db.backends.signals import connection_created
+from django.db.backends.utils import names_digest, truncate_name
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_delete, post_save
+from django.utils.text import smart_split, unescape_string_literal
+
+from .signals import pre_batch_delete
+
+# Tables known to exist per (database alias, table).
+_existing_tables = set()
+# Tables missing per database alias, looked up again on the next connection
+# to the database, e.g. after the `tab_search_index` command built them.
+_missing_tables = {}
+
+
+def forget_missing_tables(sender, connection, **kwargs):
+    _missing_tables.pop(connection.alias, None)
+
+
+connection_created.connect(
+    forget_missing_tables, dispatch_uid="django_admin_tabs:search:missing_tables"
+)
+
+
+def get_search_terms(search_term):
+    """Split a search like the admin does, keeping quoted phrases together."""
+    terms = []
+    for bit in smart_split(search_term):
+        if bit.startswith(('"', "'")) and bit[0] == bit[-1]:
+            bit = unescape_string_literal(bit)
+        if bit.strip():
+            terms.append(bit)
+    return terms
+
+
+def get_search_field_names(model, search_fields):
+    """Return the concrete local fields of `search_fields`, or None.
+
+    Lookups through relations and custom lookups can't be indexed.
+    """
+    names = []
+    for search_field in search_fields:
+        name = search_field.lstrip("^=@")
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        if not field.concrete or field.is_relation:
+            return None
+        names.append(field.attname)
+    return names or None
+
+
+class SearchBackend:
+    """Stores the search index of a model in a side table of one database vendor.
+
+    The index maps the primary keys of the rows to the text of their search
+    fields. `match` returns the SQL selecting the keys of the matching rows.
+    """
+
+    vendor = None
+
+    def supports(self, index, connection):
+        return connection.vendor == self.vendor
+
+    def create(self, index, connection, table):
+        raise NotImplementedError
+
+    def drop(self, index, connection, table):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {connection.ops.quote_name(table)}")
+
+    def write(self, index, connection, table, rows):
+        """Insert or replace `(pk, values)` rows."""
+        raise NotImplementedError
+
+    def delete(self, index, connection, table, pks):
+        raise NotImplementedError
+
+    def match(self, index, connection, table, terms):
+        """Return the `(sql, params)` selecting the keys matching every term."""
+        raise NotImplementedError
+
+
+class SQLiteFTS5Backend(SearchBackend):
+    """An FTS5 table keyed by the rowid, matching the words starting with each term.
+
+    Only models with an integer primary key are indexed.
+    """
+
+    vendor = "sqlite"
+    tokenize = "unicode61 remove_diacritics 2"
+    pk_types = ("AutoField", "BigAutoField", "SmallAutoField", "IntegerField")
+
+    def supports(self, index, connection):
+        pk_type = index.model._meta.pk.get_internal_type()
+        return super().supports(index, connection) and pk_type in self.pk_types
+
+    def create(self, index, connection, table):
+        qn = connection.ops.quote_name
+        columns = ", ".join(qn(name) for name in index.fields)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE {qn(table)} USING fts5("
+                f"{columns}, tokenize = '{self.tokenize}')"
+            )
+
+    def write(self, index, connection, table, rows):
+        qn = connection.ops.quote_name
+        columns = ", ".join(qn(name) for name in index.fields)
+        placeholders = ", ".join(["%s"] * (len(index.fields) + 1))
+        self.delete(index, connection, table, [pk for pk, _values in rows])
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {qn(table)} (rowid, {columns}) VALUES ({placeholders})",
+                [(pk, *values) for pk, values in rows],
+            )
+
+    def delete(self, index, connection, table, pks):
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"DELETE FROM {connection.ops.quote_name(table)} WHERE rowid = %s",
+                [(pk,) for pk in pks],
+            )
+
+    def match(self, index, connection, table, terms):
+        qn = connection.ops.quote_name
+        # Quoted strings ending with * match the tokens starting with them.
+        query = " ".join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+        return f"SELECT rowid FROM {qn(table)} WHERE {qn(table)} MATCH %s", [query]
+
+
+class PostgresSearchBackend(SearchBackend):
+    """A table of `tsvector` documents with a GIN index, matching word prefixes.
+
+    With the pg_trgm extension installed the text is also indexed with
+    trigrams and matched with `ILIKE`, like the admin's `icontains` search.
+    """
+
+    vendor = "postgresql"
+    config = "simple"
+
+    def __init__(self):
+        self.trigrams = {}
+
+    def has_trigrams(self, connection):
+        """Whether pg_trgm is installed, looked up once per database."""
+        if connection.alias not in self.trigrams:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+                self.trigrams[connection.alias] = cursor.fetchone() is not None
+        return self.trigrams[connection.alias]
+
+    def create(self, index, connection, table):
+        qn = connection.ops.quote_name
+        pk_type = index.model._meta.pk.rel_db_type(connection)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TABLE {qn(table)} (pk {pk_type} PRIMARY KEY, "
+                f"document tsvector NOT NULL, content text NOT NULL)"
+            )
+            cursor.execute(
+                f"CREATE INDEX {qn(truncate_name(table + '_document', 63))} "
+                f"ON {qn(table)} USING gin (document)"
+            )
+            if self.has_trigrams(connection):
+                cursor.execute(
+                    f"CREATE INDEX {qn(truncate_name(table + '_content', 63))} "
+                    f"ON {qn(table)} USING gin (content gin_trgm_ops)"
+                )
+
+    def write(self, index, connection, table, rows):
+        texts = [(pk, "\n".join(values)) for pk, values in rows]
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {connection.ops.quote_name(table)} "
+                "(pk, document, content) "
+                "VALUES (%s, to_tsvector(%s::regconfig, %s), %s) "
+                "ON CONFLICT (pk) DO UPDATE SET "
+                "document = EXCLUDED.document, content = EXCLUDED.content",
+                [(pk, self.config, text, text) for pk, text in texts],
+            )
+
+    def delete(self, index, connection, table, pks):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {connection.ops.quote_name(table)} WHERE pk = ANY(%s)",
+                [list(pks)],
+            )
+
+    def match(self, index, connection, table, terms):
+        qn = connection.ops.quote_name
+        if self.has_trigrams(connection):
+            patterns = [
+                "%{}%".format(
+                    term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                )
+                for term in terms
+            ]
+            conditions = " AND ".join(["content ILIKE %s"] * len(patterns))
+            return f"SELECT pk FROM {qn(table)} WHERE {conditions}", patterns
+        query = " & ".join(
+            "'{}':*".format(term.replace("\\", "\\\\").replace("'", "''"))
+            for term in terms
+        )
+        sql = (
+            f"SELECT pk FROM {qn(table)} "
+            f"WHERE document @@ to_tsquery(%s::regconfig, %s)"
+        )
+        return sql, [self.config, query]
+
+
+SEARCH_BACKENDS = (SQLiteFTS5Backend(), PostgresSearchBackend())
+
+
+class SearchIndex:
+    """The index of the `fields` of `model`, in the first supporting backend."""
+
+    def __init__(self, model, fields, backends=SEARCH_BACKENDS):
+        self.model = model
+        self.fields = list(fields)
+        self.backends = backends
+
+    def get_table(self, connection):
+        digest = names_digest(*self.fields, length=8)
+        name = f"{self.model._meta.db_table}_search_{digest}"
+        return truncate_name(name, connection.ops.max_name_length())
+
+    def get_backend(self, connection):
+        return next(
+            (
+                backend
+                for backend in self.backends
+                if backend.supports(self, connection)
+            ),
+            None,
+        )
+
+    def exists(self, using):
+        """Whether the index table of the database was built."""
+        connection = connections[using]
+        if self.get_backend(connection) is None:
+            return False
+        table = self.get_table(connection)
+        if (using, table) not in _existing_tables:
+            if table in _missing_tables.get(using, ()):
+                return False
+            with connection.cursor() as cursor:
+                if table not in connection.introspection.table_names(cursor):
+                    _missing_tables.setdefault(using, set()).add(table)
+                    return False
+            _existing_tables.add((using, table))
+        return True
+
+    def get_rows(self, objs):
+        return [
+            (
+                obj.pk,
+                [
+                    "" if value is None else str(value)
+                    for value in (getattr(obj, name) for name in self.fields)
+                ],
+            )
+            for obj in objs
+            if obj.pk is not None
+        ]
+
+    def rebuild(self, using=None, batch_size=1000):
+        """Drop, create and fill the index table in one transaction.
+
+        Returns the number of indexed rows, or None when no backend supports
+        the database.
+        """
+        using = using or router.db_for_write(self.model)
+        connection = connections[using]
+        backend = self.get_backend(connection)
+        if backend is None:
+            return None
+        table = self.get_table(connection)
+        queryset = (
+            self.model._base_manager.using(using)
+            .order_by("pk")
+            .only("pk", *self.fields)
+        )
+        indexed = 0
+        with transaction.atomic(using=using):
+            backend.drop(self, connection, table)
+            backend.create(self, connection, table)
+            batch = list(queryset[:batch_size])
+            while batch:
+                backend.write(self, connection, table, self.get_rows(batch))
+                indexed += len(batch)
+                batch = list(queryset.filter(pk__gt=batch[-1].pk)[:batch_size])
+        _existing_tables.add((using, table))
+        _missing_tables.get(using, set()).discard(table)
+        return indexed
+
+    def update(self, objs, using, batch_size=1000):
+        """Index saved `objs` `batch_size` at a time, once the index was built."""
+        if not self.exists(using):
+            return
+        connection = connections[using]
+        backend = self.get_backend(connection)
+        table = self.get_table(connection)
+        objs = iter(objs)
+        for batch in iter(lambda: list(islice(objs, batch_size)), []):
+            rows = self.get_rows(batch)
+            if rows:
+                backend.write(self, connection, table, rows)
+
+    def delete(self, pks, using):
+        if pks and self.exists(using):
+            connection = connections[using]
+            self.get_backend(connection).delete(
+                self, connection, self.get_table(connection), pks
+            )
+
+    def search(self, queryset, search_term):
+        """Filter `queryset` on the rows matching every term of the search.
+
+        Returns None when the index of the database wasn't built.
+        """
+        terms = get_search_terms(search_term)
+        if not terms:
+            return queryset
+        if not self.exists(queryset.db):
+            return None
+        connection = connections[queryset.db]
+        sql, params = self.get_backend(connection).match(
+            self, connection, self.get_table(connection), terms
+        )
+        return queryset.filter(pk__in=RawSQL(sql, params))
+
+
+def connect_search_index(tab_class):
+    """Keep the search index of a tab in sync with saves and deletes of its rows."""
+    fields = get_search_field_names(tab_class.model, tab_class.search_fields)
+    if fields is None:
+        return
+    index = SearchIndex(tab_class.model, fields, tab_class.search_backends)
+
+    def update(sender, instance, using, **kwargs):
+        index.update([instance], using)
+
+    def delete(sender, instance, using, **kwargs):
+        index.delete([instance.pk], using)
+
+    def delete_batch(sender, pks, using, **kwargs):
+        index.delete(pks, using)
+
+    dispatch_uid = (
+        f"django_admin_tabs:search:{tab_class.model._meta.label_lower}:"
+        f"{tab_class.__module__}.{tab_class.__qualname__}"
+    )
+    post_save.connect(
+        update, sender=tab_class.model, weak=False, dispatch_uid=dispatch_uid
+    )
+    post_delete.connect(
+        delete, sender=tab_class.model, weak=False, dispatch_uid=dispatch_uid
+    )
+    pre_batch_delete.connect(
+        delete_batch, sender=tab_class.model, weak=False, dispatch_uid=dispatch_uid
+    )
@@ -0,0 +1,10 @@
+from django.dispatch import Signal
+
+# Sent after an instrumented tab view, see `TabbedModelAdmin.server_timing`.
+# Arguments: request, parent_model, parent_object, tab_slug, phases, where
+# phases maps phase names to `PhaseTiming` tuples.
+tab_view_timed = Signal()
+
+# Sent by `BatchedDelete` before deleting each batch of rows, which sends no
+# delete signals. Arguments: sender (the model), pks, using.
+pre_batch_delete = Signal()
@@ -0,0 +1,74 @@
+/*
+ * Switch tabs by swapping the page content with the tab fragment, instead of
+ * loading the whole admin page. Falls back to a full page load on any error.
+ *
+ * The scripts of the fragment run again after each swap, and a
+ * "django-admin-tabs:load" event is dispatched on the document with the new
+ * content element as `detail`.
+ */
+'use strict';
+// The script is part of the tab menu, which is swapped in with every tab.
+if (!window.djangoAdminTabs) {
+    window.djangoAdminTabs = true;
+
+    function runScript(inert) {
+        return new Promise((resolve) => {
+            const script = document.createElement('script');
+            for (const attribute of inert.attributes) {
+                script.setAttribute(attribute.name, attribute.value);
+            }
+            script.async = false;
+            if (inert.src) {
+                script.addEventListener('load', resolve);
+                script.addEventListener('error', resolve);
+            } else {
+                script.textContent = inert.textContent;
+            }
+            inert.replaceWith(script);
+            if (!inert.src) {
+                resolve();
+            }
+        });
+    }
+
+    async function showTab(link) {
+        const response = await fetch(link.dataset.fragmentUrl, {
+            credentials: 'same-origin',
+            headers: {'X-Requested-With': 'XMLHttpRequest'},
+        });
+        if (!response.ok || !response.headers.has('X-Django-Admin-Tabs-Fragment')) {
+            throw new Error(`Unexpected tab fragment response ${response.status}`);
+        }
+        const fragment = new DOMParser().parseFromString(await response.text(), 'text/html');
+        const content = document.adoptNode(fragment.getElementById('content'));
+        document.getElementById('content').replaceWith(content);
+        document.title = fragment.title;
+        for (const script of content.querySelectorAll('script')) {
+            await runScript(script);
+        }
+        document.dispatchEvent(new CustomEvent('django-admin-tabs:load', {detail: content}));
+    }
+
+    document.addEventListener('click', (event) => {
+        const link = event.target.closest('a[data-fragment-url]');
+        if (
+            !link || event.defaultPrevented || event.button !== 0 ||
+            event.metaKey || event.ctrlKey || event.shiftKey || event.altKey
+        ) {
+            return;
+        }
+        event.preventDefault();
+        showTab(link).then(
+            () => history.pushState({djangoAdminTabs: true}, '', link.href),
+            () => window.location.assign(link.href)
+        );
+    });
+
+    // Pages shown from the history were swapped in, load them in full.
+    history.replaceState({djangoAdminTabs: true}, '');
+    window.addEventListener('popstate', (event) => {
+        if (event.state && event.state.djangoAdminTabs) {
+            window.location.reload();
+        }
+    });
+}
@@ -1,11 +1,110 @@
+import datetime
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from io import StringIO
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django import forms
+from django.contrib import admin
+from django.contrib.admin.utils import quote as admin_quote
 from django.contrib.auth.models import User
-from django.test import TestCase
-from django.urls import reverse
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, connections, models
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext, isolate_apps
+from django.urls import path, reverse
+from django.utils.http import http_date
 
+from django_admin_tabs import AdminChangeListTab, AdminTab, TabbedModelAdmin
+from django_admin_tabs.badges import count_querysets
+from django_admin_tabs.caching import connect_render_invalidation
+from django_admin_tabs.counting import CappedCount, EstimatedCount
+from django_admin_tabs.deletion import BatchedDelete
+from django_admin_tabs.indexes import check_tab_indexes, iter_tab_query_plans
+from django_admin_tabs.reversing import ObjectURLTemplate
+from django_admin_tabs.scoping import connect_scope_invalidation, get_scope_cache_key
+from django_admin_tabs.search import SearchIndex
+from django_admin_tabs.signals import tab_view_timed
+from example.polls.admin import (
+    AnswerAdmin,
+    AnswerBulkForm,
+    ChoiceAdmin,
+    PollAdmin,
+    PollAdminStep,
+)
 from example.polls.models import Choice, Poll, Answer
 
 
-class DjangoAdminTabsTestCase(TestCase):
+class AsyncPollAdmin(PollAdmin):
+    async_views = True
+
+
+class ChoiceSearchTab(AdminChangeListTab, admin.ModelAdmin):
+    admin_tab_name = "Choices"
+    model = Choice
+    fk_field = "poll"
+    search_fields = ("text",)
+    full_text_search = True
+
+
+async_site = admin.AdminSite(name="async_admin")
+async_site.register(Poll, AsyncPollAdmin)
+async_site.register(Choice, ChoiceAdmin)
+
+urlpatterns = [
+    path("admin/", admin.site.urls),
+    path("async-admin/", async_site.urls),
+]
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def get_startup_receivers():
+    """Return the dispatch uids of the model receivers connected by `django.setup()`.
+
+    Runs in a new process, which doesn't load the URLconf.
+    """
+    script = (
+        "import json, django; django.setup(); "
+        "from django.db.models import signals; "
+        "print(json.dumps(sorted({key[0] for signal in "
+        "(signals.pre_save, signals.post_save, signals.post_delete) "
+        "for key, *_ in signal.receivers if isinstance(key[0], str)})))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        check=True,
+        cwd=ROOT_DIR,
+        env={**os.environ, "DJANGO_SETTINGS_MODULE": "example.settings"},
+        text=True,
+    )
+    return set(json.loads(result.stdout))
+
+
+def get_receiver_uids(signal, sender):
+    """Return the dispatch uids of the receivers of `signal` for `sender`."""
+    return {
+        key[0]
+        for key, *_ in signal.receivers
+        if isinstance(key[0], str) and key[1] == id(sender)
+    }
+
+
+class PollTestCase(TestCase):
     def setUp(self):
         super().setUp()
         self.user = User.objects.create_user(
@@ -24,7 +123,10 @@ class DjangoAdminTabsTestCase(TestCase):
             choice=self.choice,
         )
         self.client.login(username="admin", password="admin")
+        cache.clear()
 
+
+class DjangoAdminTabsTestCase(PollTestCase):
     def test_admin_view_redirect(self):
         url = reverse("admin:polls_poll_change", args=(self.poll.id,))
         response = self.client.get(url)
@@ -81,3 +183,1194 @@ class DjangoAdminTabsTestCase(TestCase):
             )
         )
         self.assertEqual(response.status_code, 404)
+
+    def test_admin_view_changelist_delete(self):
+        url = reverse(
+            "admin:polls_poll_tab_delete",
+            args=(self.poll.id, "answers", self.answer.id),
+        )
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_parent_object_fetched_once(self):
+        views = [
+            ("admin:polls_poll_step", (self.poll.id, "poll"), 7),
+            ("admin:polls_poll_step", (self.poll.id, "answers"), 11),
+            (
+                "admin:polls_poll_tab_change",
+                (self.poll.id, "answers", self.answer.id),
+                9,
+            ),
+            ("admin:polls_poll_tab_add", (self.poll.id, "answers"), 5),
+            (
+                "admin:polls_poll_tab_delete",
+                (self.poll.id, "answers", self.answer.id),
+                8,
+            ),
+        ]
+        for url_name, args, num_queries in views:
+            url = reverse(url_name, args=args)
+            # Warm up the content type cache so only per-request queries count.
+            self.client.get(url)
+            with self.subTest(url_name=url_name, args=args):
+                with self.assertNumQueries(num_queries):
+                    response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+
+    def test_only_selected_tab_instantiated(self):
+        url = reverse("admin:polls_poll_step", args=(self.poll.id, "answers"))
+        with mock.patch.object(
+            PollAdminStep, "__init__", side_effect=AssertionError
+        ) as init:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        init.assert_not_called()
+        self.assertContains(
+            response, reverse("admin:polls_poll_step", args=(self.poll.id, "poll"))
+        )
+
+    def test_tab_name_instance_override(self):
+        class RenamedStep(PollAdminStep):
+            def get_tab_name(self):
+                return f"About the {self.opts.verbose_name}"
+
+            def get_tab_slug(self):
+                return "about"
+
+        poll_admin = PollAdmin(Poll, admin.site)
+        poll_admin.admin_tabs = [RenamedStep, AnswerAdmin]
+        item = poll_admin.get_tab_menu_item(RenamedStep)
+        self.assertEqual((item.name, item.slug), ("About the poll", "about"))
+        self.assertIs(poll_admin.get_tab_registry()["about"], RenamedStep)
+        self.assertNotIn("poll", poll_admin.get_tab_registry())
+        request = RequestFactory().get("/")
+        request.user = self.user
+        tab = poll_admin.get_admin_tab(request, self.poll, "about")
+        self.assertIsInstance(tab, RenamedStep)
+        self.assertEqual(tab.get_tab_name(), "About the poll")
+
+    def test_tab_slug_collision_check(self):
+        class OtherPollStep(AdminTab, admin.ModelAdmin):
+            admin_tab_name = "Poll"
+
+        class CollidingPollAdmin(TabbedModelAdmin, admin.ModelAdmin):
+            admin_tabs = [PollAdminStep, OtherPollStep]
+
+        errors = CollidingPollAdmin(Poll, admin.AdminSite()).check()
+        self.assertEqual([error.id for error in errors], ["django_admin_tabs.E001"])
+
+    def test_tab_count_badge(self):
+        url = reverse("admin:polls_poll_step", args=(self.poll.id, "poll"))
+        response = self.client.get(url)
+        self.assertContains(response, "Answers (1)")
+
+        Answer.objects.create(choice=self.choice)
+        response = self.client.get(url)
+        self.assertContains(response, "Answers (2)")
+
+        self.answer.delete()
+        response = self.client.get(url)
+        self.assertContains(response, "Answers (1)")
+
+    def test_tab_receivers_connected_on_startup(self):
+        receivers = get_startup_receivers()
+        self.assertIn(
+            "django_admin_tabs:count:polls.poll:example.polls.admin.AnswerAdmin",
+            receivers,
+        )
+
+    def test_tab_receivers_connected_on_registration(self):
+        class LateAnswers(AnswerAdmin):
+            pass
+
+        class LatePollAdmin(PollAdmin):
+            admin_tabs = [PollAdminStep, LateAnswers]
+
+        uid = (
+            "django_admin_tabs:count:polls.poll:"
+            f"{LateAnswers.__module__}.{LateAnswers.__qualname__}"
+        )
+        self.assertNotIn(uid, get_receiver_uids(post_save, Answer))
+        admin.AdminSite(name="late").register(Poll, LatePollAdmin)
+        self.assertIn(uid, get_receiver_uids(post_save, Answer))
+        post_save.disconnect(sender=Answer, dispatch_uid=uid)
+        post_delete.disconnect(sender=Answer, dispatch_uid=uid)
+
+    def test_tab_count_badge_cached(self):
+        url = reverse("admin:polls_poll_step", args=(self.poll.id, "poll"))
+        self.client.get(url)
+        Answer.objects.bulk_create([Answer(choice=self.choice)])
+        response = self.client.get(url)
+        self.assertContains(response, "Answers (1)")
+
+    def test_count_querysets_batched(self):
+        other_poll = Poll.objects.create(question="Other?")
+        Choice.objects.create(poll=other_poll, text="Other")
+        with self.assertNumQueries(1):
+            counts = count_querysets(
+                self.poll,
+                {
+                    "choices": Choice.objects.filter(poll=self.poll),
+                    "answers": Answer.objects.filter(choice__poll=self.poll),
+                    "none": Answer.objects.filter(choice__poll=other_poll),
+                },
+            )
+        self.assertEqual(counts, {"choices": 1, "answers": 1, "none": 0})
+
+    @mock.patch.object(AnswerAdmin, "list_per_page", 2)
+    @mock.patch.object(AnswerAdmin, "pagination", "keyset")
+    def test_keyset_pagination(self):
+        other_choice = Choice.objects.create(
+            poll=Poll.objects.create(question="Other?"), text="Other"
+        )
+        Answer.objects.create(choice=other_choice)
+        answers = [self.answer] + [
+            Answer.objects.create(choice=self.choice) for _ in range(4)
+        ]
+        # Ties on the sorted column are broken by the primary key.
+        Answer.objects.filter(pk__in=[a.pk for a in answers[:3]]).update(
+            timestamp=answers[0].timestamp
+        )
+        url = reverse("admin:polls_poll_step", args=(self.poll.id, "answers"))
+        for answer in answers:
+            answer.refresh_from_db()
+        year = answers[0].timestamp.year
+        for query, expected in [
+            ("", sorted(answers, key=lambda a: -a.pk)),
+            (
+                f"?o=1&timestamp__year={year}",
+                sorted(answers, key=lambda a: (a.timestamp, -a.pk)),
+            ),
+        ]:
+            with self.subTest(query=query):
+                pages = []
+                cl = self.client.get(url + query).context["cl"]
+                self.assertIsNone(cl.previous_page_url)
+                while True:
+                    self.assertEqual(cl.result_count, 5)
+                    pages.append([a.pk for a in cl.result_list])
+                    if not cl.next_page_url:
+                        break
+                    cl = self.client.get(url + cl.next_page_url).context["cl"]
+                self.assertEqual(
+                    pages,
+                    [[a.pk for a in expected[i : i + 2]] for i in range(0, 5, 2)],
+                )
+                cl = self.client.get(url + cl.previous_page_url).context["cl"]
+                self.assertEqual([a.pk for a in cl.result_list], pages[1])
+
+    def test_count_strategies(self):
+        Answer.objects.bulk_create([Answer(choice=self.choice) for _ in range(4)])
+        url = reverse("admin:polls_poll_step", args=(self.poll.id, "answers"))
+        for strategy, display, exact in [
+            (CappedCount(3), "3+", False),
+            (CappedCount(10), "5", True),
+            # SQLite has no row estimates, the exact count is used instead.
+            (EstimatedCount(threshold=0), "5", True),
+        ]:
+            with self.subTest(strategy=strategy):
+                with mock.patch.object(AnswerAdmin, "count_strategy", strategy):
+                    cl = self.client.get(url).context["cl"]
+                self.assertEqual(cl.result_count_display, display)
+                self.assertEqual(cl.result_count_exact, exact)
+                self.assertEqual(len(cl.result_list), 5)
+
+    @mock.patch.object(AnswerAdmin, "list_per_page", 2)
+    @mock.patch.object(AnswerAdmin, "count_strategy", CappedCount(2))
+    def test_capped_count_pages_past_cap(self):
+        Answer.objects.bulk_create([Answer(choice=self.choice) for _ in range(4)])
+        url = reverse("admin:polls_poll_step", args=(self.poll.id, "answers"))
+        cl = self.client.get(url).context["cl"]
+        self.assertEqual(cl.result_count_display, "2+")
+        self.assertEqual(list(cl.page_range), [1, 2])
+        # The last page, past the capped count.
+        response = self.client.get(url, {"p": 3})
+        self.assertEqual(response.status_code, 200)
+        cl = response.context["cl"]
+        self.assertEqual(len(cl.result_list), 1)
+        self.assertEqual(list(cl.page_range), [1, 2, 3])
+        self.assertRedirects(
+            self.client.get(url, {"p": 4}), url + "?e=1", fetch_redirect_response=False
+        )
+
+    def test_list_filter_scoped_to_parent(self):
+        other_choice = Choice.objects.create(
+            poll=Poll.objects.create(question="Other?"), text="Other"
+        )
+        Answer.objects.create(choice=other_choice)
+        second_choice = Choice.objects.create(poll=self.poll, text="Second")
+        Answer.objects.create(choice=second_choice)
+        url = reverse("admin:polls_poll_step", args=(self.poll.id, "answers"))
+
+        cl = self.client.get(url).context["cl"]
+        (spec,) = cl.filter_specs
+        self.assertEqual(
+            [pk for pk, _display in spec.lookup_choices],
+            [self.choice.pk, second_choice.pk],
+        )
+        self.assertFalse(spec.choices_truncated)
+
+        with mock.patch.object(AnswerAdmin, "list_filter_choices_limit", 1):
+            cl = self.client.get(url).context["cl"]
+        (spec,) = cl.filter_specs
+        self.assertEqual(len(spec.lookup_choices), 1)
+        self.assertTrue(spec.choices_truncated)
+
+        response = self.client.get(url + f"?choice__id__exact={second_choice.pk}")
+        self.assertEqual(len(response.context["cl"].result_list), 1)
+
+    @mock.patch.object(AnswerAdmin, "auto_select_related", True)
+    def test_auto_select_related(self):
+        url = reverse("admin:polls_poll_step", args=(self.poll.id, "answers"))
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as single_row:
+            self.client.get(url)
+
+        choices = Choice.objects.bulk_create(
+            [Choice(poll=self.poll, text=f"Choice {i}") for i in range(10)]
+        )
+        Answer.objects.bulk_create([Answer(choice=choices[i % 10]) for i in range(99)])
+        cache.clear()
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as full_page:
+            response = self.client.get(url)
+        self.assertEqual(len(response.context["cl"].result_list), 100)
+        self.assertEqual(len(full_page), len(single_row))
+        # Only the parent lookup reads the parent table.
+        self.assertEqual(
+            len([q for q in full_page if 'FROM "polls_poll"' in q["sql"]]), 1
+        )
+
+    def test_export(self):
+        other_choice = Choice.objects.create(
+            poll=Poll.objects.create(question="Other?"), text="Other"
+        )
+        Answer.objects.create(choice=other_choice)
+        second_choice = Choice.objects.create(poll=self.poll, text="Second")
+        second_answer = Answer.objects.create(choice=second_choice)
+
+        url = reverse(
+            "admin:polls_poll_tab_export", args=(self.poll.id, "answers", "csv")
+        )
+        response = self.client.get(url)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        rows = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(
+            rows,
+            [
+                "Timestamp,Choice",
+                f"{second_answer.timestamp.isoformat()},What's up? Second",
+                f"{self.answer.timestamp.isoformat()},What's up? The sky is!",
+            ],
+        )
+
+        url = reverse(
+            "admin:polls_poll_tab_export", args=(self.poll.id, "answers", "jsonl")
+        )
+        response = self.client.get(url + f"?choice__id__exact={self.choice.pk}")
+        self.assertEqual(
+            b"".join(response.streaming_content).decode(),
+            json.dumps(
+                {
+                    "timestamp": self.answer.timestamp.isoformat(),
+                    "choice": "What's up? The sky is!",
+                }
+            )
+            + "\n",
+        )
+
+    def test_export_incorrect_lookup(self):
+        url = reverse(
+            "admin:polls_poll_tab_export", args=(self.poll.id, "answers", "csv")
+        )
+        self.assertRedirects(
+            self.client.get(url, {"no_such_field": "1"}),
+            reverse("admin:polls_poll_step", args=(self.poll.id, "answers")) + "?e=1",
+        )
+
+    def test_export_format_not_enabled(self):
+        url = reverse(
+            "admin:polls_poll_tab_export", args=(self.poll.id, "answers", "xml")
+        )
+        self.assertEqual(self.client.get(url).status_code, 404)
+        url = reverse("admin:polls_poll_tab_export", args=(self.poll.id, "poll", "csv"))
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_bulk_form(self):
+        url = reverse("admin:polls_poll_step", args=(self.poll.id, "answers"))
+        self.client.get(url)
+        with mock.patch.object(AnswerBulkForm, "batch_size", 2):
+            with mock.patch.object(
+                AnswerAdmin, "update_search_index"
+            ) as update_search_index:
+                response = self.client.post(
+                    url,
+                    {"_submit_bulk": "1", "choice": self.choice.pk, "count": 5},
+                    follow=True,
+                )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Answer.objects.filter(choice=self.choice).count(), 6)
+        # Only the written rows are indexed, a batch at a time.
+        batches = [call.args[0] for call in update_search_index.call_args_list]
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        self.assertNotIn(self.answer, [obj for batch in batches for obj in batch])
+        (message,) = response.context["messages"]
+        self.assertTrue(
+            str(message).startswith("Bulk action performed. 5 created. 0 updated.")
+        )
+        self.assertContains(self.client.get(url), "Answers (6)")
+
+    def test_plain_bulk_form(self):
+        class PlainBulkForm(forms.Form):
+            count = forms.IntegerField()
+
+            def __init__(self, *args, parent_object=None, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.parent_object = parent_object
+
+            def save(self):
+                choice = self.parent_object.choice_set.get()
+                Answer.objects.bulk_create(
+                    [Answer(choice=choice)] * self.cleaned_data["count"]
+                )
+                return self.cleaned_data["count"], 0
+
+        url = reverse("admin:polls_poll_step", args=(self.poll.id, "answers"))
+        with mock.patch.object(AnswerAdmin, "change_list_bulk_form", PlainBulkForm):
+            self.assertEqual(self.client.get(url).status_code, 200)
+            response = self.client.post(url, {"_submit_bulk": "1", "count": 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Answer.objects.filter(choice=self.choice).count(), 3)
+
+    def test_bulk_form_update_without_update_fields(self):
+        answer = Answer.objects.get()
+        form = AnswerBulkForm(
+            {"choice": self.choice.pk, "count": 1}, parent_object=self.poll
+        )
+        self.assertTrue(form.is_valid())
+        with mock.patch.object(AnswerBulkForm, "get_objects", return_value=[answer]):
+            with self.assertRaisesMessage(ImproperlyConfigured, "update_fields"):
+                form.save()
+            with mock.patch.object(AnswerBulkForm, "update_fields", ("choice",)):
+                self.assertEqual(form.save(), (0, 1))
+
+    @mock.patch.object(PollAdmin, "server_timing", True)
+    def test_server_timing(self):
+        received = []
+
+        def receiver(**kwargs):
+            received.append(kwargs)
+
+        tab_view_timed.connect(receiver)
+        self.addCleanup(tab_view_timed.disconnect, receiver)
+        url = reverse("admin:polls_poll_step", args=(self.poll.id, "answers"))
+        response = self.client.get(url)
+
+        phases = [
+            metric.split(";")[0] for metric in response["Server-Timing"].split(", ")
+        ]
+        self.assertEqual(
+            phases,
+            ["parent", "tab", "menu", "filters", "queryset", "count", "results"]
+            + ["view", "render"],
+        )
+        (kwargs,) = received
+        self.assertEqual(kwargs["tab_slug"], "answers")
+        self.assertEqual(kwargs["parent_model"], Poll)
+        self.assertEqual(kwargs["phases"]["parent"].queries, 1)
+        self.assertEqual(kwargs["phases"]["count"].queries, 2)
+
+    def test_server_timing_disabled(self):
+        url = reverse("admin:polls_poll_step", args=(self.poll.id, "answers"))
+        self.assertNotIn("Server-Timing", self.client.get(url))
+
+    def test_conditional_tab_response(self):
+        url = reverse("admin:polls_poll_step", args=(self.poll.id, "poll"))
+        self.client.get(url)  # Sets the CSRF cookie.
+        version = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+        with mock.patch.object(PollAdminStep, "get_tab_version", return_value=version):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response["Last-Modified"], http_date(version.timestamp()))
+            self.assertIn("no-cache", response["Cache-Control"])
+            etag = response["ETag"]
+
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+            response = self.client.get(
+                url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+            )
+            self.assertEqual(response.status_code, 304)
+
+        with mock.patch.object(PollAdminStep, "get_tab_version", return_value="v2"):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response["ETag"], etag)
+
+    def test_conditional_tab_response_disabled(self):
+        url = reverse("admin:polls_poll_step", args=(self.poll.id, "poll"))
+        self.client.get(url)
+        response = self.client.get(url)
+        self.assertNotIn("ETag", response)
+        self.assertIn("no-store", response["Cache-Control"])
+
+    @mock.patch.object(PollAdminStep, "cache_rendered", True)
+    def test_cache_rendered(self):
+        connect_render_invalidation(PollAdminStep, Poll, "poll", nested=False)
+        url = reverse("admin:polls_poll_step", args=(self.poll.id, "poll"))
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as rendered:
+            response = self.client.get(url)
+        with CaptureQueriesContext(connection) as cached:
+            self.assertEqual(self.client.get(url).content, response.content)
+        self.assertLess(len(cached), len(rendered))
+
+        self.poll.question = "What's new?"
+        self.poll.save()
+        self.assertContains(self.client.get(url), "What&#x27;s new?")
+
+        Choice.objects.create(poll=self.poll, text="The moon is!")
+        self.assertContains(self.client.get(url), "The moon is!")
+
+    @mock.patch.object(PollAdminStep, "cache_rendered", True)
+    def test_cache_rendered_connected_with_tab_signals(self):
+        uid = "django_admin_tabs:render:polls.poll:example.polls.admin.PollAdminStep"
+        for model in (Poll, Choice):
+            post_save.disconnect(sender=model, dispatch_uid=uid)
+        PollAdmin(Poll, admin.AdminSite()).connect_tab_signals()
+        self.assertIn(uid, get_receiver_uids(post_save, Poll))
+        self.assertIn(uid, get_receiver_uids(post_save, Choice))
+
+    def test_tab_fragment(self):
+        for step in ("poll", "answers"):
+            url = reverse("admin:polls_poll_tab_fragment", args=(self.poll.id, step))
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response["X-Django-Admin-Tabs-Fragment"], "1")
+            self.assertContains(response, 'id="content"')
+            self.assertContains(response, "django-admin-tabs-nav")
+            self.assertNotContains(response, 'id="header"')
+            self.assertNotContains(response, "<body")
+        self.assertContains(response, "The sky is!")
+        self.assertEqual(self.client.post(url).status_code, 405)
+
+    def test_tab_fragment_links(self):
+        url = reverse("admin:polls_poll_step", args=(self.poll.id, "poll"))
+        self.assertNotContains(self.client.get(url), "data-fragment-url")
+        with mock.patch.object(PollAdmin, "tab_fragments", True):
+            response = self.client.get(url)
+        self.assertContains(
+            response,
+            'data-fragment-url="%s"'
+            % reverse("admin:polls_poll_tab_fragment", args=(self.poll.id, "answers")),
+        )
+        self.assertContains(response, "admin/js/django_admin_tabs.js")
+
+    @mock.patch.object(PollAdmin, "tab_fragments", True)
+    @mock.patch.object(AnswerAdmin, "admin_tab_name", "poll_answers")
+    def test_tab_fragment_links_underscore_slug(self):
+        poll_admin = admin.site._registry[Poll]
+        with mock.patch.dict(poll_admin.__dict__):
+            # Build the registry and menu with the patched name.
+            poll_admin.__dict__.pop("_tab_registry", None)
+            poll_admin.__dict__.pop("_tab_menu_items", None)
+            url = reverse("admin:polls_poll_step", args=(self.poll.id, "poll"))
+            fragment_url = reverse(
+                "admin:polls_poll_tab_fragment", args=(self.poll.id, "poll_answers")
+            )
+            self.assertContains(
+                self.client.get(url), f'data-fragment-url="{fragment_url}"'
+            )
+            self.assertEqual(self.client.get(fragment_url).status_code, 200)
+
+    @override_settings(ROOT_URLCONF="django_admin_tabs.tests")
+    async def test_async_views(self):
+        await sync_to_async(self.async_client.force_login)(self.user)
+        for step in ("poll", "answers"):
+            url = reverse("async_admin:polls_poll_step", args=(self.poll.id, step))
+            response = await self.async_client.get(url)
+            self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Answers (1)")
+        self.assertContains(response, "The sky is!")
+
+        url = reverse(
+            "async_admin:polls_poll_tab_change",
+            args=(self.poll.id, "answers", self.answer.id),
+        )
+        self.assertEqual((await self.async_client.get(url)).status_code, 200)
+        url = reverse("async_admin:polls_poll_tab_add", args=(self.poll.id, "answers"))
+        self.assertEqual((await self.async_client.get(url)).status_code, 200)
+        url = reverse("async_admin:polls_poll_step", args=(0, "poll"))
+        self.assertEqual((await self.async_client.get(url)).status_code, 404)
+
+        await sync_to_async(self.async_client.logout)()
+        url = reverse("async_admin:polls_poll_step", args=(self.poll.id, "poll"))
+        self.assertEqual((await self.async_client.get(url)).status_code, 302)
+
+    def test_paginated_inline(self):
+        Choice.objects.bulk_create(
+            [Choice(poll=self.poll, text=f"Choice {i}") for i in range(25)]
+        )
+        url = reverse("admin:polls_poll_step", args=(self.poll.id, "poll"))
+        response = self.client.get(url, {"_changelist_filters": "q=up"})
+        formset = response.context["inline_admin_formsets"][0].formset
+        self.assertEqual(len(formset.initial_forms), 20)
+        self.assertContains(
+            response, 'href="?_changelist_filters=q%3Dup&amp;choice_set-page=2"'
+        )
+
+        page_url = f"{url}?choice_set-page=2"
+        response = self.client.get(page_url)
+        formset = response.context["inline_admin_formsets"][0].formset
+        choices = [form.instance for form in formset.initial_forms]
+        self.assertEqual(len(choices), 6)
+        data = {
+            "question": self.poll.question,
+            "choice_set-TOTAL_FORMS": 6,
+            "choice_set-INITIAL_FORMS": 6,
+            "choice_set-MIN_NUM_FORMS": 0,
+            "choice_set-MAX_NUM_FORMS": 1000,
+            "_continue": "1",
+        }
+        for i, choice in enumerate(choices):
+            data[f"choice_set-{i}-id"] = choice.pk
+            data[f"choice_set-{i}-poll"] = self.poll.pk
+            data[f"choice_set-{i}-text"] = f"Changed {i}"
+        response = self.client.post(page_url, data)
+        self.assertRedirects(response, page_url, fetch_redirect_response=False)
+        self.assertEqual(
+            Choice.objects.filter(text__startswith="Changed").count(), len(choices)
+        )
+        self.assertEqual(Choice.objects.filter(poll=self.poll).count(), 26)
+
+    def test_scoped_autocomplete(self):
+        other_poll = Poll.objects.create(question="Other?")
+        Choice.objects.create(poll=other_poll, text="Not this one")
+        url = reverse("admin:polls_poll_tab_add", args=(self.poll.id, "answers"))
+        response = self.client.get(url)
+        autocomplete_url = reverse(
+            "admin:polls_poll_tab_autocomplete", args=(self.poll.id, "answers")
+        )
+        self.assertContains(response, f'data-ajax--url="{autocomplete_url}"')
+        self.assertNotContains(response, "Not this one")
+
+        response = self.client.get(autocomplete_url, {"field_name": "choice"})
+        self.assertEqual(
+            response.json(),
+            {
+                "results": [{"id": str(self.choice.pk), "text": str(self.choice)}],
+                "pagination": {"more": False},
+            },
+        )
+        moon = Choice.objects.create(poll=self.poll, text="The moon is!")
+        response = self.client.get(
+            autocomplete_url, {"field_name": "choice", "term": "moon"}
+        )
+        self.assertEqual(
+            [result["id"] for result in response.json()["results"]], [str(moon.pk)]
+        )
+        response = self.client.get(autocomplete_url, {"field_name": "timestamp"})
+        self.assertEqual(response.status_code, 403)
+        with mock.patch.object(ChoiceAdmin, "has_view_permission", return_value=False):
+            response = self.client.get(autocomplete_url, {"field_name": "choice"})
+        self.assertEqual(response.status_code, 403)
+
+        other_choice = Choice.objects.get(poll=other_poll)
+        response = self.client.post(url, {"choice": other_choice.pk})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Answer.objects.filter(choice=other_choice).exists())
+
+    def test_scoped_autocomplete_check(self):
+        site = admin.AdminSite()
+        errors = PollAdmin(Poll, site).check()
+        self.assertEqual([error.id for error in errors], ["django_admin_tabs.E004"])
+        site.register(Choice)
+        errors = PollAdmin(Poll, site).check()
+        self.assertEqual([error.id for error in errors], ["django_admin_tabs.E005"])
+        with mock.patch.object(AnswerAdmin, "raw_id_fields", ("choice",)):
+            self.assertEqual(PollAdmin(Poll, site).check(), [])
+        self.assertEqual(PollAdmin(Poll, admin.site).check(), [])
+
+    def test_batched_delete(self):
+        other_poll = Poll.objects.create(question="Other?")
+        other_answer = Answer.objects.create(
+            choice=Choice.objects.create(poll=other_poll, text="Stays")
+        )
+        Answer.objects.bulk_create(Answer(choice=self.choice) for _ in range(4))
+        url = reverse("admin:polls_poll_delete", args=(self.poll.id,))
+        with mock.patch.multiple(PollAdmin, batched_delete=True, delete_batch_size=2):
+            response = self.client.get(url)
+            self.assertEqual(
+                dict(response.context["model_count"]),
+                {"polls": 1, "choices": 1, "answers": 5},
+            )
+            self.assertEqual(
+                response.context["deleted_objects"], [f"Poll: {self.poll}"]
+            )
+            response = self.client.post(url, {"post": "yes"})
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(Poll.objects.filter(pk=self.poll.pk).exists())
+        self.assertEqual(list(Answer.objects.all()), [other_answer])
+
+    def test_batched_delete_inline_limit(self):
+        url = reverse("admin:polls_poll_delete", args=(self.poll.id,))
+        changelist_url = reverse("admin:polls_poll_changelist")
+        command = f"Run: manage.py batched_delete polls.Poll {self.poll.pk}"
+        with mock.patch.multiple(PollAdmin, batched_delete=True, delete_inline_limit=2):
+            response = self.client.post(url, {"post": "yes"}, follow=True)
+            self.assertEqual(
+                response.redirect_chain[0][0],
+                reverse("admin:polls_poll_change", args=(self.poll.id,)),
+            )
+            self.assertContains(response, command)
+            self.assertNotContains(response, "protected")
+            response = self.client.post(
+                changelist_url,
+                {"action": "delete_selected", "_selected_action": [self.poll.pk]},
+                follow=True,
+            )
+            self.assertEqual(response.redirect_chain, [(changelist_url, 302)])
+            self.assertContains(response, command)
+        self.assertTrue(Poll.objects.filter(pk=self.poll.pk).exists())
+
+    @mock.patch.object(AnswerAdmin, "fk_scoping", "pk_list")
+    def test_batched_delete_signal(self):
+        poll_admin = PollAdmin(Poll, admin.AdminSite())
+        poll_admin.admin_tabs = [*PollAdmin.admin_tabs, ChoiceSearchTab]
+        poll_admin.connect_tab_signals()
+        # Cache the keys of the poll.
+        tab = poll_admin.build_admin_tab(AnswerAdmin, self.poll)
+        list(tab.get_queryset(mock.Mock()))
+        key = get_scope_cache_key(Poll, self.poll.pk, tab.get_tab_slug())
+        self.assertEqual(cache.get(key), [self.choice.pk])
+        with mock.patch.object(SearchIndex, "delete") as delete:
+            BatchedDelete(Choice.objects.filter(pk=self.choice.pk)).run()
+        delete.assert_called_once_with([self.choice.pk], "default")
+        self.assertIsNone(cache.get(key))
+
+    def test_batched_delete_command(self):
+        Answer.objects.bulk_create(Answer(choice=self.choice) for _ in range(4))
+        out = StringIO()
+        call_command(
+            "batched_delete", "polls.Poll", str(self.poll.pk), dry_run=True, stdout=out
+        )
+        self.assertIn("polls.Answer: 5", out.getvalue())
+        self.assertTrue(Answer.objects.exists())
+
+        call_command(
+            "batched_delete",
+            "polls.Poll",
+            str(self.poll.pk),
+            batch_size=2,
+            verbosity=2,
+            stdout=out,
+        )
+        self.assertEqual(out.getvalue().count("  polls.Answer: "), 3)
+        self.assertIn("Deleted 7 objects.", out.getvalue())
+        self.assertFalse(Poll.objects.exists())
+
+    def test_csv_import(self):
+        other_choice = Choice.objects.create(
+            poll=Poll.objects.create(question="Other?"), text="Not this one"
+        )
+        changelist_url = reverse(
+            "admin:polls_poll_step", args=(self.poll.id, "answers")
+        )
+        url = reverse("admin:polls_poll_tab_import", args=(self.poll.id, "answers"))
+        self.assertContains(self.client.get(changelist_url), f'href="{url}"')
+        response = self.client.get(url)
+        self.assertContains(response, "<code>choice</code>")
+
+        rows = [self.choice.pk] * 4 + [other_choice.pk, "abc"]
+        upload = SimpleUploadedFile(
+            "answers.csv",
+            ("choice\n" + "".join(f"{pk}\n" for pk in rows)).encode(),
+            content_type="text/csv",
+        )
+        with mock.patch.object(AnswerAdmin, "import_chunk_size", 4):
+            response = self.client.post(url, {"file": upload})
+            with CaptureQueriesContext(connection) as queries:
+                report = b"".join(response.streaming_content).decode()
+        self.assertEqual(
+            report.splitlines(),
+            [
+                "Lines 2-5: 4 of 4 rows imported",
+                "Lines 6-7: 0 of 2 rows imported",
+                "  Line 6: choice: Select a valid choice. "
+                "That choice is not one of the available choices.",
+                "  Line 7: choice: Select a valid choice. "
+                "That choice is not one of the available choices.",
+                "Done: 4 of 6 rows imported.",
+            ],
+        )
+        self.assertEqual(Answer.objects.filter(choice=self.choice).count(), 5)
+        self.assertFalse(Answer.objects.filter(choice=other_choice).exists())
+        # A choice lookup per chunk and a savepointed insert, no queries per row.
+        self.assertEqual(len(queries), 5)
+        # The badge cached by the changelist view above was dropped.
+        self.assertContains(self.client.get(changelist_url), "Answers (5)")
+
+    @mock.patch.object(AnswerAdmin, "scoped_autocomplete", False)
+    def test_csv_import_scoped_to_parent(self):
+        other_choice = Choice.objects.create(
+            poll=Poll.objects.create(question="Other?"), text="Not this one"
+        )
+        url = reverse("admin:polls_poll_tab_import", args=(self.poll.id, "answers"))
+        upload = SimpleUploadedFile(
+            "answers.csv",
+            f"choice\n{self.choice.pk}\n{other_choice.pk}\n".encode(),
+            content_type="text/csv",
+        )
+        response = self.client.post(url, {"file": upload})
+        report = b"".join(response.streaming_content).decode()
+        self.assertIn("Line 3: choice: Select a valid choice.", report)
+        self.assertIn("Done: 1 of 2 rows imported.", report)
+        self.assertFalse(Answer.objects.filter(choice=other_choice).exists())
+
+    def test_object_urls_reversed_once(self):
+        answers = Answer.objects.bulk_create(
+            Answer(choice=self.choice) for _ in range(5)
+        )
+        url = reverse("admin:polls_poll_step", args=(self.poll.id, "answers"))
+        with mock.patch(
+            "django_admin_tabs.reversing.reverse", wraps=reverse
+        ) as reverse_mock:
+            response = self.client.get(url)
+        self.assertEqual(reverse_mock.call_count, 1)
+        for answer in answers:
+            self.assertContains(
+                response,
+                reverse(
+                    "admin:polls_poll_tab_change",
+                    args=(self.poll.id, "answers", answer.pk),
+                ),
+            )
+
+        template = ObjectURLTemplate("admin:polls_poll_tab_change", (1, "answers"))
+        self.assertEqual(
+            template("a/b c"),
+            reverse(
+                "admin:polls_poll_tab_change", args=(1, "answers", admin_quote("a/b c"))
+            ),
+        )
+
+    @override_settings(DJANGO_ADMIN_TABS_INDEX_CHECK=True)
+    def test_tab_indexes(self):
+        self.assertEqual(check_tab_indexes(databases=["default"]), [])
+
+        class ChoiceTextAnswers(AnswerAdmin):
+            admin_tab_name = "By text"
+            ordering = ("-timestamp",)
+
+            def get_queryset(self, request):
+                # Not scoped to the parent, nothing to seek on.
+                return Answer.objects.filter(choice__text="Yes")
+
+        class ScanningPollAdmin(PollAdmin):
+            admin_tabs = [PollAdminStep, ChoiceTextAnswers]
+
+        site = admin.AdminSite(name="scanning")
+        site.register(Poll, ScanningPollAdmin)
+        plans = list(iter_tab_query_plans(sites=[site], using="default"))
+        self.assertEqual(
+            [(plan.query, bool(plan.scans)) for plan in plans],
+            [("page", True), ("date_hierarchy", True)],
+        )
+        self.assertEqual(
+            plans[0].suggestions,
+            ["polls.Answer: models.Index(fields=['choice', '-timestamp'])"],
+        )
+
+        out = StringIO()
+        with mock.patch("django_admin_tabs.indexes.all_sites", [site]):
+            call_command("tab_indexes", stdout=out)
+            errors = check_tab_indexes(databases=["default"])
+            self.assertEqual(
+                [error.id for error in errors], ["django_admin_tabs.W001"] * 2
+            )
+            with self.settings(DJANGO_ADMIN_TABS_INDEX_CHECK=False):
+                self.assertEqual(check_tab_indexes(databases=["default"]), [])
+        self.assertIn("polls.Poll > By text (page): scans ", out.getvalue())
+
+    @mock.patch.object(AnswerAdmin, "fk_scoping", "pk_list")
+    def test_tab_indexes_pk_list_not_cached(self):
+        Poll.objects.all().delete()
+        plans = list(iter_tab_query_plans(sites=[admin.site], using="default"))
+        self.assertIn(AnswerAdmin, [plan.tab_class for plan in plans])
+        # The plans are explained on a placeholder poll with pk 0.
+        self.assertIsNone(cache.get(get_scope_cache_key(Poll, 0, "answers")))
+
+    def test_tab_indexes_check_on_empty_database(self):
+        # `migrate` runs the database checks before creating the tables.
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "empty_settings.py"), "w") as f:
+                f.write(
+                    "from example.settings import *\n"
+                    "DATABASES = {'default': {"
+                    "'ENGINE': 'django.db.backends.sqlite3', "
+                    f"'NAME': {os.path.join(directory, 'db.sqlite3')!r}}}}}\n"
+                    "DJANGO_ADMIN_TABS_INDEX_CHECK = True\n"
+                )
+            result = subprocess.run(
+                [sys.executable, "manage.py", "migrate", "--no-input"],
+                capture_output=True,
+                cwd=ROOT_DIR,
+                env={
+                    **os.environ,
+                    "DJANGO_SETTINGS_MODULE": "empty_settings",
+                    "PYTHONPATH": os.pathsep.join([directory, ROOT_DIR]),
+                },
+                text=True,
+            )
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+    def test_fk_scoping(self):
+        other_poll = Poll.objects.create(question="Other?")
+        Answer.objects.create(
+            choice=Choice.objects.create(poll=other_poll, text="Not this one")
+        )
+        url = reverse("admin:polls_poll_step", args=(self.poll.id, "answers"))
+        for fk_scoping in ("join", "subquery", "pk_list"):
+            patch = mock.patch.object(AnswerAdmin, "fk_scoping", fk_scoping)
+            with self.subTest(fk_scoping), patch:
+                response = self.client.get(url)
+                self.assertEqual(
+                    list(response.context["cl"].result_list), [self.answer]
+                )
+                # The changelist joins choices for `list_display`, not to scope.
+                tab = admin.site._registry[Poll].build_admin_tab(AnswerAdmin, self.poll)
+                sql = str(tab.get_queryset(mock.Mock()).query)
+                self.assertEqual("polls_choice" in sql, fk_scoping != "pk_list")
+                self.assertEqual(" JOIN " in sql, fk_scoping == "join")
+
+    def test_fk_scoping_pk_list_cached(self):
+        admin_class = type("PkListAnswers", (AnswerAdmin,), {"fk_scoping": "pk_list"})
+        poll_admin = admin.site._registry[Poll]
+        connect_scope_invalidation(
+            admin_class, Poll, poll_admin.get_tab_menu_item(admin_class).slug
+        )
+        request = mock.Mock()
+        tab = poll_admin.build_admin_tab(admin_class, self.poll)
+        self.assertEqual(list(tab.get_queryset(request)), [self.answer])
+        with self.assertNumQueries(1):
+            tab = poll_admin.build_admin_tab(admin_class, self.poll)
+            self.assertEqual(list(tab.get_queryset(request)), [self.answer])
+
+        new_answer = Answer.objects.create(
+            choice=Choice.objects.create(poll=self.poll, text="New")
+        )
+        tab = poll_admin.build_admin_tab(admin_class, self.poll)
+        self.assertEqual(set(tab.get_queryset(request)), {self.answer, new_answer})
+
+        with mock.patch.object(admin_class, "fk_scoping_pk_limit", 1):
+            cache.clear()
+            tab = poll_admin.build_admin_tab(admin_class, self.poll)
+            self.assertIn("polls_choice", str(tab.get_queryset(request).query))
+
+    @mock.patch.object(AnswerAdmin, "fk_scoping", "pk_list")
+    def test_fk_scoping_pk_list_moved_intermediate(self):
+        uid = "django_admin_tabs:scope:polls.poll:example.polls.admin.AnswerAdmin"
+        for signal in (pre_save, post_save):
+            signal.disconnect(sender=Choice, dispatch_uid=uid)
+        poll_admin = PollAdmin(Poll, admin.AdminSite())
+        poll_admin.connect_tab_signals()
+        self.assertIn(uid, get_receiver_uids(pre_save, Choice))
+
+        other_poll = Poll.objects.create(question="Other?")
+        request = mock.Mock()
+        for poll in (self.poll, other_poll):
+            # Cache the keys of both polls.
+            list(poll_admin.build_admin_tab(AnswerAdmin, poll).get_queryset(request))
+        self.choice.poll = other_poll
+        self.choice.save()
+        for poll, answers in ((self.poll, []), (other_poll, [self.answer])):
+            tab = poll_admin.build_admin_tab(AnswerAdmin, poll)
+            self.assertEqual(list(tab.get_queryset(request)), answers)
+
+        # The previous poll isn't looked up, with a LIMIT 1 query, when the
+        # relation isn't saved.
+        with CaptureQueriesContext(connection) as queries:
+            self.choice.save(update_fields=["text"])
+            Choice.objects.only("text").get(pk=self.choice.pk).save()
+        self.assertFalse(any(query["sql"].endswith(" LIMIT 1") for query in queries))
+
+    @isolate_apps("example.polls")
+    def test_fk_scoping_pk_list_watches_path(self):
+        class Survey(models.Model):
+            class Meta:
+                app_label = "polls"
+
+        class SurveyPoll(models.Model):
+            survey = models.ForeignKey(Survey, models.CASCADE)
+            question = models.CharField(max_length=200)
+
+            class Meta:
+                app_label = "polls"
+
+        class SurveyChoice(models.Model):
+            poll = models.ForeignKey(SurveyPoll, models.CASCADE)
+
+            class Meta:
+                app_label = "polls"
+
+        class SurveyAnswer(models.Model):
+            choice = models.ForeignKey(SurveyChoice, models.CASCADE)
+
+            class Meta:
+                app_label = "polls"
+
+        class SurveyAnswers:
+            model = SurveyAnswer
+            fk_field = "choice__poll__survey"
+
+        connect_scope_invalidation(SurveyAnswers, Survey, "answers")
+        keys = [get_scope_cache_key(Survey, pk, "answers") for pk in (1, 2)]
+        poll = SurveyPoll(pk=1, survey_id=2)
+        poll._state.adding = False
+        cache.set_many(dict.fromkeys(keys, [1]))
+        with self.assertNumQueries(0):
+            for signal in (pre_save, post_save):
+                signal.send(
+                    SurveyPoll,
+                    instance=poll,
+                    created=False,
+                    raw=False,
+                    using="default",
+                    update_fields=frozenset({"question"}),
+                )
+        self.assertEqual(list(cache.get_many(keys)), [keys[0]])
+
+        cache.set_many(dict.fromkeys(keys, [1]))
+        choice = SurveyChoice(pk=1, poll=SurveyPoll(pk=2, survey_id=1))
+        post_delete.send(SurveyChoice, instance=choice, using="default")
+        self.assertEqual(list(cache.get_many(keys)), [keys[1]])
+
+    def test_fk_scoping_command(self):
+        out = StringIO()
+        call_command(
+            "tab_scoping", "polls.Poll", str(self.poll.pk), repeat=1, stdout=out
+        )
+        self.assertIn("Answers (choice__poll)", out.getvalue())
+        self.assertIn("Recommended: fk_scoping = ", out.getvalue())
+
+        class UnknownScoping(AnswerAdmin):
+            fk_scoping = "magic"
+
+        class UnknownScopingPollAdmin(PollAdmin):
+            admin_tabs = [PollAdminStep, UnknownScoping]
+
+        errors = UnknownScopingPollAdmin(Poll, admin.site).check()
+        self.assertEqual([error.id for error in errors], ["django_admin_tabs.E002"])
+
+    def test_permission_checks_memoized(self):
+        poll_admin = admin.site._registry[Poll]
+        request = RequestFactory().get("/")
+        request.user = self.user
+        with mock.patch.object(
+            admin.ModelAdmin, "has_change_permission", return_value=True
+        ) as has_change_permission:
+            for _ in range(2):
+                tab = poll_admin.build_admin_tab(AnswerAdmin, self.poll)
+                self.assertTrue(tab.has_change_permission(request))
+                self.assertTrue(tab.has_change_permission(request, None))
+                self.assertTrue(tab.has_change_permission(request, self.answer))
+            self.assertEqual(has_change_permission.call_count, 2)
+
+            other_request = RequestFactory().get("/")
+            other_request.user = self.user
+            tab.has_change_permission(other_request)
+            self.assertEqual(has_change_permission.call_count, 3)
+            tab.has_change_permission(request, Answer(choice=self.choice))
+            self.assertEqual(has_change_permission.call_count, 4)
+
+    def test_tab_visibility(self):
+        calls = []
+
+        class HiddenAnswers(AnswerAdmin):
+            admin_tab_name = "Hidden answers"
+
+            @classmethod
+            def is_tab_visible(cls, request, parent_object):
+                calls.append(parent_object)
+                return not request.user.is_superuser
+
+            def __init__(self, *args, **kwargs):
+                raise AssertionError("Hidden tabs aren't instantiated.")
+
+        admin_tabs = [*PollAdmin.admin_tabs, HiddenAnswers]
+        with mock.patch.object(PollAdmin, "admin_tabs", admin_tabs):
+            url = reverse("admin:polls_poll_step", args=(self.poll.id, "poll"))
+            response = self.client.get(url)
+            self.assertContains(response, "Answers")
+            self.assertNotContains(response, "Hidden answers")
+            url = reverse(
+                "admin:polls_poll_step", args=(self.poll.id, "hidden-answers")
+            )
+            self.assertEqual(self.client.get(url).status_code, 403)
+        self.assertEqual(calls, [self.poll])
+
+    # The index table is dropped with the test transaction.
+    @mock.patch("django_admin_tabs.search._existing_tables", set())
+    @mock.patch("django_admin_tabs.search._missing_tables", {})
+    def test_full_text_search(self):
+        other_poll = Poll.objects.create(question="Other?")
+        Choice.objects.create(poll=other_poll, text="The sky is grey")
+        uid = (
+            "django_admin_tabs:search:polls.choice:"
+            "django_admin_tabs.tests.ChoiceSearchTab"
+        )
+        post_save.disconnect(sender=Choice, dispatch_uid=uid)
+        url = reverse("admin:polls_poll_step", args=(self.poll.id, "choices"))
+        admin_tabs = [*PollAdmin.admin_tabs, ChoiceSearchTab]
+        with mock.patch.object(PollAdmin, "admin_tabs", admin_tabs):
+            # Like when the admin is registered.
+            admin.site._registry[Poll].connect_tab_signals()
+            self.assertIn(uid, get_receiver_uids(post_save, Choice))
+            # The admin's search is used until the index is built.
+            response = self.client.get(url, {"q": "sky"})
+            self.assertEqual(list(response.context["cl"].result_list), [self.choice])
+
+            out = StringIO()
+            call_command("tab_search_index", stdout=out)
+            self.assertIn("polls.Choice (text): 2 rows indexed", out.getvalue())
+
+            new_choice = Choice.objects.create(poll=self.poll, text="Skyline")
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url, {"q": "sky"})
+            self.assertEqual(
+                set(response.context["cl"].result_list), {self.choice, new_choice}
+            )
+            self.assertEqual(response.context["cl"].result_count, 2)
+            self.assertTrue(any(" MATCH " in query["sql"] for query in queries))
+
+            response = self.client.get(url, {"q": '"sky is"'})
+            self.assertEqual(list(response.context["cl"].result_list), [self.choice])
+            new_choice.delete()
+            response = self.client.get(url, {"q": "sky"})
+            self.assertEqual(list(response.context["cl"].result_list), [self.choice])
+
+        class RelatedSearch(ChoiceSearchTab):
+            search_fields = ("poll__question",)
+
+        class RelatedSearchPollAdmin(PollAdmin):
+            admin_tabs = [PollAdminStep, RelatedSearch]
+
+        errors = RelatedSearchPollAdmin(Poll, admin.AdminSite()).check()
+        self.assertEqual([error.id for error in errors], ["django_admin_tabs.E003"])
+
+    @mock.patch("django_admin_tabs.search._existing_tables", set())
+    @mock.patch("django_admin_tabs.search._missing_tables", {})
+    def test_search_index_missing_table_cached(self):
+        poll_admin = admin.site._registry[Poll]
+        index = poll_admin.build_admin_tab(
+            ChoiceSearchTab, self.poll
+        ).get_search_index()
+        with self.assertNumQueries(1):
+            self.assertFalse(index.exists("default"))
+            self.assertFalse(index.exists("default"))
+            index.update([self.choice], "default")
+        # Looked up again on the next connection.
+        connection_created.send(sender=type(connection), connection=connection)
+        with self.assertNumQueries(1):
+            self.assertFalse(index.exists("default"))
+        index.rebuild("default")
+        with self.assertNumQueries(0):
+            self.assertTrue(index.exists("default"))
+        # Rolling back the creation of the FTS5 table corrupts the database.
+        index.get_backend(connection).drop(
+            index, connection, index.get_table(connection)
+        )
+
+
+def reload_databases():
+    """Make the connections pick up the current `DATABASES` setting."""
+    connections.__dict__.pop("settings", None)
+    connections._settings = None
+
+
+class TabReadRouterTestCase(PollTestCase):
+    """Tabs reading from a `replica` database, separate to tell the reads apart."""
+
+    @classmethod
+    def setUpClass(cls):
+        replica_settings = override_settings(
+            DATABASES={
+                **settings.DATABASES,
+                "replica": {
+                    "ENGINE": "django.db.backends.sqlite3",
+                    "NAME": "replica.db",
+                },
+            },
+            DATABASE_ROUTERS=["django_admin_tabs.routing.TabReadRouter"],
+        )
+        with warnings.catch_warnings():
+            # Safe as long as the connections are reloaded around it.
+            warnings.simplefilter("ignore")
+            replica_settings.enable()
+        cls.addClassCleanup(reload_databases)
+        cls.addClassCleanup(replica_settings.disable)
+        reload_databases()
+        replica = connections["replica"]
+        name = replica.settings_dict["NAME"]
+        replica.creation.create_test_db(verbosity=0, serialize=False)
+        cls.addClassCleanup(replica.creation.destroy_test_db, name, verbosity=0)
+        # Not in the class body, the test runner only knows of "default".
+        cls.databases = {"default", "replica"}
+        super().setUpClass()
+
+    @mock.patch.object(PollAdmin, "read_database", "replica")
+    def test_read_database(self):
+        Poll.objects.using("replica").create(pk=self.poll.pk, question="Replicated")
+        url = reverse("admin:polls_poll_step", args=(self.poll.id, "poll"))
+        self.assertContains(self.client.get(url), "Replicated")
+        export_url = reverse(
+            "admin:polls_poll_tab_export", args=(self.poll.id, "answers", "csv")
+        )
+        response = self.client.get(export_url)
+        self.assertEqual(b"".join(response.streaming_content).count(b"\n"), 1)
+        self.assertRedirects(
+            self.client.get(export_url, {"no_such_field": "1"}),
+            reverse("admin:polls_poll_step", args=(self.poll.id, "answers")) + "?e=1",
+            fetch_redirect_response=False,
+        )
+
+        # The session reads from the primary after a write.
+        self.client.post(url, {})
+        self.assertContains(self.client.get(url), "What&#x27;s up?")
+        response = self.client.get(export_url)
+        self.assertEqual(b"".join(response.streaming_content).count(b"\n"), 2)
+
+        later = time.time() + PollAdmin.read_database_sticky_seconds
+        with mock.patch("django_admin_tabs.routing.time") as routing_time:
+            routing_time.time.return_value = later
+            self.assertContains(self.client.get(url), "Replicated")
+
+    @mock.patch.object(PollAdmin, "read_database", "replica")
+    def test_read_database_import(self):
+        Poll.objects.using("replica").create(pk=self.poll.pk, question="Replicated")
+        url = reverse("admin:polls_poll_tab_import", args=(self.poll.id, "answers"))
+        self.assertEqual(self.client.get(url).status_code, 200)
+        upload = SimpleUploadedFile(
+            "answers.csv",
+            f"choice\n{self.choice.pk}\n".encode(),
+            content_type="text/csv",
+        )
+        response = self.client.post(url, {"file": upload})
+        self.assertIn(
+            b"Done: 1 of 1 rows imported.", b"".join(response.streaming_content)
+        )
+        changelist_url = reverse(
+            "admin:polls_poll_step", args=(self.poll.id, "answers")
+        )
+        self.assertContains(self.client.get(changelist_url), "Answers (2)")
+
+    @override_settings(ROOT_URLCONF="django_admin_tabs.tests")
+    @mock.patch.object(PollAdmin, "read_database", "replica")
+    async def test_async_read_database(self):
+        await Poll.objects.using("replica").acreate(
+            pk=self.poll.pk, question="Replicated"
+        )
+        await sync_to_async(self.async_client.force_login)(self.user)
+        url = reverse("async_admin:polls_poll_step", args=(self.poll.id, "answers"))
+        response = await self.async_client.get(url)
+        self.assertContains(response, "Answers (0)")
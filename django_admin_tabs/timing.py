@@ -0,0 +1,66 @@
+import time
+from contextlib import ExitStack, contextmanager, nullcontext
+from typing import NamedTuple
+
+from django.db import connections
+
+
+class PhaseTiming(NamedTuple):
+    """Wall time and SQL queries of one phase of a tab view, in milliseconds."""
+
+    duration: float
+    queries: int
+    query_duration: float
+
+
+class TabTimer:
+    """Record wall time and SQL queries for the phases of a tab view.
+
+    Phases can be nested, a phase includes the time and queries of the phases
+    it contains. A phase entered several times accumulates.
+    """
+
+    def __init__(self):
+        self.phases = {}
+
+    @contextmanager
+    def phase(self, name):
+        queries = [0, 0.0]
+
+        def record_query(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                queries[0] += 1
+                queries[1] += (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(record_query))
+                yield
+        finally:
+            duration = (time.perf_counter() - start) * 1000
+            previous = self.phases.get(name, PhaseTiming(0, 0, 0))
+            self.phases[name] = PhaseTiming(
+                previous.duration + duration,
+                previous.queries + queries[0],
+                previous.query_duration + queries[1],
+            )
+
+    def get_server_timing(self):
+        """Return the value of a `Server-Timing` header for the phases."""
+        return ", ".join(
+            f'{name};dur={timing.duration:.1f};desc="{timing.queries} queries '
+            f'{timing.query_duration:.1f}ms"'
+            for name, timing in self.phases.items()
+        )
+
+
+def timed(timer, name):
+    """Time `name` on `timer`, or do nothing when instrumentation is off."""
+    if timer is None:
+        return nullcontext()
+    return timer.phase(name)
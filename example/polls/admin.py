@@ -1,16 +1,20 @@
+from django import forms
 from django.contrib import admin
 
 from django_admin_tabs import (
     AdminChangeListTab,
     AdminTab,
+    BulkChangeListForm,
+    PaginatedStackedInline,
     TabbedModelAdmin,
 )
 from .models import Answer, Choice, Poll
 
 
-class ChoiceInline(admin.StackedInline):
+class ChoiceInline(PaginatedStackedInline):
     model = Choice
     extra = 0
+    per_page = 20
 
 
 class PollAdminStep(AdminTab, admin.ModelAdmin):
@@ -19,6 +23,28 @@ class PollAdminStep(AdminTab, admin.ModelAdmin):
     inlines = (ChoiceInline,)
 
 
+class AnswerBulkForm(BulkChangeListForm):
+    model = Answer
+
+    choice = forms.ModelChoiceField(queryset=Choice.objects.none())
+    count = forms.IntegerField(min_value=1, max_value=100000)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["choice"].queryset = self.parent_object.choice_set.all()
+
+    def get_objects(self):
+        choice = self.cleaned_data["choice"]
+        for _ in range(self.cleaned_data["count"]):
+            yield Answer(choice=choice)
+
+
+@admin.register(Choice)
+class ChoiceAdmin(admin.ModelAdmin):
+    # Searched by the scoped autocomplete of the answers.
+    search_fields = ("text",)
+
+
 @admin.register(Answer)
 class AnswerAdmin(AdminChangeListTab, admin.ModelAdmin):
     admin_tab_name = "Answers"
@@ -26,16 +52,16 @@ class AnswerAdmin(AdminChangeListTab, admin.ModelAdmin):
     fk_field = "choice__poll"
     parent_model = Poll
     date_hierarchy = "timestamp"
+    count_badge = True
+    export_formats = ("csv", "jsonl")
+    csv_import = True
+    change_list_bulk_form = AnswerBulkForm
     list_display = (
         "timestamp",
         "choice",
     )
     list_filter = ("choice",)
-
-    def get_form(self, request, obj=None, **kwargs):
-        form = super().get_form(request, obj, **kwargs)
-        form.base_fields["choice"].queryset = self.parent_object.choice_set.all()
-        return form
+    scoped_autocomplete = True
 
 
 @admin.register(Poll)